@@ -0,0 +1,132 @@
+"""
+Throughput benchmark of the Reddit company-mention filter.
+
+Generates a synthetic subreddit JSONL corpus (posts mentioning the built-in companies
+at a realistic rate), then streams it and reports lines/sec for:
+  - legacy:      re.search per search term, one ticker (the previous company filter)
+  - legacy-all:  the legacy filter looped over every ticker of the universe
+  - matcher:     the precompiled matcher for one ticker
+  - matcher-all: one scan per post finding every ticker of the universe
+JSON parsing is included in every figure, as in the real scan.
+
+Usage:
+    python benchmarks/bench_company_matcher.py [--gb 1.0] [--ticker AAPL] [--path corpus.jsonl]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tradingagents.dataflows.company_matcher import CompanyMatcher, _default_aliases
+from tradingagents.dataflows.reddit_utils import ticker_to_company
+
+FILLER = (
+    "the market opened lower today as traders weighed rates inflation guidance and earnings "
+    "from several large caps while bond yields climbed and the dollar held steady after data"
+).split()
+
+
+def generate_corpus(path: str, size_bytes: int, seed: int = 7):
+    """Write posts until the file reaches ``size_bytes``; about 5% mention a company"""
+    rng = np.random.default_rng(seed)
+    mentions = [alias for names in _default_aliases().values() for alias in names] + list(ticker_to_company)
+    start = 1_700_000_000
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_bytes:
+            lines = []
+            for _ in range(10_000):
+                title = rng.choice(FILLER, 8).tolist()
+                text = rng.choice(FILLER, int(rng.integers(20, 120))).tolist()
+                if rng.random() < 0.05:
+                    text[int(rng.integers(len(text)))] = mentions[int(rng.integers(len(mentions)))]
+                lines.append(json.dumps({
+                    "created_utc": start + int(rng.integers(0, 365 * 86400)),
+                    "title": " ".join(title),
+                    "selftext": " ".join(text),
+                    "url": "https://reddit.com/r/stocks/x",
+                    "ups": int(rng.integers(0, 500)),
+                }) + "\n")
+            chunk = "".join(lines)
+            f.write(chunk)
+            written += len(chunk)
+
+
+def _legacy_terms(ticker):
+    names = ticker_to_company[ticker]
+    terms = names.split(" OR ") if "OR" in names else [names]
+    terms.append(ticker)
+    return terms
+
+
+def _legacy_filter(tickers):
+    term_lists = {ticker: _legacy_terms(ticker) for ticker in tickers}
+
+    def tickers_in(title, text):
+        return {
+            ticker for ticker, terms in term_lists.items()
+            if any(re.search(t, title, re.IGNORECASE) or re.search(t, text, re.IGNORECASE) for t in terms)
+        }
+    return tickers_in
+
+
+def _run(path, max_lines, tickers_in):
+    lines = hits = 0
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        for line in f:
+            post = json.loads(line)
+            hits += bool(tickers_in(post["title"], post["selftext"]))
+            lines += 1
+            if lines == max_lines:
+                break
+    return lines, hits, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--gb", type=float, default=1.0, help="corpus size in GB")
+    parser.add_argument("--ticker", default="AAPL", help="ticker for the single-ticker runs")
+    parser.add_argument("--path", default=None, help="corpus file (generated if missing)")
+    parser.add_argument("--legacy-lines", type=int, default=200_000,
+                        help="lines scanned by the legacy-all run (it is much slower)")
+    options = parser.parse_args()
+
+    path = options.path or os.path.join(tempfile.gettempdir(), f"bench_reddit_{options.gb:g}gb.jsonl")
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        generate_corpus(path, int(options.gb * 1e9))
+        print(f"generated {path} in {time.perf_counter() - start:.0f}s")
+    size_mb = os.path.getsize(path) / 1e6
+
+    universe = sorted(ticker_to_company)
+    matcher = CompanyMatcher(_default_aliases())
+    single = matcher.for_ticker(options.ticker)
+    runs = {
+        "legacy": (None, _legacy_filter([options.ticker])),
+        "legacy-all": (options.legacy_lines, _legacy_filter(universe)),
+        "matcher": (None, lambda title, text: single.mentions(title) or single.mentions(text)),
+        "matcher-all": (None, lambda title, text: matcher.tickers_in(title) | matcher.tickers_in(text)),
+    }
+
+    with open(path, "rb") as f:
+        total_lines = sum(1 for _ in f)
+
+    print(f"corpus {size_mb:.0f} MB, universe {len(universe)} tickers")
+    print(f"{'run':<14}{'lines':>12}{'matched':>10}{'lines/s':>12}{'MB/s':>8}")
+    for name, (max_lines, tickers_in) in runs.items():
+        lines, hits, elapsed = _run(path, max_lines, tickers_in)
+        rate = lines / elapsed
+        mb_rate = rate * size_mb / total_lines
+        print(f"{name:<14}{lines:>12}{hits:>10}{rate:>12.0f}{mb_rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark of the indicator path: stockstats + iterrows vs. the vectorized engine.
+
+For each symbol the market analyst requests all 13 supported indicators. The legacy
+path wraps the price frame with stockstats once per indicator and walks every row
+with iterrows() to build the {date: value} dict; the engine computes all indicators
+from the price arrays in one pass. Prices are synthetic 15-year daily series held in
+memory, so neither download nor file parsing is measured. The run also checks that
+both paths agree within tolerance. "compute-only" is the engine without the string
+conversion of the output dicts. The legacy path takes seconds per symbol, so for
+large universes it is timed on --legacy-sample symbols and scaled (marked "est.").
+
+Usage:
+    python benchmarks/bench_indicators.py [--symbols 1,500] [--rows 3780] [--legacy-sample 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from stockstats import wrap
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tradingagents.dataflows.indicator_engine import SUPPORTED_INDICATORS, compute_indicators
+
+
+def _synthetic_prices(rows: int, seed: int) -> pd.DataFrame:
+    """Random-walk daily OHLCV frame indexed by business day"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2025-06-30", periods=rows, name="Date")
+    close = np.exp(np.log(rng.uniform(5, 300)) + np.cumsum(rng.normal(0.0004, 0.02, rows)))
+    spread = rng.uniform(0, 0.02, (2, rows))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + spread[0]),
+            "Low": close * (1 - spread[1]),
+            "Close": close,
+            "Volume": rng.integers(100_000, 50_000_000, rows).astype(float),
+        },
+        index=index,
+    )
+
+
+def legacy_path(prices: pd.DataFrame) -> dict:
+    """Previous _get_stock_stats_bulk: wrap + iterrows, once per indicator"""
+    out = {}
+    for indicator in SUPPORTED_INDICATORS:
+        df = wrap(prices.reset_index())
+        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+        df[indicator]
+        values = {}
+        for _, row in df.iterrows():
+            value = row[indicator]
+            values[row["Date"]] = "N/A" if pd.isna(value) else str(value)
+        out[indicator] = values
+    return out
+
+
+def engine_path(prices: pd.DataFrame) -> dict:
+    """Vectorized engine: all indicators in one pass, then one dict per indicator"""
+    frame = compute_indicators(prices)
+    dates = prices.index.strftime("%Y-%m-%d")
+    out = {}
+    for indicator in SUPPORTED_INDICATORS:
+        values = frame[indicator]
+        text = np.where(values.isna(), "N/A", values.astype(str))
+        out[indicator] = dict(zip(dates, text.tolist()))
+    return out
+
+
+def _max_relative_error(legacy: dict, engine: dict) -> float:
+    worst = 0.0
+    for indicator, values in legacy.items():
+        for date, value in values.items():
+            other = engine[indicator][date]
+            if value == "N/A" or other == "N/A":
+                if value != other:
+                    return float("inf")
+                continue
+            a, b = float(value), float(other)
+            worst = max(worst, abs(a - b) / max(abs(a), 1e-9))
+    return worst
+
+
+def _run(path, universe) -> float:
+    start = time.perf_counter()
+    for prices in universe:
+        path(prices)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", default="1,500", help="comma-separated universe sizes")
+    parser.add_argument("--rows", type=int, default=3780, help="daily sessions per symbol (~15 years)")
+    parser.add_argument("--legacy-sample", type=int, default=20, help="max symbols timed on the legacy path")
+    options = parser.parse_args()
+
+    sample = _synthetic_prices(options.rows, seed=0)
+    error = _max_relative_error(legacy_path(sample), engine_path(sample))
+    print(f"Parity: max relative difference vs. stockstats = {error:.2e} ({len(SUPPORTED_INDICATORS)} indicators)")
+    if error > 1e-8:
+        raise SystemExit("Engine output does not match stockstats")
+
+    print(f"{'symbols':>8}{'legacy s':>16}{'engine s':>12}{'speedup':>10}{'compute-only s':>16}")
+    for count in (int(n) for n in options.symbols.split(",")):
+        universe = [_synthetic_prices(options.rows, seed=i) for i in range(count)]
+        timed = universe[:max(1, options.legacy_sample)]
+        legacy = _run(legacy_path, timed) * count / len(timed)
+        engine = _run(engine_path, universe)
+        compute = _run(compute_indicators, universe)
+        label = f"{legacy:.2f}" + (" (est.)" if len(timed) < count else "")
+        print(f"{count:>8}{label:>16}{engine:>12.3f}{legacy / engine:>9.0f}x{compute:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
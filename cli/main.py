@@ -33,6 +33,8 @@ from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.vendor_health import get_vendor_scoreboard
+from tradingagents.dataflows.vendor_rate_limit import get_vendor_rate_limit_stats
 from cli.models import AnalystType
 from cli.utils import *
 
@@ -809,6 +811,55 @@ def display_complete_report(final_state):
             )
 
 
+def display_vendor_health():
+    """Display the data vendor health scoreboard collected during the run."""
+    scoreboard = get_vendor_scoreboard()
+    if not scoreboard:
+        return
+
+    table = Table(title="Data Vendor Health", box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Vendor", style="cyan")
+    table.add_column("Method")
+    table.add_column("State")
+    table.add_column("OK", justify="right")
+    table.add_column("Fail", justify="right")
+    table.add_column("Latency (s)", justify="right")
+    table.add_column("Retry in (s)", justify="right")
+
+    state_styles = {"closed": "green", "half_open": "yellow", "open": "red"}
+    for row in scoreboard:
+        latency = row["latency_ewma_s"]
+        table.add_row(
+            row["vendor"],
+            row["method"],
+            f"[{state_styles[row['state']]}]{row['state']}[/{state_styles[row['state']]}]",
+            str(row["successes"]),
+            str(row["failures"]),
+            f"{latency:.2f}" if latency is not None else "-",
+            f"{row['retry_in_s']:.0f}" if row["state"] == "open" else "-",
+        )
+
+    console.print(table)
+
+    quota_stats = [row for row in get_vendor_rate_limit_stats().values() if row["granted"] or row["rejected_minute"] or row["rejected_day"]]
+    if quota_stats:
+        quota_table = Table(title="Data Vendor Quotas", box=box.SIMPLE_HEAD, show_lines=False)
+        quota_table.add_column("Vendor", style="cyan")
+        quota_table.add_column("Used today", justify="right")
+        quota_table.add_column("Queued", justify="right")
+        quota_table.add_column("Queued time (s)", justify="right")
+        quota_table.add_column("Over budget", justify="right")
+        for row in quota_stats:
+            quota_table.add_row(
+                row["vendor"],
+                f"{row['used_today']}/{row['per_day']}" if row["per_day"] else str(row["used_today"]),
+                str(row["queued"]),
+                f"{row['queued_seconds']:.1f}",
+                str(row["rejected_minute"] + row["rejected_day"]),
+            )
+        console.print(quota_table)
+
+
 def update_research_team_status(status):
     """Update status for all research team members and trader."""
     research_team = ["Bull Researcher", "Bear Researcher", "Research Manager", "Trader"]
@@ -1000,237 +1051,244 @@ def run_analysis():
         )
         args = graph.propagator.get_graph_args()
 
-        # Stream the analysis
-        trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
-            if len(chunk["messages"]) > 0:
-                # Get the last message from the chunk
-                last_message = chunk["messages"][-1]
-
-                # Extract message content and type
-                if hasattr(last_message, "content"):
-                    content = extract_content_string(last_message.content)  # Use the helper function
-                    msg_type = "Reasoning"
-                else:
-                    content = str(last_message)
-                    msg_type = "System"
-
-                # Add message to buffer
-                message_buffer.add_message(msg_type, content)                
-
-                # If it's a tool call, add it to tool calls
-                if hasattr(last_message, "tool_calls"):
-                    for tool_call in last_message.tool_calls:
-                        # Handle both dictionary and object tool calls
-                        if isinstance(tool_call, dict):
-                            message_buffer.add_tool_call(
-                                tool_call["name"], tool_call["args"]
-                            )
-                        else:
-                            message_buffer.add_tool_call(tool_call.name, tool_call.args)
-
-                # Update reports and agent status based on chunk content
-                # Analyst Team Reports
-                if "market_report" in chunk and chunk["market_report"]:
-                    message_buffer.update_report_section(
-                        "market_report", chunk["market_report"]
-                    )
-                    message_buffer.update_agent_status("Market Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "social" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Social Analyst", "in_progress"
-                        )
+        # Fetch the analysts' predictable tool inputs before the LLM graph starts
+        graph.start_prefetch(selections["ticker"], selections["analysis_date"])
 
-                if "sentiment_report" in chunk and chunk["sentiment_report"]:
-                    message_buffer.update_report_section(
-                        "sentiment_report", chunk["sentiment_report"]
-                    )
-                    message_buffer.update_agent_status("Social Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "news" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "News Analyst", "in_progress"
+        try:
+            # Stream the analysis
+            trace = []
+            for chunk in graph.graph.stream(init_agent_state, **args):
+                if len(chunk["messages"]) > 0:
+                    # Get the last message from the chunk
+                    last_message = chunk["messages"][-1]
+
+                    # Extract message content and type
+                    if hasattr(last_message, "content"):
+                        content = extract_content_string(last_message.content)  # Use the helper function
+                        msg_type = "Reasoning"
+                    else:
+                        content = str(last_message)
+                        msg_type = "System"
+
+                    # Add message to buffer
+                    message_buffer.add_message(msg_type, content)                
+
+                    # If it's a tool call, add it to tool calls
+                    if hasattr(last_message, "tool_calls"):
+                        for tool_call in last_message.tool_calls:
+                            # Handle both dictionary and object tool calls
+                            if isinstance(tool_call, dict):
+                                message_buffer.add_tool_call(
+                                    tool_call["name"], tool_call["args"]
+                                )
+                            else:
+                                message_buffer.add_tool_call(tool_call.name, tool_call.args)
+
+                    # Update reports and agent status based on chunk content
+                    # Analyst Team Reports
+                    if "market_report" in chunk and chunk["market_report"]:
+                        message_buffer.update_report_section(
+                            "market_report", chunk["market_report"]
                         )
+                        message_buffer.update_agent_status("Market Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "social" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "Social Analyst", "in_progress"
+                            )
 
-                if "news_report" in chunk and chunk["news_report"]:
-                    message_buffer.update_report_section(
-                        "news_report", chunk["news_report"]
-                    )
-                    message_buffer.update_agent_status("News Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "fundamentals" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Fundamentals Analyst", "in_progress"
+                    if "sentiment_report" in chunk and chunk["sentiment_report"]:
+                        message_buffer.update_report_section(
+                            "sentiment_report", chunk["sentiment_report"]
                         )
-
-                if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
-                    message_buffer.update_report_section(
-                        "fundamentals_report", chunk["fundamentals_report"]
-                    )
-                    message_buffer.update_agent_status(
-                        "Fundamentals Analyst", "completed"
-                    )
-                    # Set all research team members to in_progress
-                    update_research_team_status("in_progress")
-
-                # Research Team - Handle Investment Debate State
-                if (
-                    "investment_debate_state" in chunk
-                    and chunk["investment_debate_state"]
-                ):
-                    debate_state = chunk["investment_debate_state"]
-
-                    # Update Bull Researcher status and report
-                    if "bull_history" in debate_state and debate_state["bull_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bull response
-                        bull_responses = debate_state["bull_history"].split("\n")
-                        latest_bull = bull_responses[-1] if bull_responses else ""
-                        if latest_bull:
-                            message_buffer.add_message("Reasoning", latest_bull)
-                            # Update research report with bull's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"### Bull Researcher Analysis\n{latest_bull}",
+                        message_buffer.update_agent_status("Social Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "news" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "News Analyst", "in_progress"
                             )
 
-                    # Update Bear Researcher status and report
-                    if "bear_history" in debate_state and debate_state["bear_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bear response
-                        bear_responses = debate_state["bear_history"].split("\n")
-                        latest_bear = bear_responses[-1] if bear_responses else ""
-                        if latest_bear:
-                            message_buffer.add_message("Reasoning", latest_bear)
-                            # Update research report with bear's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
+                    if "news_report" in chunk and chunk["news_report"]:
+                        message_buffer.update_report_section(
+                            "news_report", chunk["news_report"]
+                        )
+                        message_buffer.update_agent_status("News Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "fundamentals" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "Fundamentals Analyst", "in_progress"
                             )
 
-                    # Update Research Manager status and final decision
-                    if (
-                        "judge_decision" in debate_state
-                        and debate_state["judge_decision"]
-                    ):
-                        # Keep all research team members in progress until final decision
-                        update_research_team_status("in_progress")
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Research Manager: {debate_state['judge_decision']}",
-                        )
-                        # Update research report with final decision
+                    if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
                         message_buffer.update_report_section(
-                            "investment_plan",
-                            f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
+                            "fundamentals_report", chunk["fundamentals_report"]
                         )
-                        # Mark all research team members as completed
-                        update_research_team_status("completed")
-                        # Set first risk analyst to in_progress
                         message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
+                            "Fundamentals Analyst", "completed"
                         )
+                        # Set all research team members to in_progress
+                        update_research_team_status("in_progress")
 
-                # Trading Team
-                if (
-                    "trader_investment_plan" in chunk
-                    and chunk["trader_investment_plan"]
-                ):
-                    message_buffer.update_report_section(
-                        "trader_investment_plan", chunk["trader_investment_plan"]
-                    )
-                    # Set first risk analyst to in_progress
-                    message_buffer.update_agent_status("Risky Analyst", "in_progress")
-
-                # Risk Management Team - Handle Risk Debate State
-                if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
-                    risk_state = chunk["risk_debate_state"]
-
-                    # Update Risky Analyst status and report
+                    # Research Team - Handle Investment Debate State
                     if (
-                        "current_risky_response" in risk_state
-                        and risk_state["current_risky_response"]
+                        "investment_debate_state" in chunk
+                        and chunk["investment_debate_state"]
                     ):
-                        message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Risky Analyst: {risk_state['current_risky_response']}",
-                        )
-                        # Update risk report with risky analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
-                        )
+                        debate_state = chunk["investment_debate_state"]
+
+                        # Update Bull Researcher status and report
+                        if "bull_history" in debate_state and debate_state["bull_history"]:
+                            # Keep all research team members in progress
+                            update_research_team_status("in_progress")
+                            # Extract latest bull response
+                            bull_responses = debate_state["bull_history"].split("\n")
+                            latest_bull = bull_responses[-1] if bull_responses else ""
+                            if latest_bull:
+                                message_buffer.add_message("Reasoning", latest_bull)
+                                # Update research report with bull's latest analysis
+                                message_buffer.update_report_section(
+                                    "investment_plan",
+                                    f"### Bull Researcher Analysis\n{latest_bull}",
+                                )
+
+                        # Update Bear Researcher status and report
+                        if "bear_history" in debate_state and debate_state["bear_history"]:
+                            # Keep all research team members in progress
+                            update_research_team_status("in_progress")
+                            # Extract latest bear response
+                            bear_responses = debate_state["bear_history"].split("\n")
+                            latest_bear = bear_responses[-1] if bear_responses else ""
+                            if latest_bear:
+                                message_buffer.add_message("Reasoning", latest_bear)
+                                # Update research report with bear's latest analysis
+                                message_buffer.update_report_section(
+                                    "investment_plan",
+                                    f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
+                                )
+
+                        # Update Research Manager status and final decision
+                        if (
+                            "judge_decision" in debate_state
+                            and debate_state["judge_decision"]
+                        ):
+                            # Keep all research team members in progress until final decision
+                            update_research_team_status("in_progress")
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Research Manager: {debate_state['judge_decision']}",
+                            )
+                            # Update research report with final decision
+                            message_buffer.update_report_section(
+                                "investment_plan",
+                                f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
+                            )
+                            # Mark all research team members as completed
+                            update_research_team_status("completed")
+                            # Set first risk analyst to in_progress
+                            message_buffer.update_agent_status(
+                                "Risky Analyst", "in_progress"
+                            )
 
-                    # Update Safe Analyst status and report
+                    # Trading Team
                     if (
-                        "current_safe_response" in risk_state
-                        and risk_state["current_safe_response"]
+                        "trader_investment_plan" in chunk
+                        and chunk["trader_investment_plan"]
                     ):
-                        message_buffer.update_agent_status(
-                            "Safe Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Safe Analyst: {risk_state['current_safe_response']}",
-                        )
-                        # Update risk report with safe analyst's latest analysis only
                         message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
+                            "trader_investment_plan", chunk["trader_investment_plan"]
                         )
+                        # Set first risk analyst to in_progress
+                        message_buffer.update_agent_status("Risky Analyst", "in_progress")
+
+                    # Risk Management Team - Handle Risk Debate State
+                    if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
+                        risk_state = chunk["risk_debate_state"]
+
+                        # Update Risky Analyst status and report
+                        if (
+                            "current_risky_response" in risk_state
+                            and risk_state["current_risky_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Risky Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Risky Analyst: {risk_state['current_risky_response']}",
+                            )
+                            # Update risk report with risky analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
+                            )
 
-                    # Update Neutral Analyst status and report
-                    if (
-                        "current_neutral_response" in risk_state
-                        and risk_state["current_neutral_response"]
-                    ):
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Neutral Analyst: {risk_state['current_neutral_response']}",
-                        )
-                        # Update risk report with neutral analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
-                        )
+                        # Update Safe Analyst status and report
+                        if (
+                            "current_safe_response" in risk_state
+                            and risk_state["current_safe_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Safe Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Safe Analyst: {risk_state['current_safe_response']}",
+                            )
+                            # Update risk report with safe analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
+                            )
 
-                    # Update Portfolio Manager status and final decision
-                    if "judge_decision" in risk_state and risk_state["judge_decision"]:
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Portfolio Manager: {risk_state['judge_decision']}",
-                        )
-                        # Update risk report with final decision only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
-                        )
-                        # Mark risk analysts as completed
-                        message_buffer.update_agent_status("Risky Analyst", "completed")
-                        message_buffer.update_agent_status("Safe Analyst", "completed")
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "completed"
-                        )
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "completed"
-                        )
+                        # Update Neutral Analyst status and report
+                        if (
+                            "current_neutral_response" in risk_state
+                            and risk_state["current_neutral_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Neutral Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Neutral Analyst: {risk_state['current_neutral_response']}",
+                            )
+                            # Update risk report with neutral analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
+                            )
+
+                        # Update Portfolio Manager status and final decision
+                        if "judge_decision" in risk_state and risk_state["judge_decision"]:
+                            message_buffer.update_agent_status(
+                                "Portfolio Manager", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Portfolio Manager: {risk_state['judge_decision']}",
+                            )
+                            # Update risk report with final decision only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
+                            )
+                            # Mark risk analysts as completed
+                            message_buffer.update_agent_status("Risky Analyst", "completed")
+                            message_buffer.update_agent_status("Safe Analyst", "completed")
+                            message_buffer.update_agent_status(
+                                "Neutral Analyst", "completed"
+                            )
+                            message_buffer.update_agent_status(
+                                "Portfolio Manager", "completed"
+                            )
 
-                # Update the display
-                update_display(layout)
+                    # Update the display
+                    update_display(layout)
 
-            trace.append(chunk)
+                trace.append(chunk)
+        finally:
+            # Release the run-scoped cache even if the graph raises
+            graph.finish_prefetch()
 
         # Get final state and decision
         final_state = trace[-1]
@@ -1251,6 +1309,7 @@ def run_analysis():
 
         # Display the complete final report
         display_complete_report(final_state)
+        display_vendor_health()
 
         update_display(layout)
 
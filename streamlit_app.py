@@ -349,6 +349,18 @@ with col1:
                     progress_bar.progress(100)
                     
                     st.success("✅ Analysis Complete!")
+                    
+                    # Data vendor health (circuit breaker scoreboard)
+                    from tradingagents.dataflows.vendor_health import get_vendor_scoreboard
+                    vendor_scoreboard = get_vendor_scoreboard()
+                    if vendor_scoreboard:
+                        with st.expander("📡 Data Vendor Health"):
+                            st.table(vendor_scoreboard)
+                            from tradingagents.dataflows.vendor_rate_limit import get_vendor_rate_limit_stats
+                            quota_stats = list(get_vendor_rate_limit_stats().values())
+                            if quota_stats:
+                                st.caption("Vendor quotas (queued time in seconds)")
+                                st.table(quota_stats)
                 
                 except Exception as e:
                     error_msg = str(e)
@@ -0,0 +1,98 @@
+"""Test the compact Alpha Vantage NEWS_SENTIMENT extraction"""
+import json
+
+import pytest
+
+from tradingagents.dataflows import alpha_vantage_news
+from tradingagents.dataflows.news_normalize import NewsSelection, parse_news_output, select_articles
+from tradingagents.dataflows.output_encoding import estimate_tokens
+
+
+def _payload(count=50):
+    feed = []
+    for i in range(count):
+        score = round((i % 7 - 3) / 10, 4)
+        label = "Bullish" if score >= 0.15 else "Bearish" if score <= -0.15 else "Neutral"
+        feed.append({
+            "title": f"Apple headline {i}: services and iPhone update",
+            "url": f"https://news.example.com/apple/{i}",
+            "time_published": f"202405{1 + i % 9:02d}T{10 + i % 12:02d}3000",
+            "authors": ["Staff Writer", "Second Author"],
+            "summary": "Apple shares moved after the company reported results. " * 8,
+            "banner_image": f"https://cdn.example.com/images/{i}/banner-large.jpg",
+            "source": "Reuters" if i % 2 else "Benzinga",
+            "category_within_source": "n/a",
+            "source_domain": "www.reuters.com",
+            "topics": [{"topic": "Earnings", "relevance_score": "0.999"},
+                       {"topic": "Technology", "relevance_score": "0.5"}],
+            "overall_sentiment_score": score,
+            "overall_sentiment_label": label,
+            "ticker_sentiment": [
+                {"ticker": "AAPL", "relevance_score": "0.8", "ticker_sentiment_score": str(score),
+                 "ticker_sentiment_label": label},
+                {"ticker": "MSFT", "relevance_score": "0.2", "ticker_sentiment_score": "0.05",
+                 "ticker_sentiment_label": "Neutral"},
+            ] + ([{"ticker": "GOOG", "relevance_score": "0.1", "ticker_sentiment_score": "-0.3",
+                   "ticker_sentiment_label": "Bearish"}] if i % 5 == 0 else []),
+        })
+    return {"items": str(count), "sentiment_score_definition": "...", "feed": feed}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Serve the sample payload instead of the API and count requests"""
+    calls = []
+
+    def fake_request(function_name, params):
+        calls.append((function_name, params["tickers"]))
+        return json.dumps(_payload())
+
+    monkeypatch.setattr(alpha_vantage_news, "_make_api_request", fake_request)
+    alpha_vantage_news._parsed_cache.clear()
+    yield calls
+    alpha_vantage_news._parsed_cache.clear()
+
+
+def test_compact_output_is_much_smaller(api):
+    output = alpha_vantage_news.get_news("AAPL", "2024-05-01", "2024-05-10")
+    raw = json.dumps(_payload())
+    assert estimate_tokens(output) < estimate_tokens(raw) / 2
+    assert "banner" not in output and "topics" not in output and "news.example.com" not in output
+    table = output.split("## Alpha Vantage News Sentiment for AAPL, 2024-05-01 to 2024-05-10 (50 articles)\n")[1]
+    header, first = table.splitlines()[:2]
+    assert header == ",".join(alpha_vantage_news.NEWS_TABLE_COLUMNS)
+    assert first.startswith("2024-05-09 ")  # Newest first
+
+
+def test_ticker_aggregates():
+    stats = alpha_vantage_news.ticker_sentiment_stats(_payload())
+    assert list(stats.index[:2]) == ["AAPL", "MSFT"]
+    assert stats.loc["AAPL", "articles"] == 50 and stats.loc["GOOG", "articles"] == 10
+    assert stats.loc["GOOG", "bearish"] == 10 and stats.loc["GOOG", "sentiment"] == pytest.approx(-0.3)
+    aapl = [item["overall_sentiment_score"] for item in _payload()["feed"]]
+    assert stats.loc["AAPL", "sentiment"] == pytest.approx(sum(aapl) / len(aapl))
+
+
+def test_parsed_form_is_cached(api):
+    first = alpha_vantage_news.get_news("AAPL", "2024-05-01", "2024-05-10")
+    second = alpha_vantage_news.get_news("aapl", "2024-05-01", "2024-05-10")
+    assert len(api) == 1 and first == second
+    alpha_vantage_news.get_news("AAPL", "2024-05-02", "2024-05-10")
+    assert len(api) == 2
+
+
+def test_non_feed_response_is_passed_through(monkeypatch):
+    note = json.dumps({"Note": "Thank you for using Alpha Vantage!"})
+    monkeypatch.setattr(alpha_vantage_news, "_make_api_request", lambda *args: note)
+    assert alpha_vantage_news.get_news("IBM", "2024-05-01", "2024-05-10") == note
+
+
+def test_news_stage_reads_the_table(api):
+    output = alpha_vantage_news.get_news("AAPL", "2024-05-01", "2024-05-10")
+    sections = parse_news_output(output)
+    assert [s.vendor for s in sections] == [None, "alpha_vantage"]
+    articles = sections[1].articles
+    assert len(articles) == 50 and articles[0].relevance == {"AAPL": 0.8}
+    assert articles[0].published.startswith("2024-05-09") and articles[0].source
+    selected = select_articles(articles, NewsSelection("AAPL", "2024-05-10", 0, max_articles=5))
+    assert len(selected) == 5 and all(a.text.count(",") >= 6 for a in selected)
@@ -0,0 +1,97 @@
+"""Test the precompiled company matcher and its alias tables"""
+import json
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.company_matcher import (
+    CompanyMatcher,
+    get_company_matcher,
+    load_alias_file,
+    strip_legal_suffix,
+)
+from tradingagents.dataflows.config import get_config, set_config
+
+
+@pytest.fixture
+def matcher():
+    return CompanyMatcher({
+        "AAPL": ["Apple"],
+        "META": "Meta OR Facebook",
+        "BAC": ["Bank of America"],
+        "BK": ["Bank of New York Mellon"],
+        "BANK": ["Bank"],
+        "X": ["US Steel", "X"],
+    })
+
+
+def test_names_are_whole_word_and_case_insensitive(matcher):
+    assert matcher.tickers_in("APPLE beats; apple's margins grow") == {"AAPL"}
+    assert matcher.tickers_in("pineapple and applesauce") == set()
+    assert matcher.tickers_in("Facebook rebrands") == {"META"}
+    assert matcher.tickers_in("metadata pipeline") == set()
+
+
+def test_symbols_are_case_sensitive_unless_cashtag(matcher):
+    assert matcher.tickers_in("AAPL and META up") == {"AAPL", "META"}
+    assert matcher.tickers_in("aapl meta") == {"META"}  # "meta" is a name
+    assert matcher.tickers_in("bought $aapl") == {"AAPL"}
+    assert matcher.tickers_in("X rallies, x marks the spot") == {"X"}
+    assert matcher.tickers_in("x marks the spot") == set()
+    assert matcher.tickers_in("$x calls") == {"X"}
+
+
+def test_overlapping_names_all_reported(matcher):
+    assert matcher.tickers_in("Bank of America earnings") == {"BAC", "BANK"}
+    assert matcher.tickers_in("Bank of New York Mellon") == {"BK", "BANK"}
+    assert matcher.tickers_in("Bankruptcy filing") == set()
+    assert matcher.tickers_in("Bank of Americas") == {"BANK"}
+
+
+def test_single_ticker_matcher_is_cached(matcher):
+    single = matcher.for_ticker("aapl")
+    assert single is matcher.for_ticker("AAPL")
+    assert single.mentions("Apple event") and not single.mentions("Facebook event")
+    assert matcher.for_ticker("ZZZZ").mentions("ZZZZ halted")  # Unknown tickers match by symbol
+
+
+def test_mask_and_bucket(matcher):
+    rows = pd.DataFrame({"title": ["Apple", "nothing", ""], "selftext": ["", "Facebook", "cats"]})
+    assert matcher.for_ticker("META").mask(rows["title"], rows["selftext"]).tolist() == [False, True, False]
+    assert matcher.bucket(rows["title"] + " " + rows["selftext"]) == [{"AAPL"}, {"META"}, set()]
+
+
+def test_strip_legal_suffix():
+    assert strip_legal_suffix("Apple Inc.") == "Apple"
+    assert strip_legal_suffix("NVIDIA CORP") == "NVIDIA"
+    assert strip_legal_suffix("Berkshire Hathaway Holdings, Inc") == "Berkshire Hathaway"
+    assert strip_legal_suffix("Inc") == "Inc"
+
+
+def test_load_alias_files(tmp_path):
+    json_path = tmp_path / "aliases.json"
+    json_path.write_text(json.dumps({"meta": "Meta OR Facebook", "AAPL": ["Apple"]}))
+    assert load_alias_file(str(json_path)) == {"META": ["Meta", "Facebook"], "AAPL": ["Apple"]}
+
+    csv_path = tmp_path / "us-companies.csv"
+    csv_path.write_text("Ticker;SimFinId;Company Name\nAAPL;111052;APPLE INC\nMSFT;59265;MICROSOFT CORP\n")
+    assert load_alias_file(str(csv_path)) == {"AAPL": ["APPLE INC", "APPLE"], "MSFT": ["MICROSOFT CORP", "MICROSOFT"]}
+
+    bad_path = tmp_path / "bad.csv"
+    bad_path.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError):
+        load_alias_file(str(bad_path))
+
+
+def test_global_matcher_uses_configured_aliases(tmp_path):
+    config = get_config()
+    previous = {key: config.get(key) for key in ("company_aliases", "data_dir")}
+    path = tmp_path / "company_aliases.json"
+    path.write_text(json.dumps({"RIVN": ["Rivian"]}))
+    try:
+        set_config({"data_dir": str(tmp_path), "company_aliases": {"path": None, "aliases": {"ZZ": ["Zed Corp"]}}})
+        matcher = get_company_matcher()
+        assert matcher.tickers_in("Rivian and Apple and Zed Corp") == {"RIVN", "AAPL", "ZZ"}
+        assert matcher.tickers_in("Snap Inc and Snap") == {"SNAP"}  # Built-in "Snap Inc." also as "Snap"
+    finally:
+        set_config(previous)
@@ -0,0 +1,224 @@
+"""Test cooperative deadlines and their propagation through route_to_vendor"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tradingagents.dataflows import deadline, interface
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.deadline import DeadlineExceeded, deadline_scope, http_timeout
+from tradingagents.dataflows.local import timeout
+from tradingagents.dataflows.singleflight import SingleFlight
+from tradingagents.dataflows.vendor_health import get_vendor_health
+
+METHOD = "get_global_news"
+
+
+def _in_thread(func):
+    """Run ``func`` in a non-main thread (where SIGALRM-based timeouts never fired)"""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(func).result()
+
+
+def test_deadline_in_worker_thread():
+    def work():
+        with pytest.raises(DeadlineExceeded) as raised:
+            with timeout(0.2):
+                for _ in range(100):
+                    deadline.sleep(0.05)
+        return raised.value
+
+    start = time.monotonic()
+    error = _in_thread(work)
+    assert time.monotonic() - start < 1.0
+    assert error.label == "local operation" and error.budget == 0.2
+
+
+def test_nested_scope_never_extends_parent_and_blames_innermost_budget():
+    with deadline_scope(0.3, "outer") as outer:
+        with deadline_scope(10, "inner") as inner:
+            assert inner.expires_at == outer.expires_at and outer.remaining() <= 0.3
+            assert http_timeout(30) <= max(0.3, deadline.MIN_HTTP_TIMEOUT_SECONDS)
+            time.sleep(0.35)
+            assert inner.error().label == "outer"
+        with deadline_scope(0.01, "short") as short:
+            time.sleep(0.02)
+            assert short.error().label == "outer"
+    with deadline_scope(0.01, "short") as short:
+        time.sleep(0.02)
+        assert short.error().label == "short"
+    assert deadline.current_deadline() is None
+    assert http_timeout(12) == 12
+
+
+def test_cancel_reaches_children():
+    with deadline_scope(None, "run") as run:
+        with deadline_scope(None, "child") as child:
+            assert child.remaining() is None and not child.expired()
+            run.cancel()
+            with pytest.raises(DeadlineExceeded, match="run"):
+                deadline.check_deadline()
+
+
+@pytest.fixture
+def stub_vendors(monkeypatch):
+    """Route METHOD to a slow primary with a fast fallback, from a clean health/quota state"""
+    calls = []
+
+    def slow(*args):
+        calls.append("slow")
+        for _ in range(200):  # A vendor loop with safe points, e.g. paging
+            deadline.sleep(0.05)
+        return "slow result"
+
+    def fast(*args):
+        calls.append("fast")
+        return "fast result"
+
+    async def aslow(*args):
+        calls.append("aslow")
+        await asyncio.sleep(10)
+        return "slow result"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, METHOD, {"slow": slow, "fast": fast})
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, METHOD, {"slow": aslow})
+    monkeypatch.setattr(interface, "is_async_http_available", lambda: True)
+    monkeypatch.setenv("DISABLE_LOCAL_SOURCES", "true")
+
+    config = get_config()
+    previous = {key: config.get(key) for key in (
+        "tool_vendors", "vendor_cache", "vendor_single_flight", "vendor_rate_limits",
+        "vendor_concurrency", "vendor_deadlines", "output_encoding", "macro_cache",
+    )}
+    set_config({
+        "tool_vendors": {METHOD: "slow"},
+        "vendor_cache": {"enabled": False},
+        "vendor_single_flight": False,
+        "vendor_rate_limits": {"enabled": False},
+        "vendor_concurrency": {"parallel_primaries": False, "hedge": False, "call_deadline_seconds": 5},
+        "vendor_deadlines": {"vendor_budget_seconds": 0.3, "method_budgets": {}},
+        "output_encoding": {"enabled": False},
+        "macro_cache": {"enabled": False},
+    })
+    interface.invalidate_routing_table()
+    health = get_vendor_health()
+    health.reset()
+    yield calls
+    set_config(previous)
+    interface.invalidate_routing_table()
+    health.reset()
+
+
+def test_slow_vendor_blows_its_budget_and_falls_back(stub_vendors):
+    start = time.monotonic()
+    output = _in_thread(lambda: interface.route_to_vendor(METHOD, "2024-05-10", 7, 5))
+    assert output == "fast result"
+    assert stub_vendors == ["slow", "fast"]
+    assert time.monotonic() - start < 2.0
+    overrun = deadline.deadline_overruns()[-1]
+    assert overrun["label"] == f"slow:{METHOD}" and overrun["budget"] == 0.3
+
+
+def test_call_budget_names_the_vendors_out_of_time(stub_vendors):
+    set_config({
+        "tool_vendors": {METHOD: "slow"},
+        "vendor_deadlines": {"vendor_budget_seconds": None, "method_budgets": {METHOD: 0.3}},
+    })
+    with pytest.raises(DeadlineExceeded, match="vendors out of time: slow") as raised:
+        _in_thread(lambda: interface.route_to_vendor(METHOD, "2024-05-10", 7, 5))
+    assert raised.value.label.startswith(METHOD)
+    assert stub_vendors == ["slow"]  # No time left for the fallback
+
+
+def test_async_vendor_is_cancelled_at_its_budget(stub_vendors):
+    start = time.monotonic()
+    output = asyncio.run(interface.aroute_to_vendor(METHOD, "2024-05-10", 7, 5))
+    assert output == "fast result"
+    assert stub_vendors == ["aslow", "fast"]
+    assert time.monotonic() - start < 2.0
+    assert deadline.deadline_overruns()[-1]["culprit"] == "slow"
+
+
+def test_concurrent_tasks_keep_separate_deadlines():
+    results = {}
+
+    def worker(name, budget):
+        with deadline_scope(budget, name):
+            time.sleep(0.1)
+            results[name] = deadline.current_deadline().expired()
+
+    threads = [threading.Thread(target=worker, args=("short", 0.05)), threading.Thread(target=worker, args=("long", 5))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {"short": True, "long": False}
+
+
+def test_coalesced_waiter_keeps_its_own_deadline():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def leader():
+        started.set()
+        release.wait(5)
+        return "shared"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(flight.do, "key", METHOD, leader)  # e.g. the prefetch stage, 90s budget
+        started.wait(1)
+        start = time.monotonic()
+        with deadline_scope(0.2, "analyst"):
+            with pytest.raises(DeadlineExceeded, match="analyst"):
+                flight.do("key", METHOD, lambda: pytest.fail("waiter ran the call"))
+        assert time.monotonic() - start < 1.0
+        release.set()
+        assert future.result() == "shared"
+
+
+def test_async_waiter_keeps_its_own_deadline():
+    flight = SingleFlight()
+
+    async def leader():
+        await asyncio.sleep(1.0)
+        return "shared"
+
+    async def waiter():
+        with deadline_scope(0.2, "analyst"):
+            return await flight.ado("key", METHOD, lambda: pytest.fail("waiter ran the call"))
+
+    async def main():
+        lead = asyncio.create_task(flight.ado("key", METHOD, leader))
+        await asyncio.sleep(0)
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded, match="analyst"):
+            await waiter()
+        assert time.monotonic() - start < 0.6
+        return await lead
+
+    assert asyncio.run(main()) == "shared"
+
+
+def test_cancelled_async_leader_hands_over_to_a_waiter():
+    flight = SingleFlight()
+    runs = []
+
+    async def call():
+        runs.append(1)
+        await asyncio.sleep(0.1)
+        return "result"
+
+    async def main():
+        lead = asyncio.create_task(flight.ado("key", METHOD, call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.ado("key", METHOD, call))
+        await asyncio.sleep(0.02)
+        lead.cancel()
+        assert await waiter == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await lead
+
+    asyncio.run(main())
+    assert len(runs) == 2
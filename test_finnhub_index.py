@@ -0,0 +1,87 @@
+"""Test the cached, date-indexed Finnhub file loader against the previous full scan"""
+import json
+import os
+
+import pytest
+
+from tradingagents.dataflows import local
+from tradingagents.dataflows.finnhub_index import get_finnhub_file_cache, unique_entries
+
+
+def _legacy_range(path, start_date, end_date):
+    with open(path) as f:
+        data = json.load(f)
+    return {key: value for key, value in data.items() if start_date <= key <= end_date and len(value) > 0}
+
+
+def _transaction(name, change, filing_date):
+    return {"name": name, "change": change, "share": 1000 + change, "transactionPrice": 12.5,
+            "transactionCode": "S", "filingDate": filing_date, "meta": {"ids": [1, 2]}}
+
+
+@pytest.fixture
+def finnhub_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(local, "DATA_DIR", str(tmp_path))
+    get_finnhub_file_cache().clear()
+    trans_dir = tmp_path / "finnhub_data" / "insider_trans"
+    trans_dir.mkdir(parents=True)
+    repeated = _transaction("CEO", -500, "2024-03-04")
+    data = {
+        # Deliberately not in date order
+        "2024-03-10": [_transaction("CFO", -20, "2024-03-08"), repeated],
+        "2024-03-01": [repeated],
+        "2024-03-05": [],
+        "2024-03-07": [_transaction("CTO", 300, "2024-03-06"), dict(repeated)],
+        "2024-02-10": [_transaction("CEO", -1, "2024-02-09")],
+        "2024-03-20": [_transaction("COO", 7, "2024-03-19")],
+    }
+    path = trans_dir / "AAPL_data_formatted.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [("2024-03-01", "2024-03-15"), ("2024-01-01", "2024-12-31"), ("2024-03-05", "2024-03-05"),
+     ("2024-03-07", "2024-03-07"), ("2025-01-01", "2025-02-01"), ("2024-03-10", "2024-03-01")],
+)
+def test_range_matches_full_scan(finnhub_dir, start_date, end_date):
+    got = local.get_data_in_range("AAPL", start_date, end_date, "insider_trans", local.DATA_DIR)
+    want = _legacy_range(finnhub_dir, start_date, end_date)
+    assert list(got.items()) == list(want.items())
+
+
+def test_file_parsed_once_and_reloaded_on_change(finnhub_dir):
+    cache = get_finnhub_file_cache()
+    loads = cache.stats()["loads"]
+    for day in range(1, 20):
+        local.get_data_in_range("AAPL", "2024-02-01", f"2024-03-{day:02d}", "insider_trans", local.DATA_DIR)
+    assert cache.stats()["loads"] == loads + 1
+
+    with open(finnhub_dir, "w") as f:
+        json.dump({"2024-03-02": [_transaction("NEW", 1, "2024-03-01")]}, f)
+    os.utime(finnhub_dir, (0, 0))
+    got = local.get_data_in_range("AAPL", "2024-03-01", "2024-03-31", "insider_trans", local.DATA_DIR)
+    assert list(got) == ["2024-03-02"]
+    assert cache.stats()["loads"] == loads + 2
+
+
+def test_insider_transactions_report_dedupes(finnhub_dir):
+    report = local.get_finnhub_company_insider_transactions("AAPL", "2024-03-15")
+    assert report.count("### Filing Date: 2024-03-04, CEO:") == 1
+    assert report.index("CFO") < report.index("CEO") < report.index("CTO")
+
+
+def test_unique_entries_matches_list_membership():
+    groups = [[{"a": 1, "b": [1, 2]}, {"a": 1.0, "b": [1, 2]}], [{"b": [1, 2], "a": 1}, {"a": 2}], [{"a": [1, {"x": 2}]}]]
+    legacy = []
+    for entries in groups:
+        for entry in entries:
+            if entry not in legacy:
+                legacy.append(entry)
+    assert list(unique_entries(groups)) == legacy
+
+
+def test_missing_file_raises(finnhub_dir):
+    with pytest.raises(FileNotFoundError):
+        local.get_data_in_range("MSFT", "2024-01-01", "2024-12-31", "insider_trans", local.DATA_DIR)
@@ -0,0 +1,120 @@
+"""Test the Google News scraper against saved result pages"""
+import threading
+import time
+
+import pytest
+from tenacity import wait_none
+
+from tradingagents.dataflows import googlenews_utils
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.googlenews_utils import (
+    FixtureFetcher,
+    FixtureResponse,
+    GoogleNewsScraper,
+    PolitenessScheduler,
+    fixture_name,
+)
+
+
+def _page(query, page, count, has_next):
+    """A results page with the markup parse_results_page() reads"""
+    items = "".join(
+        f'<div class="SoaBEf"><a href="https://news.example.com/{query}/{page}/{i}">'
+        f'<div class="MBeuO">{query} story {page}-{i}</div></a>'
+        f'<div class="GI74Re">Snippet {i}</div><span class="LfVVr">2 days ago</span>'
+        f'<div class="NUnG9d"><span>Example Wire</span></div></div>'
+        for i in range(count)
+    )
+    next_link = '<a id="pnnext" href="/search?start=next">Next</a>' if has_next else ""
+    return f"<html><body>{items}{next_link}</body></html>"
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    """Three pages for "AAPL stock" (the last one short), one page for "MSFT" """
+    for page, (count, has_next) in enumerate([(10, True), (10, True), (4, False)]):
+        (tmp_path / fixture_name("AAPL stock", page)).write_text(_page("aapl", page, count, has_next))
+    (tmp_path / fixture_name("MSFT", 0)).write_text(_page("msft", 0, 3, False))
+    return tmp_path
+
+
+class CountingFetcher(FixtureFetcher):
+    """Fixture transport that records requested pages and simulates network latency"""
+
+    def __init__(self, directory, latency=0.0):
+        super().__init__(str(directory))
+        self.latency = latency
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, headers):
+        with self.lock:
+            self.urls.append(url)
+        time.sleep(self.latency)
+        return super().__call__(url, headers)
+
+
+def _scraper(fetch, **kwargs):
+    return GoogleNewsScraper(fetch=fetch, scheduler=PolitenessScheduler(0, 0), retry_wait=wait_none(), **kwargs)
+
+
+def test_fixture_pages_are_parsed_in_order(fixtures):
+    fetch = CountingFetcher(fixtures)
+    results = _scraper(fetch).search("AAPL+stock", "2024-05-01", "2024-05-10")
+    assert len(results) == 24
+    assert [r["title"] for r in results[:2]] == ["aapl story 0-0", "aapl story 0-1"]
+    assert results[-1]["title"] == "aapl story 2-3" and results[0]["source"] == "Example Wire"
+    assert "cd_min:05/01/2024" in fetch.urls[0]
+
+
+def test_limit_stops_paging_without_speculative_requests(fixtures):
+    fetch = CountingFetcher(fixtures)
+    results = _scraper(fetch, prefetch_pages=2).search("AAPL+stock", "2024-05-01", "2024-05-10", limit=12)
+    assert len(results) == 12
+    assert len(fetch.urls) == 2  # Page 2 was never requested
+
+
+def test_next_page_downloads_while_the_current_one_is_parsed(fixtures):
+    fetch = CountingFetcher(fixtures, latency=0.2)
+    start = time.monotonic()
+    results = _scraper(fetch, prefetch_pages=2).search("AAPL+stock", "2024-05-01", "2024-05-10")
+    assert len(results) == 24
+    assert time.monotonic() - start < 0.5  # Three pages, not 3 x 0.2s in sequence
+
+
+def test_rate_limited_page_is_retried_and_backs_off_the_host(fixtures):
+    replay = FixtureFetcher(str(fixtures))
+    statuses = [429]
+
+    def flaky(url, headers):
+        if statuses:
+            return FixtureResponse(statuses.pop(), b"", url)
+        return replay(url, headers)
+
+    scraper = _scraper(flaky)
+    results = scraper.search("MSFT", "2024-05-01", "2024-05-10")
+    assert len(results) == 3
+    assert scraper.scheduler.stats["backoffs"] == 1
+
+
+def test_scheduler_spaces_requests_per_host():
+    scheduler = PolitenessScheduler(min_interval=0.5, jitter=0.0)
+    assert scheduler.reserve("www.google.com") == 0
+    assert scheduler.reserve("www.google.com") == pytest.approx(0.5, abs=0.05)
+    assert scheduler.reserve("news.example.com") == 0
+    scheduler.back_off("news.example.com", 3)
+    assert scheduler.reserve("news.example.com") == pytest.approx(3, abs=0.05)
+
+
+def test_search_many_and_configured_fixture(fixtures):
+    config = get_config()
+    previous = config.get("google_news")
+    set_config({"google_news": {**previous, "fixture_path": str(fixtures), "min_interval_seconds": 0, "jitter_seconds": 0}})
+    try:
+        scraper = googlenews_utils.get_google_news_scraper()
+        assert isinstance(scraper.fetch, FixtureFetcher)
+        results = scraper.search_many(["AAPL+stock", "MSFT"], "2024-05-01", "2024-05-10", limit=15)
+        assert {query: len(items) for query, items in results.items()} == {"AAPL+stock": 15, "MSFT": 3}
+        assert len(googlenews_utils.getNewsData("MSFT", "2024-05-01", "2024-05-10")) == 3
+    finally:
+        set_config({"google_news": previous})
@@ -0,0 +1,207 @@
+"""Test indexed date lookups in the indicator path against the previous string-scan implementation"""
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from stockstats import wrap
+
+from tradingagents.dataflows import price_store
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.price_frame_cache import PriceFrameCache, clear_price_frame_cache, get_price_frame_cache
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+from tradingagents.dataflows.y_finance import get_stock_stats_indicators_window
+
+NOT_TRADING = "N/A: Not a trading day (weekend or holiday)"
+HOLIDAYS = ["2024-01-01", "2024-01-15", "2024-05-27", "2024-07-04", "2024-11-28", "2024-12-25", "2025-01-01"]
+
+
+def _synthetic_prices() -> pd.DataFrame:
+    """Business days without exchange holidays, like a yfinance daily download"""
+    sessions = pd.bdate_range("2023-06-01", "2025-01-10", name="Date").difference(pd.DatetimeIndex(HOLIDAYS))
+    rng = np.random.default_rng(7)
+    close = 150 + np.cumsum(rng.normal(0, 2, len(sessions)))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + rng.uniform(0, 2, len(sessions)),
+            "Low": close - rng.uniform(0, 2, len(sessions)),
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 5_000_000, len(sessions)).astype(float),
+        },
+        index=pd.DatetimeIndex(sessions, name="Date"),
+    )
+
+
+PRICES = _synthetic_prices()
+
+
+@pytest.fixture(autouse=True)
+def offline_store(tmp_path, monkeypatch):
+    """Serve the synthetic history from a temporary price store"""
+    def fake_download(symbol, start, end, **kwargs):
+        return PRICES[(PRICES.index >= start) & (PRICES.index < end)]
+
+    monkeypatch.setattr(price_store.yf, "download", fake_download)
+    previous = get_config()["data_cache_dir"]
+    set_config({"data_cache_dir": str(tmp_path)})
+    clear_price_frame_cache()
+    yield
+    clear_price_frame_cache()
+    set_config({"data_cache_dir": previous})
+
+
+def _legacy_lookup(indicator: str, curr_date: str):
+    """Previous StockstatsUtils.get_stock_stats: str.startswith scan over every row"""
+    df = wrap(PRICES.reset_index())
+    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    df[indicator]
+    matching_rows = df[df["Date"].str.startswith(curr_date)]
+    if not matching_rows.empty:
+        return matching_rows[indicator].values[0]
+    return NOT_TRADING
+
+
+def _legacy_window_lines(indicator: str, curr_date: str, look_back_days: int) -> list:
+    """Previous window loop: one lookup per calendar day"""
+    day = pd.Timestamp(curr_date)
+    before = day - pd.Timedelta(days=look_back_days)
+    lines = []
+    while day >= before:
+        value = _legacy_lookup(indicator, day.strftime("%Y-%m-%d"))
+        if not isinstance(value, str):
+            value = "N/A" if pd.isna(value) else str(value)
+        lines.append(f"{day.strftime('%Y-%m-%d')}: {value}")
+        day -= pd.Timedelta(days=1)
+    return lines
+
+
+def _window_lines(report: str) -> list:
+    return [line for line in report.splitlines() if line[:4].isdigit() and ": " in line]
+
+
+def _assert_same_lines(actual: list, expected: list):
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        got_date, got_value = got.split(": ", 1)
+        want_date, want_value = want.split(": ", 1)
+        assert got_date == want_date
+        if want_value.startswith("N/A"):
+            assert got_value == want_value
+        else:
+            assert float(got_value) == pytest.approx(float(want_value), rel=1e-9)
+
+
+@pytest.mark.parametrize(
+    "curr_date, look_back_days",
+    [
+        ("2024-07-06", 10),   # Ends on a Saturday, spans the July 4 holiday
+        ("2024-07-04", 7),    # Ends on a holiday
+        ("2024-12-30", 5),    # Starts on Christmas
+        ("2024-11-29", 1),    # Day after Thanksgiving, window edge on the holiday
+        ("2024-05-27", 0),    # Zero-length window on a Monday holiday
+        ("2025-01-10", 4),    # Ends on the last stored session
+        ("2025-01-14", 6),    # Runs past the end of the data
+        ("2023-06-05", 10),   # Starts before the first stored session
+    ],
+)
+def test_window_matches_legacy(curr_date, look_back_days):
+    for indicator in ("rsi", "close_50_sma", "boll_lb"):
+        report = get_stock_stats_indicators_window("AAPL", indicator, curr_date, look_back_days)
+        _assert_same_lines(_window_lines(report), _legacy_window_lines(indicator, curr_date, look_back_days))
+
+
+@pytest.mark.parametrize(
+    "curr_date",
+    ["2024-07-03", "2024-07-04", "2024-07-06", "2024-12-25", "2023-06-01", "2025-01-10", "2023-05-31", "2025-02-03"],
+)
+def test_single_date_matches_legacy(curr_date):
+    for indicator in ("macd", "atr", "boll"):
+        got = StockstatsUtils.get_stock_stats("AAPL", indicator, curr_date)
+        want = _legacy_lookup(indicator, curr_date)
+        if isinstance(want, str):
+            assert got == want
+        elif pd.isna(want):
+            assert pd.isna(got)
+        else:
+            assert float(got) == pytest.approx(float(want), rel=1e-9)
+
+
+def test_memoized_growth_is_held_to_the_byte_budget():
+    cache = PriceFrameCache()
+    first = cache.get("AAPL", "1", lambda: PRICES)
+    second = cache.get("MSFT", "1", lambda: PRICES)
+    cache.max_bytes = first.nbytes + second.nbytes + 1024
+    before = second.nbytes
+    second.indicator("kdjk")  # stockstats-only: the wrap and its helper columns count too
+    assert second.nbytes > before + PRICES.memory_usage(index=True).sum()
+    assert cache.stats()["frames"] == 1 and cache.entries()[0]["symbol"] == "MSFT"
+
+
+def test_least_recently_used_frame_is_evicted():
+    cache = PriceFrameCache()
+    loads = []
+
+    def loader(symbol):
+        def load():
+            loads.append(symbol)
+            return PRICES
+        return load
+
+    aapl = cache.get("AAPL", "1", loader("AAPL"))
+    cache.max_bytes = 2 * aapl.nbytes
+    cache.get("MSFT", "1", loader("MSFT"))
+    assert cache.get("AAPL", "1", loader("AAPL")) is aapl  # Hit: AAPL becomes most recently used
+    cache.get("NVDA", "1", loader("NVDA"))
+
+    assert [entry["symbol"] for entry in cache.entries()] == ["AAPL", "NVDA"]
+    assert loads == ["AAPL", "MSFT", "NVDA"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3 and cache.stats()["evictions"] == 1
+    # A frame larger than the whole budget is still kept while it is the newest
+    cache.max_bytes = 1
+    cache.trim()
+    assert [entry["symbol"] for entry in cache.entries()] == ["NVDA"]
+
+
+def test_new_data_version_replaces_the_frame():
+    cache = PriceFrameCache()
+    first = cache.get("AAPL", "1", lambda: PRICES)
+    second = cache.get("AAPL", "2", lambda: PRICES.iloc[:-1])
+    assert second is not first and len(second.prices) == len(PRICES) - 1
+    assert cache.stats()["frames"] == 1 and cache.entries()[0]["version"] == "2"
+
+
+def test_concurrent_misses_share_one_load():
+    cache = PriceFrameCache()
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        time.sleep(0.1)
+        return PRICES
+
+    frames = []
+    threads = [threading.Thread(target=lambda: frames.append(cache.get("AAPL", "1", slow_load))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1 and all(frame is frames[0] for frame in frames)
+
+
+def test_budget_follows_the_config():
+    cache = get_price_frame_cache()
+    previous = dict(get_config()["price_store"])
+    first = cache.get("AAPL", "1", lambda: PRICES)
+    cache.get("MSFT", "1", lambda: PRICES)
+    try:
+        set_config({"price_store": {**previous, "frame_cache_max_bytes": first.nbytes}})
+        assert get_price_frame_cache() is cache and cache.max_bytes == first.nbytes
+        assert [entry["symbol"] for entry in cache.entries()] == ["MSFT"]
+    finally:
+        set_config({"price_store": previous})
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,58 @@
+"""Test the vectorized indicator engine against stockstats (see benchmarks/bench_indicators.py)"""
+import numpy as np
+import pandas as pd
+import pytest
+from stockstats import wrap
+
+from tradingagents.dataflows.indicator_engine import SUPPORTED_INDICATORS, compute_indicators
+
+
+def _synthetic_prices(rows: int = 1500, seed: int = 0) -> pd.DataFrame:
+    """Random-walk daily OHLCV frame indexed by business day"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2025-06-30", periods=rows, name="Date")
+    close = np.exp(np.log(rng.uniform(5, 300)) + np.cumsum(rng.normal(0.0004, 0.02, rows)))
+    spread = rng.uniform(0, 0.02, (2, rows))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * (1 + spread[0]),
+            "Low": close * (1 - spread[1]),
+            "Close": close,
+            "Volume": rng.integers(100_000, 50_000_000, rows).astype(float),
+        },
+        index=index,
+    )
+
+
+PRICES = _synthetic_prices()
+
+
+@pytest.fixture(scope="module")
+def engine_frame():
+    return compute_indicators(PRICES)
+
+
+def test_all_thirteen_indicators_are_supported():
+    assert len(SUPPORTED_INDICATORS) == 13
+
+
+@pytest.mark.parametrize("indicator", SUPPORTED_INDICATORS)
+def test_matches_stockstats(indicator, engine_frame):
+    expected = wrap(PRICES.reset_index())[indicator].to_numpy(dtype="float64")
+    actual = engine_frame[indicator].to_numpy(dtype="float64")
+
+    assert len(actual) == len(expected)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))  # Same warm-up rows
+    valid = ~np.isnan(expected)
+    np.testing.assert_allclose(actual[valid], expected[valid], rtol=1e-8, atol=0)
+
+
+def test_subset_matches_the_full_pass(engine_frame):
+    subset = compute_indicators(PRICES, ["rsi", "boll_ub"])
+    assert set(subset.columns) >= {"rsi", "boll_ub"}
+    pd.testing.assert_series_equal(subset["rsi"], engine_frame["rsi"])
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,163 @@
+"""Test the date-scoped macro cache (get_global_news, economic calendar)"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from tradingagents.dataflows import alpha_vantage_economic, interface, macro_cache
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.deadline import DeadlineExceeded, deadline_scope
+from tradingagents.dataflows.macro_cache import MacroCache
+
+METHOD = "get_global_news"
+
+
+def test_concurrent_callers_compute_once(tmp_path):
+    cache = MacroCache(str(tmp_path))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "global news"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute(METHOD, "2024-05-10", compute, (7, 5))))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["global news"] * 8 and len(calls) == 1
+    # Other parameters and other dates are separate entries
+    assert cache.get_or_compute(METHOD, "2024-05-10", lambda: "three days", (3, 5)) == "three days"
+    assert cache.get_or_compute(METHOD, "2024-05-13", lambda: "next day", (7, 5)) == "next day"
+
+
+def test_waiter_gives_up_at_its_own_deadline(tmp_path):
+    cache = MacroCache(str(tmp_path))
+    started, release = threading.Event(), threading.Event()
+
+    def slow_compute():
+        started.set()
+        release.wait(5)
+        return "global news"
+
+    leader = threading.Thread(target=lambda: cache.get_or_compute(METHOD, "2024-05-10", slow_compute))
+    leader.start()
+    started.wait(1)
+    start = time.monotonic()
+    with deadline_scope(0.2, "analyst"):
+        with pytest.raises(DeadlineExceeded, match="analyst"):
+            cache.get_or_compute(METHOD, "2024-05-10", lambda: pytest.fail("recomputed"))
+    assert time.monotonic() - start < 1.0
+    release.set()
+    leader.join()
+    assert cache.lookup(METHOD, "2024-05-10") == "global news"
+
+
+def test_async_callers_compute_once(tmp_path):
+    cache = MacroCache(str(tmp_path))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "global news"
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_compute(METHOD, "2024-05-10", compute) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["global news"] * 5 and len(calls) == 1
+    assert cache.lookup(METHOD, "2024-05-10") == "global news"
+
+
+def test_entries_are_shared_on_disk(tmp_path):
+    MacroCache(str(tmp_path)).store(METHOD, "2024-05-10", "global news", (7, 5))
+    assert (tmp_path / "2024-05-10").is_dir()
+    other_process = MacroCache(str(tmp_path))
+    assert other_process.get_or_compute(METHOD, "2024-05-10", lambda: pytest.fail("recomputed"), (7, 5)) == "global news"
+    assert other_process.stats["disk_hits"] == 1
+    # Entries stored before a forced refresh are recomputed
+    forced = MacroCache(str(tmp_path), force_refresh=True)
+    assert forced.get_or_compute(METHOD, "2024-05-10", lambda: "fresh", (7, 5)) == "fresh"
+
+
+def test_intraday_entries_expire_and_past_dates_are_final(tmp_path):
+    cache = MacroCache(str(tmp_path), intraday_refresh_seconds=60)
+    today = time.strftime("%Y-%m-%d")
+    cache.store(METHOD, today, "morning", ())
+    cache.store(METHOD, "2024-05-10", "final", ())
+    for path in tmp_path.glob("*/*.json"):
+        entry = json.loads(path.read_text())
+        entry["computed_at"] -= 120
+        path.write_text(json.dumps(entry))
+    reader = MacroCache(str(tmp_path), intraday_refresh_seconds=60)
+    assert reader.lookup(METHOD, today) is None
+    assert reader.lookup(METHOD, "2024-05-10") == "final"
+
+
+def test_refresh_and_errors(tmp_path):
+    cache = MacroCache(str(tmp_path))
+    assert not cache.store(METHOD, "2024-05-10", "Error fetching news: 503", ())
+    cache.store(METHOD, "2024-05-10", "global news", ())
+    cache.store("get_economic_calendar", "2024-05-10", "calendar", ())
+    assert cache.refresh(METHOD, "2024-05-10") == 1
+    assert cache.lookup(METHOD, "2024-05-10") is None
+    assert cache.lookup("get_economic_calendar", "2024-05-10") == "calendar"
+
+
+@pytest.fixture
+def macro_config(tmp_path, monkeypatch):
+    """Route METHOD to a counting stub with only the macro cache (under tmp_path) enabled"""
+    calls = []
+
+    def stub(curr_date, look_back_days=7, limit=5):
+        calls.append(curr_date)
+        return f"## Global news for {curr_date}"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, METHOD, {"stub": stub})
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, METHOD, {})
+    monkeypatch.setenv("DISABLE_LOCAL_SOURCES", "true")
+    config = get_config()
+    previous = {key: config.get(key) for key in ("tool_vendors", "vendor_cache", "output_encoding", "macro_cache")}
+    set_config({
+        "tool_vendors": {METHOD: "stub"},
+        "vendor_cache": {"enabled": False},
+        "output_encoding": {"enabled": False},
+        "macro_cache": {"enabled": True, "path": str(tmp_path), "intraday_refresh_minutes": 60,
+                        "force_refresh": False, "methods": [METHOD, "get_economic_calendar"]},
+    })
+    interface.invalidate_routing_table()
+    yield calls
+    set_config(previous)
+    interface.invalidate_routing_table()
+
+
+def test_router_fetches_global_news_once_per_trade_date(macro_config):
+    for _ in range(3):  # e.g. three tickers analysed on the same date
+        assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "## Global news for 2024-05-10"
+    interface.route_to_vendor(METHOD, curr_date="2024-05-10", look_back_days=7, limit=5)  # Keyword form: its own entry
+    interface.route_to_vendor(METHOD, "2024-05-13", 7, 5)
+    assert macro_config == ["2024-05-10", "2024-05-10", "2024-05-13"]
+    assert macro_cache.refresh_macro_data(METHOD, "2024-05-13") == 1
+    interface.route_to_vendor(METHOD, "2024-05-13", 7, 5)
+    assert len(macro_config) == 4
+
+
+def test_economic_calendar_is_shared(macro_config, monkeypatch):
+    requests = []
+    payload = {"data": [{"date": "2024-05-15", "event": "CPI", "country": "US", "importance": "high"}]}
+
+    def fake_request(function_name, params):
+        requests.append(params)
+        return json.dumps(payload)
+
+    monkeypatch.setattr(alpha_vantage_economic, "_make_api_request", fake_request)
+    first = alpha_vantage_economic.get_economic_calendar("2024-05-10", "2024-06-10")
+    second = alpha_vantage_economic.get_economic_calendar("2024-05-10", "2024-06-10")
+    assert first == second and "**CPI**" in first and len(requests) == 1
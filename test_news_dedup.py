@@ -0,0 +1,124 @@
+"""Test cross-vendor news deduplication of joined get_news outputs"""
+import json
+
+from tradingagents.dataflows.news_normalize import (
+    NewsDeduplicator,
+    canonical_url,
+    deduplicate_articles,
+    parse_news_output,
+)
+from tradingagents.dataflows.output_encoding import OutputEncoder, get_encoder
+
+FINNHUB = """## Finnhub Company News for AAPL
+**Period**: 2024-05-01 to 2024-05-10
+**Total Articles**: 3
+
+### Apple beats earnings estimates as iPhone sales surge
+**Date**: 2024-05-02 21:05 | **Source**: Reuters
+Apple reported quarterly revenue above expectations.
+[Read more](https://www.reuters.com/tech/apple-earnings/?utm_source=finnhub)
+
+### Apple announces record $110 billion buyback
+**Date**: 2024-05-02 21:10 | **Source**: Yahoo
+The board authorized a new repurchase program.
+[Read more](https://finance.yahoo.com/news/apple-buyback)
+
+### EU opens probe into App Store rules
+**Date**: 2024-05-06 09:00 | **Source**: MarketWatch
+Regulators question anti-steering provisions.
+[Read more](https://www.marketwatch.com/story/eu-app-store)
+"""
+
+GOOGLE = """## AAPL Google News, from 2024-05-01 to 2024-05-10:
+
+### Apple Beats Earnings Estimates as iPhone Sales Surge - Reuters (source: Reuters)
+
+Apple reported quarterly revenue above expectations.
+
+### Apple tops earnings estimates as iPhone sales surge (source: Motley Fool)
+
+Shares rose after hours.
+
+### Apple announces record $110 billion buyback (source: CNBC)
+
+The largest buyback in US history.
+
+"""
+
+REDDIT = """##AAPL News Reddit, from 2024-05-01 to 2024-05-10:
+
+### Apple announces record $110 billion buyback!!
+
+Thoughts on this?
+
+### Is the Vision Pro dead?
+
+"""
+
+
+def test_parse_vendor_sections():
+    sections = parse_news_output("\n".join([FINNHUB, GOOGLE, REDDIT]))
+    assert [s.vendor for s in sections] == ["finnhub", "google", "reddit"]
+    first = sections[0].articles[0]
+    assert first.source == "Reuters" and first.published == "2024-05-02 21:05"
+    assert first.url.startswith("https://www.reuters.com/")
+    google = sections[1].articles[0]
+    assert google.title.endswith("Surge - Reuters") and google.source == "Reuters"
+    assert sections[2].articles[1].source == "reddit"
+
+
+def test_canonical_url_drops_tracking_and_prefixes():
+    assert canonical_url("http://www.Reuters.com/tech/apple-earnings/?utm_source=x&id=3#top") == \
+        canonical_url("https://reuters.com/tech/apple-earnings?id=3")
+    assert canonical_url("https://a.com/x?id=3") != canonical_url("https://a.com/x?id=4")
+
+
+def test_duplicates_across_vendors_keep_best_source():
+    output = "\n".join([FINNHUB, GOOGLE, REDDIT])
+    sections = parse_news_output(output)
+    articles = [a for s in sections for a in s.articles]
+    kept, removed = deduplicate_articles(articles)
+    titles = [a.title for a in kept]
+    # Earnings story: Finnhub/Reuters copy wins over the Google copies (same outlet, and a reworded one)
+    assert titles.count("Apple beats earnings estimates as iPhone sales surge") == 1
+    assert not any("tops earnings" in t for t in titles)
+    # Buyback story: three copies -> the complete Finnhub record (URL, timestamp) outranks Google and Reddit
+    buyback = [a for a in kept if "buyback" in a.title]
+    assert len(buyback) == 1 and buyback[0].vendor == "finnhub"
+    assert "Is the Vision Pro dead?" in titles and len(kept) == 4
+    assert removed["exact"] + removed["near"] == len(articles) - len(kept)
+
+
+def test_encoder_reports_removed_articles_and_tokens():
+    output = "\n".join([FINNHUB, GOOGLE, REDDIT])
+    deduplicator = NewsDeduplicator()
+    normalized = deduplicator.normalize("get_news", output)
+    assert len(normalized) < len(output)
+    assert "## Finnhub Company News for AAPL" in normalized
+    assert "Motley Fool" not in normalized and "Thoughts on this?" not in normalized
+    counters = deduplicator.snapshot()["get_news"]
+    assert counters["articles_in"] == 8 and counters["articles_out"] == 4
+    assert counters["tokens_removed"] > 0
+
+
+def test_alpha_vantage_payload_and_unknown_text():
+    payload = {"feed": [
+        {"title": "Apple announces record $110 billion buyback", "url": "https://www.cnbc.com/apple-buyback",
+         "time_published": "20240502T211500", "summary": "Record buyback.", "source": "CNBC"},
+        {"title": "Unrelated story", "url": "https://example.com/x", "time_published": "20240503T100000",
+         "summary": "", "source": "Benzinga"},
+    ]}
+    output = "\n".join([FINNHUB, json.dumps(payload, indent=2), "Some free-form analysis from another vendor."])
+    normalized = NewsDeduplicator().normalize("get_news", output)
+    assert "## Alpha Vantage News Sentiment" in normalized
+    assert "**Date**: 2024-05-02 21:15 | **Source**: CNBC" in normalized
+    assert "finance.yahoo.com" not in normalized
+    assert normalized.rstrip().endswith("Some free-form analysis from another vendor.")
+
+
+def test_news_methods_use_the_dedup_encoder():
+    from tradingagents.dataflows import interface  # noqa: F401  (registers the news encoders)
+    encoder = OutputEncoder({"default_token_budget": 0})
+    encoded = encoder.encode("get_news", "\n".join([FINNHUB, GOOGLE]))
+    assert encoded.count("### Apple announces record") == 1
+    assert get_encoder("get_global_news") is get_encoder("get_news")
@@ -0,0 +1,106 @@
+"""Test relevance-ranked, token-budgeted news selection"""
+import json
+
+import pytest
+
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.news_normalize import (
+    NewsSelection,
+    news_selection_for,
+    parse_news_output,
+    score_article,
+    select_articles,
+)
+from tradingagents.dataflows.output_encoding import OutputEncoder, estimate_tokens
+
+
+def _finnhub(articles):
+    lines = ["## Finnhub Company News for AAPL", "**Period**: 2024-05-01 to 2024-05-10",
+             f"**Total Articles**: {len(articles)}", ""]
+    for title, date, source, summary in articles:
+        lines += [f"### {title}", f"**Date**: {date} 12:00 | **Source**: {source}", summary,
+                  f"[Read more](https://news.example.com/{abs(hash(title))})", ""]
+    return "\n".join(lines)
+
+
+def _articles(output):
+    return [a for section in parse_news_output(output) for a in section.articles]
+
+
+@pytest.fixture
+def selection_config():
+    config = get_config()
+    previous = {key: config.get(key) for key in ("news_selection", "economy_mode")}
+    yield
+    set_config(previous)
+
+
+def test_relevant_recent_reputable_articles_score_higher():
+    selection = NewsSelection("AAPL", "2024-05-10", 0)
+    from tradingagents.dataflows.company_matcher import get_company_matcher
+    matcher = get_company_matcher().for_ticker("AAPL")
+    relevant, stale, offtopic, reputable = _articles(_finnhub([
+        ("Apple raises dividend", "2024-05-09", "Reuters", "Apple lifted its payout. Analysts cheered."),
+        ("Apple raises dividend", "2024-04-01", "Reuters", "Apple lifted its payout. Analysts cheered."),
+        ("Oil prices slide", "2024-05-09", "Benzinga", "Crude fell on demand worries."),
+        ("Oil prices slide", "2024-05-09", "Reuters", "Crude fell on demand worries."),
+    ]))
+    scores = [score_article(a, selection, matcher) for a in (relevant, stale, offtopic)]
+    assert scores[0] > scores[1] > scores[2]
+    # relevant/stale differ only in recency; reputable differs from relevant in mentions, from offtopic in source
+    assert scores[2] < score_article(reputable, selection, matcher) < scores[0]
+
+
+def test_greedy_packing_respects_the_budget_and_keeps_order():
+    filler = "Apple shares moved as investors digested the report. " * 6
+    output = _finnhub([
+        (f"Apple story {i}", f"2024-05-{1 + i % 9:02d}", "Reuters" if i % 3 == 0 else "Benzinga", filler)
+        for i in range(30)
+    ])
+    articles = _articles(output)
+    selected = select_articles(articles, NewsSelection("AAPL", "2024-05-10", 800), reserved_tokens=30)
+    assert 1 <= len(selected) < len(articles)
+    assert sum(estimate_tokens(a.text) for a in selected) <= 800 - 30
+    positions = [articles.index(a) for a in selected]
+    assert positions == sorted(positions)
+    # Fresher articles are preferred
+    day = lambda a: int(a.published[8:10])
+    assert sum(map(day, selected)) / len(selected) > sum(map(day, articles)) / len(articles)
+
+
+def test_vendor_relevance_scores_break_ties():
+    payload = {"feed": [
+        {"title": "Tech stocks rally", "url": "https://a.com/1", "time_published": "20240509T120000",
+         "summary": "Megacaps led gains.", "source": "Reuters", "overall_sentiment_score": 0.1,
+         "ticker_sentiment": [{"ticker": "AAPL", "relevance_score": "0.1"}]},
+        {"title": "Chipmakers climb", "url": "https://a.com/2", "time_published": "20240509T120000",
+         "summary": "Suppliers gained.", "source": "Reuters", "overall_sentiment_score": 0.45,
+         "ticker_sentiment": [{"ticker": "AAPL", "relevance_score": "0.9"}]},
+    ]}
+    articles = _articles(json.dumps(payload))
+    assert articles[1].relevance == {"AAPL": 0.9} and articles[1].sentiment == 0.45
+    selected = select_articles(articles, NewsSelection("AAPL", "2024-05-10", 0, max_articles=1))
+    assert [a.title for a in selected] == ["Chipmakers climb"]
+
+
+def test_selection_settings_from_config_and_call_arguments(selection_config):
+    set_config({"economy_mode": True, "news_selection": {"enabled": True, "token_budgets": {"get_news": 900}}})
+    selection = news_selection_for("get_news", ("aapl", "2024-05-01", "2024-05-10"), budget=6000)
+    assert selection.ticker == "AAPL" and selection.reference_date == "2024-05-10"
+    assert selection.token_budget == 900
+    assert selection.max_articles == get_config()["economy_config"]["max_news_articles"]
+    global_news = news_selection_for("get_global_news", ("2024-05-10", 7, 5), budget=6000)
+    assert global_news.ticker is None and global_news.token_budget == 6000
+
+
+def test_encoder_bounds_verbose_news(selection_config):
+    set_config({"economy_mode": False, "news_selection": {"enabled": True, "token_budgets": {"get_news": 1000}}})
+    from tradingagents.dataflows import interface  # noqa: F401  (registers the news encoders)
+    filler = "Apple reported strong services growth and a record buyback. " * 8
+    output = _finnhub([(f"Apple {i:03x} {i * 7919:x} {i * 104729:x}", "2024-05-09", "Reuters", filler) for i in range(40)])
+    encoded = OutputEncoder({"default_token_budget": 6000}).encode("get_news", output, ("AAPL", "2024-05-01", "2024-05-10"))
+    assert estimate_tokens(encoded) <= 1000
+    assert "lower-ranked articles omitted" in encoded
+    assert encoded.startswith("## Finnhub Company News for AAPL")
+    # The header counts the articles that were kept, not the 40 the vendor returned
+    assert f"**Total Articles**: {encoded.count(chr(10) + '### ')}" in encoded.splitlines()
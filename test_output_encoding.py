@@ -0,0 +1,100 @@
+"""Test the compact output encoders applied to routed tool outputs"""
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.output_encoding import OutputEncoder, estimate_tokens, format_number
+
+
+def _price_output(rows: int) -> str:
+    dates = pd.bdate_range("2024-01-02", periods=rows, name="Date")
+    close = np.linspace(100, 120, rows)
+    data = pd.DataFrame(
+        {"Open": close + 0.123456, "High": close + 1, "Low": close - 1, "Close": close,
+         "Volume": np.full(rows, 52166000.0), "Dividends": 0.0, "Stock Splits": 0.0},
+        index=dates.astype(str) + " 00:00:00-05:00",
+    )
+    data.index.name = "Date"
+    return (
+        f"# Stock data for AAPL from 2024-01-02 to 2024-12-31\n# Total records: {rows}\n"
+        f"# Data retrieved on: 2025-01-01 10:00:00\n\n" + data.to_csv()
+    )
+
+
+def test_format_number():
+    assert format_number(52166000.0) == "52.166M"
+    assert format_number(-3.2e11) == "-320B"
+    assert format_number(189.4512) == "189.45"
+    assert format_number(12.0) == "12"
+    assert format_number(0.000123456) == "0.00012346"
+    assert format_number(float("nan")) == "N/A"
+
+
+def test_price_table_is_compacted():
+    encoder = OutputEncoder({"default_token_budget": 0})
+    raw = _price_output(20)
+    encoded = encoder.encode("get_stock_data", raw)
+    lines = encoded.splitlines()
+    assert "Date,Open,High,Low,Close,Volume" in lines
+    assert "2024-01-02,100.12,101,99,100,52.166M" in lines
+    assert "Dividends, Stock Splits" in encoded
+    assert "# Close: 100 -> 120 (+20.00%), low 100, high 120" in lines
+    assert "Data retrieved on" not in encoded
+    assert estimate_tokens(encoded) < estimate_tokens(raw)
+
+
+def test_budget_keeps_most_recent_rows():
+    encoder = OutputEncoder({"token_budgets": {"get_stock_data": 400}})
+    encoded = encoder.encode("get_stock_data", _price_output(250))
+    assert estimate_tokens(encoded) <= 400
+    assert "older rows omitted" in encoded
+    data_lines = [line for line in encoded.splitlines() if line[:4].isdigit()]
+    assert data_lines[-1].startswith("2024-12-16")  # 250th business day
+
+
+def test_indicator_window_drops_non_trading_days():
+    raw = (
+        "## rsi values from 2024-07-01 to 2024-07-07:\n\n"
+        "2024-07-07: N/A: Not a trading day (weekend or holiday)\n"
+        "2024-07-06: N/A: Not a trading day (weekend or holiday)\n"
+        "2024-07-05: 61.234567891\n"
+        "2024-07-04: N/A: Not a trading day (weekend or holiday)\n"
+        "2024-07-03: 58.1\n"
+        "2024-07-02: N/A\n"
+        "\n\nRSI: Measures momentum."
+    )
+    encoder = OutputEncoder()
+    encoded = encoder.encode("get_indicators", raw).splitlines()
+    assert encoded[1] == "(trading days only; 3 weekend/holiday dates omitted)"
+    assert encoded[2:5] == ["2024-07-05: 61.235", "2024-07-03: 58.1", "2024-07-02: N/A"]
+    assert encoded[-1] == "RSI: Measures momentum."
+
+
+def test_report_counts_saved_tokens():
+    encoder = OutputEncoder()
+    snapshot = encoder.snapshot()
+    encoder.encode("get_stock_data", _price_output(30))
+    encoder.encode("get_news", "short news")
+    report = encoder.report_since(snapshot)
+    assert report["methods"]["get_stock_data"]["calls"] == 1
+    assert report["methods"]["get_news"]["saved"] == 0
+    assert report["saved"] == report["tokens_in"] - report["tokens_out"] > 0
+
+
+def test_disabled_encoder_passes_output_through():
+    raw = _price_output(5)
+    assert OutputEncoder({"enabled": False}).encode("get_stock_data", raw) == raw
+
+
+def test_quoted_commas_do_not_shift_the_header():
+    insider = pd.DataFrame({
+        "Shares": [50000, 12000, 3000],
+        "Value": [9500000.0, 2280000.0, 0.0],
+        "Text": ["Sale at price 190.00", "Sale at price 190.00", "Stock Gift"],
+        "Position": ["Chief Executive Officer, Director", "Officer", "Director"],
+        "Start Date": ["2024-05-01", "2024-05-02", "2024-05-03"],
+    })
+    raw = "# Insider Transactions data for AAPL\n\n" + insider.to_csv()
+    encoded = OutputEncoder({"default_token_budget": 0}).encode("get_insider_transactions", raw)
+    lines = encoded.splitlines()
+    assert ",Shares,Value,Text,Position,Start Date" in lines
+    assert "0,50000,9.5M,Sale at price 190.00,Chief Executive Officer; Director,2024-05-01" in lines
@@ -0,0 +1,120 @@
+"""Test incremental refreshes of the per-symbol price store"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.price_store import PriceStore, normalize_prices
+
+
+def _prices(sessions: pd.DatetimeIndex, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, len(sessions)))
+    return pd.DataFrame(
+        {
+            "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+            "Volume": rng.integers(1e6, 9e6, len(sessions)).astype(float),
+        },
+        index=pd.DatetimeIndex(sessions, name="Date"),
+    )
+
+
+SESSIONS = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=300, name="Date")
+PRICES = _prices(SESSIONS)
+
+
+class ReplayDownloader:
+    """``yf.download`` stand-in serving ``prices`` and recording each requested start date"""
+
+    def __init__(self, prices: pd.DataFrame):
+        self.prices = prices
+        self.starts = []
+
+    def __call__(self, symbol, start=None, end=None, **kwargs):
+        self.starts.append(pd.Timestamp(start))
+        index = self.prices.index
+        return self.prices[(index >= pd.Timestamp(start)) & (index < pd.Timestamp(end))]
+
+
+def _split(prices: pd.DataFrame, ratio: float = 4.0) -> pd.DataFrame:
+    """The same history after a split: auto-adjusted prices are all rebased"""
+    rebased = prices.copy()
+    rebased[["Open", "High", "Low", "Close"]] /= ratio
+    rebased["Volume"] *= ratio
+    return rebased
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store holding every session but the last five, refreshed on every load"""
+    store = PriceStore(str(tmp_path), overlap_days=7, refresh_interval_hours=0)
+    assert store.watermark("AAPL") is None and store.needs_refresh("AAPL")
+    assert store.ingest("AAPL", normalize_prices(PRICES.iloc[:-5]), full_history=True)
+    return store
+
+
+def test_watermark_tracks_the_stored_range(store):
+    watermark = store.watermark("aapl")
+    assert watermark["first_session"] == SESSIONS[0].strftime("%Y-%m-%d")
+    assert watermark["last_session"] == SESSIONS[-6].strftime("%Y-%m-%d")
+    assert watermark["rows"] == len(SESSIONS) - 5
+    # A refresh starts overlap_days before the watermark
+    assert store.refresh_start(SESSIONS[-6]) == SESSIONS[-6] - pd.Timedelta(days=7)
+
+
+def test_overlapping_delta_appends_only_new_sessions(store):
+    before = store.watermark("AAPL")
+    delta = PRICES[PRICES.index >= store.refresh_start(SESSIONS[-6])].copy()
+    # The last stored bar was an intraday snapshot: its settled close may differ
+    delta.loc[SESSIONS[-6], "Close"] += 0.5
+
+    assert store.ingest("AAPL", normalize_prices(delta))
+    assert store.rows_appended == 5
+    frame = store.load("AAPL", refresh=False)
+    assert len(frame) == len(SESSIONS) and frame.index.is_unique and frame.index.is_monotonic_increasing
+    assert frame.loc[SESSIONS[-6], "Close"] == delta.loc[SESSIONS[-6], "Close"]
+    pd.testing.assert_frame_equal(frame.iloc[:-6], normalize_prices(PRICES.iloc[:-6]), check_freq=False)
+    assert store.watermark("AAPL")["last_session"] == SESSIONS[-1].strftime("%Y-%m-%d")
+    assert store.watermark("AAPL")["updated_at"] > before["updated_at"]
+
+    # An empty delta (no new sessions yet) keeps the stored history
+    assert store.ingest("AAPL", normalize_prices(None))
+    assert len(store.load("AAPL", refresh=False)) == len(SESSIONS)
+
+
+def test_rebased_delta_is_rejected(store):
+    before = store.watermark("AAPL")
+    delta = _split(PRICES[PRICES.index >= store.refresh_start(SESSIONS[-6])])
+
+    assert not store.ingest("AAPL", normalize_prices(delta))
+    assert store.watermark("AAPL") == before
+    assert len(store.load("AAPL", refresh=False)) == len(SESSIONS) - 5
+    # Without stored history there is nothing to merge into either
+    assert not store.ingest("MSFT", normalize_prices(delta))
+
+
+def test_refresh_downloads_the_delta_then_the_full_history_after_a_split(store):
+    store.download = ReplayDownloader(PRICES)
+    frame = store.load("AAPL")
+    assert store.download.starts == [store.refresh_start(SESSIONS[-6])]
+    assert store.incremental_downloads == 1 and store.full_downloads == 1  # The seeding ingest
+    assert len(frame) == len(SESSIONS)
+
+    store.download = ReplayDownloader(_split(PRICES))
+    frame = store.load("AAPL")
+    # The overlap showed rebased prices, so the symbol was re-downloaded in full
+    assert store.download.starts == [store.refresh_start(SESSIONS[-1]), store.full_history_start()]
+    assert store.full_downloads == 2
+    pd.testing.assert_frame_equal(frame, normalize_prices(_split(PRICES)))
+
+
+def test_fresh_watermark_skips_the_download(tmp_path):
+    download = ReplayDownloader(PRICES)
+    store = PriceStore(str(tmp_path), refresh_interval_hours=12, download=download)
+    first = store.load("AAPL")
+    assert len(download.starts) == 1 and not store.needs_refresh("AAPL")
+    pd.testing.assert_frame_equal(store.load("AAPL"), first, check_freq=False)
+    assert len(download.starts) == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,129 @@
+"""Test the date-partitioned Reddit index against a reference per-day file scan"""
+import json
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from tradingagents.dataflows import local
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.reddit_index import get_reddit_index
+from tradingagents.dataflows.company_matcher import get_company_matcher
+from tradingagents.dataflows.reddit_utils import fetch_company_news_by_ticker, fetch_top_from_category, fetch_top_from_category_range
+
+WORDS = ["Apple", "earnings", "apple pie", "Snap Inc", "SnapXInc", "AAPL", "market", "Tesla", "rates", "NVDA"]
+
+
+def _write_subreddit(path, seed, posts=600):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 3, 1).timestamp()
+    with open(path, "w") as f:
+        for i in range(posts):
+            post = {
+                "created_utc": start + float(rng.integers(0, 20 * 86400)),
+                "title": " ".join(rng.choice(WORDS, 3)),
+                "selftext": "" if rng.random() < 0.3 else " ".join(rng.choice(WORDS, 5)),
+                "url": f"https://reddit.com/{seed}/{i}",
+                "ups": int(rng.integers(0, 8)),  # Many ties
+            }
+            f.write(json.dumps(post) + "\n")
+            if i % 97 == 0:
+                f.write("\n")
+
+
+def _reference_scan(category, date, max_limit, query=None, data_path="reddit_data"):
+    """Reference fetch_top_from_category: full scan of every file for one day, with whole-word company matching"""
+    all_content = []
+    jsonl_files = [f for f in os.listdir(os.path.join(data_path, category)) if f.endswith(".jsonl")]
+    limit_per_subreddit = max_limit // len(jsonl_files)
+    for data_file in jsonl_files:
+        current = []
+        with open(os.path.join(data_path, category, data_file), "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                parsed_line = json.loads(line)
+                post_date = datetime.utcfromtimestamp(parsed_line["created_utc"]).strftime("%Y-%m-%d")
+                if post_date != date:
+                    continue
+                if "company" in category and query:
+                    # Whole-word company matching (see test_company_matcher.py for the rules)
+                    matcher = get_company_matcher().for_ticker(query)
+                    if not (matcher.mentions(parsed_line["title"]) or matcher.mentions(parsed_line["selftext"])):
+                        continue
+                current.append({"title": parsed_line["title"], "content": parsed_line["selftext"],
+                                "url": parsed_line["url"], "upvotes": parsed_line["ups"], "posted_date": post_date})
+        current.sort(key=lambda x: x["upvotes"], reverse=True)
+        all_content.extend(current[:limit_per_subreddit])
+    return all_content
+
+
+@pytest.fixture
+def reddit_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    for category, count in (("global_news", 3), ("company_news", 2)):
+        (data_dir / "reddit_data" / category).mkdir(parents=True)
+        for n in range(count):
+            _write_subreddit(data_dir / "reddit_data" / category / f"sub{n}.jsonl", seed=n + 10 * count)
+    monkeypatch.setattr(local, "DATA_DIR", str(data_dir))
+    monkeypatch.setenv("DISABLE_LOCAL_SOURCES", "false")
+    previous = get_config()["data_cache_dir"]
+    set_config({"data_cache_dir": str(tmp_path / "cache")})
+    yield str(data_dir / "reddit_data")
+    set_config({"data_cache_dir": previous})
+
+
+def _days(start, end):
+    day = datetime.strptime(start, "%Y-%m-%d")
+    while day <= datetime.strptime(end, "%Y-%m-%d"):
+        yield day.strftime("%Y-%m-%d")
+        day += timedelta(days=1)
+
+
+@pytest.mark.parametrize("query", [None, "AAPL", "SNAP", "TSLA"])
+def test_single_day_matches_reference_scan(reddit_dir, query):
+    category = "company_news" if query else "global_news"
+    for date in ("2024-02-29", "2024-03-01", "2024-03-07", "2024-03-20", "2024-03-21"):
+        assert fetch_top_from_category(category, date, 10, query, data_path=reddit_dir) == \
+            _reference_scan(category, date, 10, query, data_path=reddit_dir)
+
+
+def test_company_news_window_matches_reference_scan(reddit_dir):
+    report = local.get_reddit_company_news("AAPL", "2024-03-02", "2024-03-12")
+    posts = [p for d in _days("2024-03-02", "2024-03-12") for p in _reference_scan("company_news", d, 10, "AAPL", reddit_dir)]
+    assert report.count("### ") == len(posts) > 0
+    assert report.index(posts[0]["title"]) < report.index(posts[-1]["title"])
+
+
+def test_global_news_window_builds_index_once(reddit_dir):
+    index = get_reddit_index()
+    builds = index.builds
+    first = local.get_reddit_global_news("2024-03-15", 7, 6)
+    second = local.get_reddit_global_news("2024-03-16", 7, 6)
+    assert first and second
+    assert index.builds == builds + 3  # One table per subreddit file, reused by the second call
+
+
+def test_rebuilds_when_file_changes(reddit_dir):
+    path = os.path.join(reddit_dir, "global_news", "sub0.jsonl")
+    fetch_top_from_category("global_news", "2024-03-05", 9, data_path=reddit_dir)
+    _write_subreddit(path, seed=99)
+    os.utime(path, (0, 0))
+    assert fetch_top_from_category("global_news", "2024-03-05", 9, data_path=reddit_dir) == \
+        _reference_scan("global_news", "2024-03-05", 9, data_path=reddit_dir)
+
+
+def test_limit_below_file_count_raises(reddit_dir):
+    with pytest.raises(ValueError):
+        fetch_top_from_category("global_news", "2024-03-05", 2, data_path=reddit_dir)
+
+
+def test_company_news_by_ticker_matches_single_ticker_queries(reddit_dir):
+    by_ticker = fetch_company_news_by_ticker("2024-03-02", "2024-03-12", ["AAPL", "SNAP", "TSLA", "NVDA"],
+                                             data_path=reddit_dir)
+    assert set(by_ticker) == {"AAPL", "SNAP", "TSLA", "NVDA"}
+    assert all("Snap Inc" in p["title"] + p["content"] for p in by_ticker["SNAP"])  # Not "SnapXInc"
+    for ticker in ("AAPL", "SNAP", "TSLA", "NVDA"):
+        assert by_ticker.get(ticker, []) == fetch_top_from_category_range(
+            "company_news", "2024-03-02", "2024-03-12", 10, ticker, data_path=reddit_dir)
@@ -0,0 +1,96 @@
+"""Test the indexed SimFin store against the previous full-CSV scan"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import local
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.simfin_store import get_simfin_store, simfin_source_path
+
+TICKERS = ["AAPL", "MSFT", "BRK.A", "ZZZ"]
+
+
+def _write_statements(data_dir: str, statement: str, freq: str, seed: int) -> str:
+    """Synthetic SimFin-style CSV (semicolon separated, one row per ticker and report)"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for simfin_id, ticker in enumerate(TICKERS):
+        for report in pd.date_range("2019-03-31", periods=16, freq="QE"):
+            publish = report + pd.Timedelta(days=int(rng.integers(20, 60)))
+            rows.append({
+                "Ticker": ticker,
+                "SimFinId": simfin_id,
+                "Currency": "USD",
+                "Fiscal Year": report.year,
+                "Fiscal Period": f"Q{report.quarter}",
+                "Report Date": report.strftime("%Y-%m-%d"),
+                "Publish Date": publish.strftime("%Y-%m-%d"),
+                "Shares (Basic)": float(rng.integers(1e8, 1e9)),
+                "Revenue": rng.normal(1e10, 1e9),
+                "Net Income": rng.normal(1e9, 5e8) if rng.random() > 0.2 else np.nan,
+            })
+    # A restatement published on the same day as the original report
+    rows.append({**rows[5], "Revenue": 1.0})
+    path = simfin_source_path(data_dir, statement, freq)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(rng.permutation(rows).tolist()).to_csv(path, sep=";", index=False)
+    return path
+
+
+def _legacy_latest(path: str, ticker: str, curr_date: str):
+    """Previous lookup: parse the whole CSV and filter on every call"""
+    df = pd.read_csv(path, sep=";")
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    if filtered_df.empty:
+        return None
+    return filtered_df.loc[filtered_df["Publish Date"].idxmax()]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    previous = get_config()
+    set_config({"data_dir": str(tmp_path / "data"), "data_cache_dir": str(tmp_path / "cache")})
+    yield str(tmp_path / "data")
+    set_config({"data_dir": previous["data_dir"], "data_cache_dir": previous["data_cache_dir"]})
+
+
+@pytest.mark.parametrize("curr_date", ["2019-01-01", "2019-05-20", "2020-06-30", "2022-12-31", "2030-01-01"])
+def test_as_of_lookup_matches_full_scan(data_dir, curr_date):
+    path = _write_statements(data_dir, "balance_sheet", "quarterly", seed=1)
+    store = get_simfin_store()
+    for ticker in TICKERS + ["NONE"]:
+        got = store.latest("balance_sheet", "quarterly", ticker, curr_date)
+        want = _legacy_latest(path, ticker, curr_date)
+        if want is None:
+            assert got is None
+        else:
+            pd.testing.assert_series_equal(got, want)
+
+
+def test_report_text_unchanged(data_dir):
+    path = _write_statements(data_dir, "income_statements", "annual", seed=2)
+    for ticker in ("AAPL", "BRK.A"):
+        latest = _legacy_latest(path, ticker, "2021-08-01").drop("SimFinId")
+        report = local.get_simfin_income_statements(ticker, "annual", "2021-08-01")
+        assert report.startswith(f"## annual income statement for {ticker} released on ")
+        assert str(latest) in report
+    assert local.get_simfin_income_statements("AAPL", "annual", "2018-01-01") == ""
+
+
+def test_reingests_when_source_changes(data_dir):
+    path = _write_statements(data_dir, "cash_flow", "annual", seed=3)
+    store = get_simfin_store()
+    store.latest("cash_flow", "annual", "AAPL", "2021-01-01")
+    store.latest("cash_flow", "annual", "MSFT", "2021-01-01")
+    assert store.ingests == 1
+
+    _write_statements(data_dir, "cash_flow", "annual", seed=4)
+    os.utime(path, (0, 0))
+    got = store.latest("cash_flow", "annual", "AAPL", "2021-01-01")
+    assert store.ingests == 2
+    pd.testing.assert_series_equal(got, _legacy_latest(path, "AAPL", "2021-01-01"))
@@ -0,0 +1,117 @@
+"""Test batched universe loading against an offline price fixture"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.price_store import FixtureDownloader, PriceStore
+from tradingagents.dataflows.universe import UniverseLoader, record_universe_fixture
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSM", "AMZN"]
+
+
+def _write_fixture(path, end: pd.Timestamp):
+    """Recorded long-format fixture with ~3 years of sessions per symbol"""
+    sessions = pd.bdate_range(end=end, periods=750, name="Date")
+    rng = np.random.default_rng(3)
+    rows = []
+    for symbol in SYMBOLS:
+        close = 100 + np.cumsum(rng.normal(0, 1, len(sessions)))
+        rows.append(pd.DataFrame({
+            "Date": sessions, "Ticker": symbol,
+            "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+            "Volume": rng.integers(1e6, 9e6, len(sessions)).astype(float),
+        }))
+    pd.concat(rows).to_csv(path, index=False)
+    return sessions
+
+
+class FlakyDownloader:
+    """Fixture downloader that drops some symbols from the first request they appear in"""
+
+    def __init__(self, fixture, flaky):
+        self.fixture = fixture
+        self.flaky = set(flaky)
+        self.requests = []
+
+    def __call__(self, tickers, **kwargs):
+        self.requests.append(list(tickers))
+        served = [t for t in tickers if t not in self.flaky]
+        self.flaky -= set(tickers)
+        return self.fixture(served, **kwargs)
+
+
+@pytest.fixture
+def fixture_path(tmp_path):
+    path = str(tmp_path / "prices.csv")
+    _write_fixture(path, pd.Timestamp.today().normalize() - pd.Timedelta(days=1))
+    return path
+
+
+def test_batched_download_retries_only_failed_symbols(tmp_path, fixture_path):
+    download = FlakyDownloader(FixtureDownloader(fixture_path), flaky=["NVDA"])
+    store = PriceStore(str(tmp_path / "store"), history_years=15)
+    loader = UniverseLoader(store, batch_size=2, max_retries=2, retry_backoff_seconds=0, download=download)
+
+    frames = loader.load(SYMBOLS + ["ZZZZ"], start="2020-01-01")
+
+    assert sorted(frames) == sorted(SYMBOLS)
+    assert loader.last_report["failed"] == ["ZZZZ"]
+    # 3 batches of 2, then retries contain only the symbols still missing
+    assert download.requests[:3] == [["AAPL", "MSFT"], ["NVDA", "TSM"], ["AMZN", "ZZZZ"]]
+    assert download.requests[3:] == [["NVDA", "ZZZZ"], ["ZZZZ"]]
+    assert all(len(frame) == 750 for frame in frames.values())
+    assert frames["AAPL"].index.is_monotonic_increasing
+
+
+def test_fresh_symbols_are_not_downloaded_again(tmp_path, fixture_path):
+    download = FixtureDownloader(fixture_path)
+    store = PriceStore(str(tmp_path / "store"))
+    loader = UniverseLoader(store, batch_size=50, download=download)
+
+    loader.load(SYMBOLS)
+    assert download.calls == 1
+    loader.load(SYMBOLS)
+    assert download.calls == 1
+    assert loader.last_report["fresh"] == len(SYMBOLS)
+
+
+def test_stale_symbols_get_one_incremental_batch(tmp_path, fixture_path):
+    download = FixtureDownloader(fixture_path)
+    store = PriceStore(str(tmp_path / "store"), refresh_interval_hours=0)
+    loader = UniverseLoader(store, batch_size=50, download=download)
+
+    first = loader.load(SYMBOLS)
+    second = loader.load(SYMBOLS)
+    assert download.calls == 2
+    assert loader.last_report["incremental"] == len(SYMBOLS)
+    for symbol in SYMBOLS:
+        pd.testing.assert_frame_equal(first[symbol], second[symbol])
+
+
+def test_store_reads_fixture_offline(tmp_path, fixture_path):
+    previous = dict(get_config()["price_store"])
+    set_config({"price_store": {**previous, "fixture_path": fixture_path, "path": str(tmp_path / "store")}})
+    try:
+        from tradingagents.dataflows.universe import load_universe
+        from tradingagents.dataflows.price_store import get_price_store
+
+        frames = load_universe(["msft"], start="2024-01-01")
+        assert list(frames) == ["MSFT"]
+        assert get_price_store().load("MSFT").index[-1] == frames["MSFT"].index[-1]
+    finally:
+        set_config({"price_store": previous})
+
+
+def test_record_fixture_round_trip(tmp_path, fixture_path):
+    recorded = str(tmp_path / "recorded.parquet")
+    rows = record_universe_fixture(["AAPL", "TSM"], "2020-01-01", "2100-01-01", recorded,
+                                   download=FixtureDownloader(fixture_path))
+    assert rows == 2 * 750
+    replay = FixtureDownloader(recorded)("AAPL", multi_level_index=False)
+    assert list(replay.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert len(replay) == 750
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,56 @@
+"""Test the TTLs the persistent vendor cache assigns to routed calls"""
+from datetime import datetime
+
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.vendor_cache import LIVE_WINDOW_TTL_SECONDS, VendorCache, get_vendor_cache
+
+
+def test_live_window_ttl_sees_keyword_dates(tmp_path):
+    cache = VendorCache(str(tmp_path / "vendor_cache.sqlite"))
+    today = datetime.now().strftime("%Y-%m-%d")
+    assert cache.ttl_for("get_stock_data", ("AAPL", "2024-01-02", "2024-05-10")) is None
+    assert cache.ttl_for("get_stock_data", ("AAPL", "2024-01-02", today)) == LIVE_WINDOW_TTL_SECONDS
+    assert cache.ttl_for(
+        "get_stock_data", ("AAPL",), {"start_date": "2024-01-02", "end_date": today}
+    ) == LIVE_WINDOW_TTL_SECONDS
+    assert cache.ttl_for("get_indicators", ("AAPL", "rsi"), {"curr_date": today}) == LIVE_WINDOW_TTL_SECONDS
+
+
+@pytest.fixture
+def cache_config(tmp_path):
+    config = get_config()
+    previous = {key: config.get(key) for key in ("vendor_cache", "tool_vendors", "output_encoding", "macro_cache")}
+    set_config({"vendor_cache": {"enabled": True, "path": str(tmp_path / "vendor_cache.sqlite")}})
+    yield
+    set_config(previous)
+    interface.invalidate_routing_table()
+
+
+def test_new_limits_and_ttls_apply_to_the_open_cache(cache_config):
+    cache = get_vendor_cache()
+    for i in range(4):
+        cache.put("get_news", f"key{i}", "finnhub", "x" * 1000, 600)
+    set_config({"vendor_cache": {"enabled": True, "path": cache.path, "max_bytes": 2500,
+                                 "ttl_seconds": {"get_news": 60}}})
+    assert get_vendor_cache() is cache
+    assert cache.max_bytes == 2500 and cache.ttl_for("get_news") == 60
+    assert cache.stats()["bytes"] <= 2500 and cache.stats()["entries"] == 2
+
+
+def test_bypass_env_is_read_at_lookup_time(cache_config, monkeypatch):
+    calls = []
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_global_news", {"stub": lambda *a: calls.append(a) or "news"})
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, "get_global_news", {})
+    monkeypatch.setenv("DISABLE_LOCAL_SOURCES", "true")
+    set_config({"tool_vendors": {"get_global_news": "stub"}, "output_encoding": {"enabled": False},
+                "macro_cache": {"enabled": False}})
+    interface.invalidate_routing_table()
+    interface.route_to_vendor("get_global_news", "2024-05-10", 7, 5)
+    interface.route_to_vendor("get_global_news", "2024-05-10", 7, 5)
+    assert len(calls) == 1
+    monkeypatch.setenv("TRADINGAGENTS_CACHE_BYPASS", "true")  # No config change: the routing table stays compiled
+    interface.route_to_vendor("get_global_news", "2024-05-10", 7, 5)
+    assert len(calls) == 2
@@ -0,0 +1,152 @@
+"""Test the vendor circuit breakers and their use by the router"""
+import time
+
+import pytest
+
+from tradingagents.dataflows import interface, vendor_health
+from tradingagents.dataflows.alpha_vantage_common import AlphaVantageRateLimitError
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.deadline import DeadlineExceeded
+from tradingagents.dataflows.vendor_health import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    VendorHealthTracker,
+    cooldown_for_error,
+    get_vendor_health,
+)
+from tradingagents.dataflows.vendor_rate_limit import get_vendor_rate_limiter
+
+METHOD = "get_global_news"
+
+
+def _expire_cooldown(tracker, vendor, method=METHOD):
+    circuit = tracker._circuits[(vendor, method)]
+    circuit.opened_at -= circuit.cooldown + 1
+    return circuit
+
+
+def test_cooldown_depends_on_the_error_type():
+    assert cooldown_for_error(AlphaVantageRateLimitError("5 calls per minute")) == (60.0, True)
+    assert cooldown_for_error(AlphaVantageRateLimitError("25 requests per day")) == (3600.0, True)
+    assert cooldown_for_error(ValueError("Invalid API key")) == (3600.0, True)
+    assert cooldown_for_error(TimeoutError("read timed out")) == (30.0, False)
+    assert cooldown_for_error(RuntimeError("boom")) == (15.0, False)
+
+
+def test_transient_failures_open_after_the_threshold_and_a_probe_closes():
+    tracker = VendorHealthTracker(failure_threshold=3)
+    for _ in range(2):
+        tracker.record_failure("finnhub", METHOD, RuntimeError("boom"))
+    assert tracker._circuits[("finnhub", METHOD)].state == CLOSED and tracker.allow("finnhub", METHOD)
+    tracker.record_failure("finnhub", METHOD, RuntimeError("boom"))
+    assert tracker._circuits[("finnhub", METHOD)].state == OPEN and not tracker.allow("finnhub", METHOD)
+
+    circuit = _expire_cooldown(tracker, "finnhub")
+    assert tracker.allow("finnhub", METHOD) and circuit.state == HALF_OPEN
+    assert not tracker.allow("finnhub", METHOD)  # One probe at a time
+    tracker.record_success("finnhub", METHOD, 0.2)
+    assert circuit.state == CLOSED and tracker.allow("finnhub", METHOD)
+
+
+def test_failed_probe_doubles_the_cooldown():
+    tracker = VendorHealthTracker()
+    tracker.record_failure("finnhub", METHOD, TimeoutError("timed out"))
+    tracker.record_failure("finnhub", METHOD, TimeoutError("timed out"))
+    tracker.record_failure("finnhub", METHOD, TimeoutError("timed out"))
+    circuit = _expire_cooldown(tracker, "finnhub")
+    assert circuit.cooldown == 30.0 and tracker.allow("finnhub", METHOD)
+    tracker.record_failure("finnhub", METHOD, TimeoutError("timed out"))
+    assert circuit.state == OPEN and circuit.cooldown == 60.0
+
+
+def test_rate_limit_blocks_every_method_of_the_vendor():
+    tracker = VendorHealthTracker()
+    tracker.record_failure("alpha_vantage", METHOD, AlphaVantageRateLimitError("rate limit"))
+    assert tracker._circuits[("alpha_vantage", METHOD)].state == OPEN
+    assert not tracker.allow("alpha_vantage", "get_fundamentals")
+    assert tracker.scoreboard()[0]["state"] == OPEN
+
+
+def test_lost_probe_lease_expires_and_released_probes_are_reusable(monkeypatch):
+    tracker = VendorHealthTracker()
+    tracker.record_failure("finnhub", METHOD, ValueError("missing API key"))
+    circuit = _expire_cooldown(tracker, "finnhub")
+    assert tracker.allow("finnhub", METHOD) and not tracker.allow("finnhub", METHOD)
+    tracker.release_probe("finnhub", METHOD)
+    assert tracker.allow("finnhub", METHOD)
+    # The probe's outcome is never recorded: the next caller gets it once the lease runs out
+    circuit.probe_started_at -= vendor_health.PROBE_LEASE_SECONDS + 1
+    assert tracker.allow("finnhub", METHOD) and circuit.state == HALF_OPEN
+
+
+@pytest.fixture
+def limited_route(monkeypatch):
+    """METHOD served by the primaries "limited" (daily quota of one request) and "ok"."""
+    calls = []
+
+    def make(name):
+        def impl(*args):
+            calls.append(name)
+            return f"{name} result"
+        return impl
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, METHOD, {"limited": make("limited"), "ok": make("ok")})
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, METHOD, {})
+    monkeypatch.setenv("DISABLE_LOCAL_SOURCES", "true")
+    config = get_config()
+    previous = {key: config.get(key) for key in (
+        "tool_vendors", "vendor_cache", "vendor_single_flight", "vendor_rate_limits", "vendor_concurrency",
+        "output_encoding", "macro_cache", "vendor_deadlines",
+    )}
+    set_config({
+        "tool_vendors": {METHOD: "limited,ok"},
+        "vendor_cache": {"enabled": False},
+        "vendor_single_flight": False,
+        "vendor_rate_limits": {"enabled": True, "max_wait_seconds": 0, "vendors": {"limited": {"per_day": 1}}},
+        "vendor_concurrency": {"parallel_primaries": False, "hedge": False},
+        "output_encoding": {"enabled": False},
+        "macro_cache": {"enabled": False},
+    })
+    interface.invalidate_routing_table()
+    health = get_vendor_health()
+    health.reset()
+    yield calls
+    set_config(previous)
+    interface.invalidate_routing_table()
+    health.reset()
+
+
+def test_probe_refused_by_the_quota_is_released(limited_route):
+    health = get_vendor_health()
+    health.record_failure("limited", METHOD, RuntimeError("boom"))
+    health.record_failure("limited", METHOD, RuntimeError("boom"))
+    health.record_failure("limited", METHOD, RuntimeError("boom"))
+    circuit = _expire_cooldown(health, "limited")
+    assert get_vendor_rate_limiter().acquire("limited", 0)  # Spend the day's only request
+
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "ok result"
+    assert limited_route == ["ok"]
+    assert circuit.state == HALF_OPEN and not circuit.probe_in_flight
+    assert health.allow("limited", METHOD)
+
+
+def test_expired_call_does_not_take_a_fallback_probe(limited_route, monkeypatch):
+    def slow(*args):
+        time.sleep(0.3)
+        raise RuntimeError("too slow")
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, METHOD, {"slow": slow, "ok": lambda *args: "ok result"})
+    set_config({
+        "tool_vendors": {METHOD: "slow"},
+        "vendor_rate_limits": {"enabled": False},
+        "vendor_deadlines": {"vendor_budget_seconds": None, "method_budgets": {METHOD: 0.2}},
+    })
+    interface.invalidate_routing_table()
+    health = get_vendor_health()
+    health.record_failure("ok", METHOD, ValueError("missing API key"))
+    circuit = _expire_cooldown(health, "ok")
+
+    with pytest.raises(DeadlineExceeded):
+        interface.route_to_vendor(METHOD, "2024-05-10", 7, 5)
+    assert not circuit.probe_in_flight and health.allow("ok", METHOD)
@@ -0,0 +1,205 @@
+"""Test the vendor router: compiled routing table, concurrent primaries, hedged requests and the async path"""
+import asyncio
+import time
+
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.vendor_health import get_vendor_health
+
+METHOD = "get_global_news"
+
+
+class StubVendor:
+    """Vendor implementation answering after ``delay`` seconds, recording when it started"""
+
+    def __init__(self, name: str, delay: float = 0.0):
+        self.name = self.__name__ = name
+        self.delay = delay
+        self.started = []
+
+    def __call__(self, *args):
+        self.started.append(time.monotonic())
+        time.sleep(self.delay)
+        return f"{self.name} result"
+
+
+class AsyncStubVendor(StubVendor):
+    """Native async client counterpart of StubVendor"""
+
+    async def __call__(self, *args):
+        self.started.append(time.monotonic())
+        await asyncio.sleep(self.delay)
+        return f"{self.name} result"
+
+
+@pytest.fixture
+def route(monkeypatch):
+    """Install stub vendors for METHOD: route(vendors, "a,b", hedge=True, ...) with caches disabled"""
+    monkeypatch.setenv("DISABLE_LOCAL_SOURCES", "true")
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, METHOD, {})
+    config = get_config()
+    previous = {key: config.get(key) for key in (
+        "tool_vendors", "vendor_cache", "vendor_single_flight", "vendor_rate_limits", "vendor_concurrency",
+        "output_encoding", "macro_cache",
+    )}
+
+    def configure(vendors, tool_vendors, **concurrency):
+        monkeypatch.setitem(interface.VENDOR_METHODS, METHOD, {vendor.name: vendor for vendor in vendors})
+        set_config({
+            "tool_vendors": {METHOD: tool_vendors},
+            "vendor_cache": {"enabled": False},
+            "vendor_single_flight": False,
+            "vendor_rate_limits": {"enabled": False},
+            "vendor_concurrency": {**previous["vendor_concurrency"], **concurrency},
+            "output_encoding": {"enabled": False},
+            "macro_cache": {"enabled": False},
+        })
+        interface.invalidate_routing_table()
+
+    get_vendor_health().reset()
+    yield configure
+    set_config(previous)
+    interface.invalidate_routing_table()
+    get_vendor_health().reset()
+
+
+def test_routing_table_is_compiled_once_per_config_version(route):
+    a, b = StubVendor("a"), StubVendor("b")
+    route([a, b], "a")
+    plan = interface.get_routing_plan(METHOD)
+    assert plan.primary_vendors == ("a",) and plan.vendor_order == ("a", "b")
+    assert interface.get_routing_plan(METHOD) is plan  # No recompilation without a config change
+
+    # set_config() bumps the config version: the next lookup recompiles, no explicit invalidation
+    set_config({"tool_vendors": {METHOD: "b,a"}, "vendor_concurrency": {"parallel_primaries": False}})
+    plan = interface.get_routing_plan(METHOD)
+    assert plan.primary_vendors == ("b", "a") and plan.resolved_vendor == "b,a"
+    assert interface._routing_settings["concurrency"] == {"parallel_primaries": False}
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "b result\na result"
+
+
+def test_unknown_method_is_rejected(route):
+    with pytest.raises(ValueError, match="not supported"):
+        interface.get_routing_plan("get_unknown_data")
+
+
+def test_primaries_are_called_in_parallel_and_merged_in_configured_order(route):
+    slow, fast = StubVendor("slow", 0.3), StubVendor("fast", 0.05)
+    fallback = StubVendor("fallback")
+    route([slow, fast, fallback], "slow,fast", parallel_primaries=True)
+
+    start = time.monotonic()
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "slow result\nfast result"
+    assert time.monotonic() - start < 0.3 + 0.2  # Not 0.35s of sequential calls plus overhead
+    assert abs(slow.started[0] - fast.started[0]) < 0.1
+    assert not fallback.started
+
+
+def test_sequential_primaries_when_fan_out_is_disabled(route):
+    slow, fast = StubVendor("slow", 0.2), StubVendor("fast", 0.2)
+    route([slow, fast], "slow,fast", parallel_primaries=False)
+
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "slow result\nfast result"
+    assert fast.started[0] - slow.started[0] >= 0.2
+
+
+def test_failed_primary_is_dropped_from_the_merge(route):
+    def broken(*args):
+        raise RuntimeError("boom")
+
+    broken.name = "broken"
+    ok = StubVendor("ok")
+    route([broken, ok], "broken,ok", parallel_primaries=True)
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "ok result"
+
+
+def test_hedge_starts_after_the_delay_and_the_faster_vendor_wins(route):
+    primary, hedge = StubVendor("primary", 0.6), StubVendor("hedge", 0.0)
+    route([primary, hedge], "primary", hedge=True, hedge_min_delay_seconds=0.15)
+
+    start = time.monotonic()
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "hedge result"
+    assert 0.15 <= hedge.started[0] - start < 0.4
+    assert time.monotonic() - start < 0.5  # Did not wait for the primary
+
+
+def test_no_hedge_when_the_primary_answers_in_time(route):
+    primary, hedge = StubVendor("primary", 0.05), StubVendor("hedge", 0.0)
+    route([primary, hedge], "primary", hedge=True, hedge_min_delay_seconds=0.3)
+
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "primary result"
+    assert not hedge.started
+
+
+def test_hedge_delay_follows_the_primary_latency_percentile(route):
+    primary, hedge = StubVendor("primary", 0.25), StubVendor("hedge", 0.0)
+    route([primary, hedge], "primary", hedge=True, hedge_min_delay_seconds=0.05, hedge_percentile=0.9)
+    for _ in range(10):  # The primary usually takes 0.4s, so 0.25s is not slow yet
+        get_vendor_health().record_success("primary", METHOD, 0.4)
+
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "primary result"
+    assert not hedge.started
+
+
+def test_hedge_skips_a_fallback_with_an_open_circuit(route):
+    primary, hedge = StubVendor("primary", 0.3), StubVendor("hedge", 0.0)
+    route([primary, hedge], "primary", hedge=True, hedge_min_delay_seconds=0.05)
+    get_vendor_health().record_failure("hedge", METHOD, ValueError("missing API key"))
+
+    assert interface.route_to_vendor(METHOD, "2024-05-10", 7, 5) == "primary result"
+    assert not hedge.started
+
+
+def test_async_route_runs_blocking_vendors_on_the_pool(route):
+    a, b = StubVendor("a", 0.2), StubVendor("b", 0.2)
+    route([a, b], "a,b", parallel_primaries=True)
+
+    start = time.monotonic()
+    assert asyncio.run(interface.aroute_to_vendor(METHOD, "2024-05-10", 7, 5)) == "a result\nb result"
+    assert time.monotonic() - start < 0.35
+    assert asyncio.run(interface.aroute_to_vendor(METHOD, "2024-05-10", 7, 5)) == \
+        interface.route_to_vendor(METHOD, "2024-05-10", 7, 5)
+
+
+def test_async_route_awaits_native_clients(route, monkeypatch):
+    blocking = [StubVendor("a"), StubVendor("b")]
+    native = {"a": AsyncStubVendor("a", 0.2), "b": AsyncStubVendor("b", 0.05)}
+    route(blocking, "a,b", parallel_primaries=True)
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, METHOD, native)
+
+    start = time.monotonic()
+    assert asyncio.run(interface.aroute_to_vendor(METHOD, "2024-05-10", 7, 5)) == "a result\nb result"
+    assert time.monotonic() - start < 0.35
+    assert len(native["a"].started) == len(native["b"].started) == 1
+    assert not any(vendor.started for vendor in blocking)
+
+
+def test_async_primary_past_the_call_deadline_is_dropped(route, monkeypatch):
+    route([StubVendor("slow"), StubVendor("fast")], "slow,fast", parallel_primaries=True, call_deadline_seconds=0.2)
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, METHOD, {
+        "slow": AsyncStubVendor("slow", 2.0), "fast": AsyncStubVendor("fast"),
+    })
+
+    start = time.monotonic()
+    assert asyncio.run(interface.aroute_to_vendor(METHOD, "2024-05-10", 7, 5)) == "fast result"
+    assert time.monotonic() - start < 0.5
+    assert get_vendor_health()._circuits[("slow", METHOD)].consecutive_failures == 1
+
+
+def test_identical_async_calls_share_one_vendor_request(route, monkeypatch):
+    route([StubVendor("a")], "a")
+    native = AsyncStubVendor("a", 0.1)
+    monkeypatch.setitem(interface.ASYNC_VENDOR_METHODS, METHOD, {"a": native})
+    set_config({"vendor_single_flight": True})
+
+    async def main():
+        return await asyncio.gather(*(interface.aroute_to_vendor(METHOD, "2024-05-10", 7, 5) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["a result"] * 5
+    assert len(native.started) == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
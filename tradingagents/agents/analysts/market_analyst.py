@@ -1,7 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators
+from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators, get_indicators_batch
 from tradingagents.dataflows.config import get_config
 
 
@@ -14,6 +14,7 @@ def create_market_analyst(llm):
 
         tools = [
             get_stock_data,
+            get_indicators_batch,
             get_indicators,
         ]
 
@@ -49,8 +50,8 @@ Volume-Based Indicators (1 available):
 1. **ONLY use the 13 indicators listed above** - any other indicator name will fail
 2. Select 10-12 indicators providing diverse coverage across categories
 3. Always call get_stock_data FIRST to retrieve the CSV needed for indicators
-4. Then call get_indicators with the specific indicator names (use exact names from list above)
-5. You can make multiple get_indicators calls if needed (5-7 indicators per call)
+4. Then call get_indicators_batch ONCE with all selected indicator names as a list (use exact names from list above); it returns one date x indicator table
+5. Only use get_indicators (one indicator per call) if you need a different look-back window for a single indicator
 
 **Analysis Approach:**
 - **Trend**: Use moving averages (SMA/EMA combinations)
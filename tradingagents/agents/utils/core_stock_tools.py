@@ -1,6 +1,6 @@
 from langchain_core.tools import tool
 from typing import Annotated
-from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.interface import route_to_vendor, aroute_to_vendor
 
 
 @tool
@@ -20,3 +20,10 @@ def get_stock_data(
         str: A formatted dataframe containing the stock price data for the specified ticker symbol in the specified date range.
     """
     return route_to_vendor("get_stock_data", symbol, start_date, end_date)
+
+
+async def _aget_stock_data(symbol: str, start_date: str, end_date: str) -> str:
+    """Async variant used by get_stock_data.ainvoke (non-blocking vendor clients)."""
+    return await aroute_to_vendor("get_stock_data", symbol, start_date, end_date)
+
+get_stock_data.coroutine = _aget_stock_data
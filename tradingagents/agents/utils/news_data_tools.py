@@ -1,6 +1,6 @@
 from langchain_core.tools import tool
 from typing import Annotated
-from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.interface import route_to_vendor, aroute_to_vendor
 
 @tool
 def get_news(
@@ -20,6 +20,13 @@ def get_news(
     """
     return route_to_vendor("get_news", ticker, start_date, end_date)
 
+
+async def _aget_news(ticker: str, start_date: str, end_date: str) -> str:
+    """Async variant used by get_news.ainvoke (non-blocking vendor clients)."""
+    return await aroute_to_vendor("get_news", ticker, start_date, end_date)
+
+get_news.coroutine = _aget_news
+
 @tool
 def get_global_news(
     curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -38,6 +45,13 @@ def get_global_news(
     """
     return route_to_vendor("get_global_news", curr_date, look_back_days, limit)
 
+
+async def _aget_global_news(curr_date: str, look_back_days: int = 7, limit: int = 5) -> str:
+    """Async variant used by get_global_news.ainvoke (non-blocking vendor clients)."""
+    return await aroute_to_vendor("get_global_news", curr_date, look_back_days, limit)
+
+get_global_news.coroutine = _aget_global_news
+
 @tool
 def get_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
@@ -54,6 +68,13 @@ def get_insider_sentiment(
     """
     return route_to_vendor("get_insider_sentiment", ticker, curr_date)
 
+
+async def _aget_insider_sentiment(ticker: str, curr_date: str) -> str:
+    """Async variant used by get_insider_sentiment.ainvoke (non-blocking vendor clients)."""
+    return await aroute_to_vendor("get_insider_sentiment", ticker, curr_date)
+
+get_insider_sentiment.coroutine = _aget_insider_sentiment
+
 @tool
 def get_insider_transactions(
     ticker: Annotated[str, "ticker symbol"],
@@ -71,6 +92,13 @@ def get_insider_transactions(
     return route_to_vendor("get_insider_transactions", ticker, curr_date)
 
 
+async def _aget_insider_transactions(ticker: str, curr_date: str) -> str:
+    """Async variant used by get_insider_transactions.ainvoke (non-blocking vendor clients)."""
+    return await aroute_to_vendor("get_insider_transactions", ticker, curr_date)
+
+get_insider_transactions.coroutine = _aget_insider_transactions
+
+
 @tool
 def get_economic_calendar(
     start_date: Annotated[str, "Start date in YYYY-MM-DD format"] = None,
@@ -1,6 +1,6 @@
 from langchain_core.tools import tool
-from typing import Annotated
-from tradingagents.dataflows.interface import route_to_vendor
+from typing import Annotated, List
+from tradingagents.dataflows.interface import route_to_vendor, aroute_to_vendor
 
 @tool
 def get_indicators(
@@ -20,4 +20,40 @@ def get_indicators(
     Returns:
         str: A formatted dataframe containing the technical indicators for the specified ticker symbol and indicator.
     """
-    return route_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days)
\ No newline at end of file
+    return route_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days)
+
+
+async def _aget_indicators(symbol: str, indicator: str, curr_date: str, look_back_days: int = 30) -> str:
+    """Async variant used by get_indicators.ainvoke (non-blocking vendor clients)."""
+    return await aroute_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days)
+
+get_indicators.coroutine = _aget_indicators
+
+
+@tool
+def get_indicators_batch(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[List[str], "technical indicator names, e.g. ['close_50_sma', 'macd', 'rsi']"],
+    curr_date: Annotated[str, "The current trading date you are trading on, YYYY-mm-dd"],
+    look_back_days: Annotated[int, "how many days to look back"] = 30,
+) -> str:
+    """
+    Retrieve several technical indicators for a given ticker symbol in one table.
+    Prefer this over repeated get_indicators calls: all indicators are computed from one
+    price history and returned as a single date x indicator table with each description once.
+    Args:
+        symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
+        indicators (List[str]): Technical indicator names to include as columns
+        curr_date (str): The current trading date you are trading on, YYYY-mm-dd
+        look_back_days (int): How many days to look back, default is 30
+    Returns:
+        str: A CSV table of trading days x indicators followed by one description per indicator.
+    """
+    return route_to_vendor("get_indicators_batch", symbol, list(indicators), curr_date, look_back_days)
+
+
+async def _aget_indicators_batch(symbol: str, indicators: List[str], curr_date: str, look_back_days: int = 30) -> str:
+    """Async variant used by get_indicators_batch.ainvoke (non-blocking vendor clients)."""
+    return await aroute_to_vendor("get_indicators_batch", symbol, list(indicators), curr_date, look_back_days)
+
+get_indicators_batch.coroutine = _aget_indicators_batch
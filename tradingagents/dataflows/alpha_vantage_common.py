@@ -5,6 +5,9 @@ import json
 from datetime import datetime
 from io import StringIO
 
+from .async_http import get_async_client
+from .deadline import http_timeout
+
 API_BASE_URL = "https://www.alphavantage.co/query"
 
 def get_api_key() -> str:
@@ -39,12 +42,8 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
-def _make_api_request(function_name: str, params: dict) -> dict | str:
-    """Helper function to make API requests and handle responses.
-    
-    Raises:
-        AlphaVantageRateLimitError: When API rate limit is exceeded
-    """
+def _build_api_params(function_name: str, params: dict) -> dict:
+    """Build the query parameters for an Alpha Vantage request."""
     # Create a copy of params to avoid modifying the original
     api_params = params.copy()
     api_params.update({
@@ -62,12 +61,15 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
     elif "entitlement" in api_params:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
-    
-    response = requests.get(API_BASE_URL, params=api_params)
-    response.raise_for_status()
 
-    response_text = response.text
+    return api_params
+
+def _check_api_response(response_text: str) -> str:
+    """Raise on rate-limit responses, otherwise return the body unchanged.
     
+    Raises:
+        AlphaVantageRateLimitError: When API rate limit is exceeded
+    """
     # Check if response is JSON (error responses are typically JSON)
     try:
         response_json = json.loads(response_text)
@@ -82,6 +84,29 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
 
     return response_text
 
+def _make_api_request(function_name: str, params: dict) -> dict | str:
+    """Helper function to make API requests and handle responses.
+    
+    Raises:
+        AlphaVantageRateLimitError: When API rate limit is exceeded
+    """
+    response = requests.get(API_BASE_URL, params=_build_api_params(function_name, params), timeout=http_timeout())
+    response.raise_for_status()
+
+    return _check_api_response(response.text)
+
+async def _amake_api_request(function_name: str, params: dict) -> str:
+    """Async variant of _make_api_request using the shared pooled HTTP client.
+    
+    Raises:
+        AlphaVantageRateLimitError: When API rate limit is exceeded
+    """
+    client = get_async_client()
+    response = await client.get(API_BASE_URL, params=_build_api_params(function_name, params), timeout=http_timeout())
+    response.raise_for_status()
+
+    return _check_api_response(response.text)
+
 
 
 def _filter_csv_by_date_range(csv_data: str, start_date: str, end_date: str) -> str:
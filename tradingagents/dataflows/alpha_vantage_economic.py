@@ -2,9 +2,11 @@
 Alpha Vantage Economic Calendar Integration
 Provides macroeconomic event tracking for context-aware trading analysis
 """
+import json
 from typing import Annotated
 from datetime import datetime, timedelta
 from .alpha_vantage_common import _make_api_request
+from .macro_cache import macro_cached
 
 
 def get_economic_calendar(
@@ -30,7 +32,21 @@ def get_economic_calendar(
     
     Returns:
         Formatted string with upcoming economic events and their importance
+
+    The calendar is the same for every ticker, so it is fetched once per start date
+    (today by default) and shared through the macro cache.
     """
+    trade_date = start_date or datetime.now().strftime("%Y-%m-%d")
+    return macro_cached(
+        "get_economic_calendar",
+        trade_date,
+        lambda: _fetch_economic_calendar(start_date, end_date, horizon),
+        (start_date, end_date, horizon),
+    )
+
+
+def _fetch_economic_calendar(start_date, end_date, horizon) -> str:
+    """Request and format the economic calendar (see get_economic_calendar)"""
     # Build parameters
     params = {}
     
@@ -46,6 +62,8 @@ def get_economic_calendar(
     
     try:
         data = _make_api_request("ECONOMIC_CALENDAR", params)
+        if isinstance(data, str):
+            data = json.loads(data)
         
         # Check if we got valid data
         if not data or "data" not in data:
@@ -1,6 +1,42 @@
-from .alpha_vantage_common import _make_api_request, format_datetime_for_api
+"""
+Alpha Vantage news and insider endpoints.
+NEWS_SENTIMENT returns up to 50 articles with full ticker_sentiment arrays, topic lists
+and banner URLs. get_news keeps only what the analysts use (time, source, title,
+summary, overall and ticker-specific sentiment) in a compact CSV table, preceded by
+per-ticker sentiment aggregates computed locally over the whole feed. Parsed results
+are cached in-process, so repeated calls for the same window cost no API request.
+"""
+import csv
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
-def get_news(ticker, start_date, end_date) -> dict[str, str] | str:
+import pandas as pd
+
+from .alpha_vantage_common import _make_api_request, _amake_api_request, format_datetime_for_api
+
+# Columns of the article table (news_normalize parses rows back into article records)
+NEWS_TABLE_COLUMNS = ["time", "source", "title", "summary", "sentiment", "ticker_sentiment", "relevance"]
+
+# Summary characters kept per article
+MAX_SUMMARY_CHARS = 300
+
+# Tickers listed in the sentiment aggregates (most covered first)
+MAX_AGGREGATE_TICKERS = 10
+
+# Parsed payloads kept per (ticker, start_date, end_date)
+MAX_PARSED_ENTRIES = 64
+PARSED_TTL_SECONDS = 15 * 60
+
+# Parsed-form cache: key -> (stored_at, articles, aggregates)
+_parsed_cache: "OrderedDict[Tuple[str, str, str], Tuple[float, pd.DataFrame, pd.DataFrame]]" = OrderedDict()
+_parsed_cache_lock = threading.Lock()
+
+
+def get_news(ticker, start_date, end_date) -> str:
     """Returns live and historical market news & sentiment data from premier news outlets worldwide.
 
     Covers stocks, cryptocurrencies, forex, and topics like fiscal policy, mergers & acquisitions, IPOs.
@@ -11,18 +47,182 @@ def get_news(ticker, start_date, end_date) -> dict[str, str] | str:
         end_date: End date for news search.
 
     Returns:
-        Dictionary containing news sentiment data or JSON string.
+        Compact article table with per-ticker sentiment aggregates (the raw response
+        when it holds no news feed, e.g. an API note).
     """
+    cached = _cached_parse(ticker, start_date, end_date)
+    if cached is not None:
+        return format_news_sentiment(ticker, start_date, end_date, *cached)
+    return _compact_news(ticker, start_date, end_date, _make_api_request("NEWS_SENTIMENT", _news_params(ticker, start_date, end_date)))
 
-    params = {
+async def aget_news(ticker, start_date, end_date) -> str:
+    """Async variant of get_news (shared pooled HTTP client)."""
+    cached = _cached_parse(ticker, start_date, end_date)
+    if cached is not None:
+        return format_news_sentiment(ticker, start_date, end_date, *cached)
+    response = await _amake_api_request("NEWS_SENTIMENT", _news_params(ticker, start_date, end_date))
+    return _compact_news(ticker, start_date, end_date, response)
+
+def _news_params(ticker, start_date, end_date) -> dict:
+    """Query parameters for a NEWS_SENTIMENT request."""
+    return {
         "tickers": ticker,
         "time_from": format_datetime_for_api(start_date),
         "time_to": format_datetime_for_api(end_date),
         "sort": "LATEST",
         "limit": "50",
     }
-    
-    return _make_api_request("NEWS_SENTIMENT", params)
+
+def _compact_news(ticker, start_date, end_date, response) -> str:
+    """Parse a NEWS_SENTIMENT response, cache the parsed form and render it."""
+    try:
+        payload = json.loads(response) if isinstance(response, str) else response
+    except json.JSONDecodeError:
+        return response
+    if not isinstance(payload, dict) or "feed" not in payload:
+        return response
+
+    articles = parse_news_feed(payload, ticker)
+    aggregates = ticker_sentiment_stats(payload)
+    with _parsed_cache_lock:
+        _parsed_cache[(ticker.upper(), start_date, end_date)] = (time.monotonic(), articles, aggregates)
+        while len(_parsed_cache) > MAX_PARSED_ENTRIES:
+            _parsed_cache.popitem(last=False)
+    return format_news_sentiment(ticker, start_date, end_date, articles, aggregates)
+
+def _cached_parse(ticker, start_date, end_date) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    key = (ticker.upper(), start_date, end_date)
+    with _parsed_cache_lock:
+        entry = _parsed_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > PARSED_TTL_SECONDS:
+            del _parsed_cache[key]
+            return None
+        _parsed_cache.move_to_end(key)
+        return entry[1], entry[2]
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _format_time(value: str) -> str:
+    """20240509T143000 -> 2024-05-09 14:30"""
+    value = str(value or "")
+    if len(value) >= 13 and value[8] == "T":
+        return f"{value[:4]}-{value[4:6]}-{value[6:8]} {value[9:11]}:{value[11:13]}"
+    return value
+
+def parse_news_feed(payload: Dict, ticker: Optional[str] = None) -> pd.DataFrame:
+    """
+    Extract the analyst-facing fields of a NEWS_SENTIMENT feed
+
+    Args:
+        payload: Decoded NEWS_SENTIMENT response
+        ticker: Requested ticker, for the ticker-specific sentiment and relevance columns
+
+    Returns:
+        DataFrame with NEWS_TABLE_COLUMNS, newest first
+    """
+    ticker = (ticker or "").upper()
+    rows = []
+    for item in payload.get("feed", []):
+        own = next(
+            (entry for entry in item.get("ticker_sentiment", []) if str(entry.get("ticker", "")).upper() == ticker),
+            {},
+        )
+        summary = " ".join(str(item.get("summary", "")).split())
+        if len(summary) > MAX_SUMMARY_CHARS:
+            summary = summary[:MAX_SUMMARY_CHARS].rsplit(" ", 1)[0] + "..."
+        rows.append({
+            "time": _format_time(item.get("time_published")),
+            "source": str(item.get("source", "")).strip(),
+            "title": " ".join(str(item.get("title", "")).split()),
+            "summary": summary,
+            "sentiment": _to_float(item.get("overall_sentiment_score")),
+            "ticker_sentiment": _to_float(own.get("ticker_sentiment_score")),
+            "relevance": _to_float(own.get("relevance_score")),
+        })
+    frame = pd.DataFrame(rows, columns=NEWS_TABLE_COLUMNS)
+    return frame.sort_values("time", ascending=False, kind="stable").reset_index(drop=True)
+
+def ticker_sentiment_stats(payload: Dict) -> pd.DataFrame:
+    """
+    Aggregate the feed's ticker_sentiment entries per ticker
+
+    Returns:
+        DataFrame indexed by ticker: articles, avg_relevance, sentiment
+        (relevance-weighted mean score), bullish and bearish article counts
+        (Alpha Vantage labels), most covered tickers first
+    """
+    entries = [
+        {
+            "ticker": str(entry.get("ticker", "")).upper(),
+            "relevance": _to_float(entry.get("relevance_score")) or 0.0,
+            "score": _to_float(entry.get("ticker_sentiment_score")),
+            "label": str(entry.get("ticker_sentiment_label", "")).lower(),
+        }
+        for item in payload.get("feed", [])
+        for entry in item.get("ticker_sentiment", [])
+    ]
+    columns = ["articles", "avg_relevance", "sentiment", "bullish", "bearish"]
+    frame = pd.DataFrame(entries, columns=["ticker", "relevance", "score", "label"]).dropna(subset=["score"])
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    frame["weighted"] = frame["score"] * frame["relevance"]
+    frame["bullish"] = frame["label"].str.contains("bullish")
+    frame["bearish"] = frame["label"].str.contains("bearish")
+    grouped = frame.groupby("ticker")
+    stats = pd.DataFrame({
+        "articles": grouped.size(),
+        "avg_relevance": grouped["relevance"].mean(),
+        "weight": grouped["relevance"].sum(),
+        "weighted": grouped["weighted"].sum(),
+        "mean_score": grouped["score"].mean(),
+        "bullish": grouped["bullish"].sum().astype(int),
+        "bearish": grouped["bearish"].sum().astype(int),
+    })
+    stats["sentiment"] = (stats["weighted"] / stats["weight"]).where(stats["weight"] > 0, stats["mean_score"])
+    stats = stats.sort_values(["articles", "avg_relevance"], ascending=False)
+    return stats[columns]
+
+def format_news_sentiment(ticker, start_date, end_date, articles: pd.DataFrame, aggregates: pd.DataFrame) -> str:
+    """Render parsed news as per-ticker aggregates plus the compact article table."""
+    ticker = ticker.upper()
+    if articles.empty:
+        return f"No Alpha Vantage news found for {ticker} between {start_date} and {end_date}."
+
+    lines = []
+    if not aggregates.empty:
+        shown = aggregates.head(MAX_AGGREGATE_TICKERS)
+        if ticker in aggregates.index and ticker not in shown.index:
+            shown = pd.concat([aggregates.loc[[ticker]], shown.head(MAX_AGGREGATE_TICKERS - 1)])
+        lines += [
+            f"## Ticker Sentiment (Alpha Vantage, {start_date} to {end_date}; -1 bearish to 1 bullish, relevance-weighted)",
+            "ticker,articles,avg_relevance,sentiment,bullish,bearish",
+        ]
+        lines += [
+            f"{row.Index},{int(row.articles)},{row.avg_relevance:.2f},{row.sentiment:.3f},{int(row.bullish)},{int(row.bearish)}"
+            for row in shown.itertuples()
+        ]
+        lines.append("")
+
+    table = io.StringIO()
+    writer = csv.writer(table, lineterminator="\n")
+    writer.writerow(NEWS_TABLE_COLUMNS)
+    for row in articles.itertuples(index=False):
+        writer.writerow([
+            row.time, row.source, row.title, row.summary,
+            *("" if pd.isna(value) else f"{value:.3f}".rstrip("0").rstrip(".") for value in (row.sentiment, row.ticker_sentiment, row.relevance)),
+        ])
+    lines += [
+        f"## Alpha Vantage News Sentiment for {ticker}, {start_date} to {end_date} ({len(articles)} articles)",
+        table.getvalue().rstrip("\n"),
+    ]
+    return "\n".join(lines) + "\n"
 
 def get_insider_transactions(symbol: str) -> dict[str, str] | str:
     """Returns latest and historical insider transactions by key stakeholders.
@@ -40,4 +240,8 @@ def get_insider_transactions(symbol: str) -> dict[str, str] | str:
         "symbol": symbol,
     }
 
-    return _make_api_request("INSIDER_TRANSACTIONS", params)
\ No newline at end of file
+    return _make_api_request("INSIDER_TRANSACTIONS", params)
+
+async def aget_insider_transactions(symbol: str) -> str:
+    """Async variant of get_insider_transactions (shared pooled HTTP client)."""
+    return await _amake_api_request("INSIDER_TRANSACTIONS", {"symbol": symbol})
@@ -0,0 +1,65 @@
+"""
+Shared non-blocking HTTP client for the asyncio vendor path (aroute_to_vendor).
+One pooled httpx.AsyncClient per event loop lets a single process keep hundreds of
+vendor requests outstanding over a bounded set of keep-alive connections.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Optional
+
+try:
+    import httpx
+except ImportError:  # Optional dependency: only needed for the async vendor path
+    httpx = None
+
+from .config import get_config
+
+# httpx clients are bound to the loop they were created on
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def _new_client() -> "httpx.AsyncClient":
+    """Create a pooled client from the vendor_async config block"""
+    async_config = get_config().get("vendor_async", {})
+    limits = httpx.Limits(
+        max_connections=async_config.get("max_connections", 100),
+        max_keepalive_connections=async_config.get("max_keepalive_connections", 20),
+    )
+    timeout = httpx.Timeout(async_config.get("timeout_seconds", 30))
+    return httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True)
+
+
+def get_async_client() -> "httpx.AsyncClient":
+    """
+    Get the pooled HTTP client for the running event loop
+
+    Raises:
+        ImportError: If httpx is not installed
+        RuntimeError: If called outside a running event loop
+    """
+    if httpx is None:
+        raise ImportError("httpx is required for async vendor calls: pip install httpx")
+
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = _new_client()
+            _clients[loop] = client
+    return client
+
+
+async def aclose_async_client():
+    """Close the running loop's client (call before shutting the loop down)"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def is_async_http_available() -> bool:
+    """Whether the async vendor clients can be used (httpx installed)"""
+    return httpx is not None
@@ -0,0 +1,286 @@
+"""
+Precompiled company-mention matcher for the local Reddit news.
+The company filter used to run re.search once per search term on every post line, for
+one ticker at a time and only for the tickers of a hard-coded dict. Aliases now come
+from a table (built-in defaults, optionally extended from a JSON/CSV file and the
+config), and all terms are compiled once into trie-shaped regular expressions, so a
+post is scanned once to find every ticker it mentions.
+
+Matching rules: company names match case-insensitively as whole words ("Apple" in
+"Apple's results", not in "pineapple"); ticker symbols match case-sensitively as whole
+words, or case-insensitively with a "$" prefix ("AAPL", "$aapl").
+"""
+import os
+import re
+import json
+import string
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from .config import get_config, get_config_version
+
+# Characters that may not touch either end of a match ("$" only before it)
+_WORD_CHARS = "A-Za-z0-9"
+_BOUNDARY_CHARS = frozenset(string.ascii_letters + string.digits + "$")
+
+# Term sets up to this size are prefiltered with plain substring tests
+_LITERAL_PREFILTER_TERMS = 8
+
+# Trailing legal-form words dropped from company names loaded from data ("APPLE INC" -> "APPLE")
+_LEGAL_SUFFIXES = re.compile(
+    r"[\s,]+(inc|incorporated|corp|corporation|co|company|ltd|limited|plc|llc|lp|sa|ag|nv|"
+    r"holdings?|group|the)\.?$",
+    re.IGNORECASE,
+)
+
+
+def split_aliases(value) -> List[str]:
+    """Aliases from a table value: a list, or a string with " OR " separators"""
+    if isinstance(value, str):
+        value = value.split(" OR ")
+    return [alias.strip() for alias in value if alias and alias.strip()]
+
+
+def strip_legal_suffix(name: str) -> str:
+    """Company name without trailing legal-form words ("Apple Inc." -> "Apple")"""
+    previous = None
+    while previous != name:
+        previous, name = name, _LEGAL_SUFFIXES.sub("", name).strip()
+    return name or previous
+
+
+def load_alias_file(path: str) -> Dict[str, List[str]]:
+    """
+    Read an alias table
+
+    Args:
+        path: JSON file ({"AAPL": ["Apple"], "META": "Meta OR Facebook"}) or a CSV/TSV with a
+            ticker column and an alias/name column (e.g. SimFin's us-companies.csv; several
+            rows per ticker allowed, legal-form suffixes are also stripped)
+
+    Returns:
+        {ticker: [aliases]}
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return {ticker.upper(): split_aliases(value) for ticker, value in json.load(f).items()}
+
+    table = pd.read_csv(path, sep=None, engine="python", dtype=str)
+    columns = {c.strip().lower(): c for c in table.columns}
+    ticker_column = columns.get("ticker") or columns.get("symbol")
+    name_column = next((columns[c] for c in ("alias", "company name", "company", "name") if c in columns), None)
+    if ticker_column is None or name_column is None:
+        raise ValueError(f"Alias table {path} needs a ticker column and an alias/name column")
+
+    aliases: Dict[str, List[str]] = defaultdict(list)
+    for ticker, name in table[[ticker_column, name_column]].dropna().itertuples(index=False):
+        for alias in (name.strip(), strip_legal_suffix(name.strip())):
+            if alias and alias not in aliases[ticker.strip().upper()]:
+                aliases[ticker.strip().upper()].append(alias)
+    return dict(aliases)
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """
+    Regex alternation of literal terms shaped as a prefix trie
+
+    The engine branches on one character per step instead of trying every term at every
+    position, and longer continuations are tried before a term ends (longest match first).
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict) -> str:
+        ends = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            return f"(?:{body})?" if len(branches) > 1 or len(body) > 1 else f"{body}?"
+        return body
+
+    return render(trie)
+
+
+class _TermScanner:
+    """One compiled trie regex over a set of literal terms, reporting every term present"""
+
+    def __init__(self, terms: Dict[str, Set[str]], lowercase: bool):
+        """
+        Args:
+            terms: {term: tickers it stands for}
+            lowercase: Match against the lowercased text (terms must be lowercase)
+        """
+        self.terms = terms
+        self.lowercase = lowercase
+        # The pattern starts with the trie, so the regex engine skips positions whose
+        # character cannot start a term; the left word boundary is checked per match
+        self.pattern = re.compile(f"(?:{_trie_regex(terms)})(?![{_WORD_CHARS}])") if terms else None
+        # For each term, the shorter terms it starts with (present too when their end is a word boundary)
+        self._prefixes: Dict[str, List[str]] = {
+            term: [other for other in terms if other != term and term.startswith(other)] for term in terms
+        }
+        # Few terms (a single ticker): substring tests reject most texts before the regex runs
+        self._literals = list(terms) if len(terms) <= _LITERAL_PREFILTER_TERMS else None
+
+    def scan(self, text: str, found: Set[str]):
+        """Add the tickers of every term occurring in ``text`` to ``found``"""
+        if self.pattern is None:
+            return
+        if self.lowercase:
+            text = text.lower()
+        if self._literals is not None and not any(term in text for term in self._literals):
+            return
+
+        search = self.pattern.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                return
+            start = match.start()
+            if start == 0 or text[start - 1] not in _BOUNDARY_CHARS:
+                term = match.group()
+                found.update(self.terms[term])
+                for shorter in self._prefixes[term]:
+                    after = start + len(shorter)
+                    if after >= len(text) or text[after] not in _BOUNDARY_CHARS:
+                        found.update(self.terms[shorter])
+            # Terms may also start inside this match ("Bank of America" / "America")
+            pos = start + 1
+
+
+class CompanyMatcher:
+    """Finds which tickers a text mentions, by company alias or ticker symbol"""
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        """
+        Initialize the matcher
+
+        Args:
+            aliases: {ticker: company names}; the ticker symbol itself is always matched
+        """
+        self.aliases = {ticker.upper(): list(split_aliases(names)) for ticker, names in aliases.items()}
+        name_terms: Dict[str, Set[str]] = defaultdict(set)
+        symbol_terms: Dict[str, Set[str]] = defaultdict(set)
+        for ticker, names in self.aliases.items():
+            symbol_terms[ticker].add(ticker)
+            for name in names:
+                # One- and two-letter names ("X") are too ambiguous to match case-insensitively
+                if len(name) <= 2:
+                    symbol_terms[name].add(ticker)
+                else:
+                    name_terms[name.lower()].add(ticker)
+        # Cashtags ("$aapl") are case-insensitive names
+        for symbol, tickers in symbol_terms.items():
+            name_terms["$" + symbol.lower()].update(tickers)
+        self._names = _TermScanner(dict(name_terms), lowercase=True)
+        self._symbols = _TermScanner(dict(symbol_terms), lowercase=False)
+        self._single: Dict[str, "CompanyMatcher"] = {}
+        self._single_lock = threading.Lock()
+
+    @property
+    def tickers(self) -> List[str]:
+        return sorted(self.aliases)
+
+    def tickers_in(self, text: str) -> Set[str]:
+        """Every ticker ``text`` mentions, found in one scan per term kind"""
+        found: Set[str] = set()
+        if text:
+            self._names.scan(text, found)
+            self._symbols.scan(text, found)
+        return found
+
+    def for_ticker(self, ticker: str) -> "CompanyMatcher":
+        """Matcher restricted to one ticker (built once and reused)"""
+        ticker = ticker.upper()
+        with self._single_lock:
+            matcher = self._single.get(ticker)
+            if matcher is None:
+                # Tickers without aliases still match by symbol
+                matcher = CompanyMatcher({ticker: self.aliases.get(ticker, [])})
+                self._single[ticker] = matcher
+            return matcher
+
+    def mentions(self, text: str) -> bool:
+        """Whether ``text`` mentions any of the matcher's tickers"""
+        return bool(self.tickers_in(text))
+
+    def mask(self, *columns: pd.Series) -> pd.Series:
+        """Boolean mask of the rows where any of the text columns mentions a ticker"""
+        result = pd.Series(False, index=columns[0].index)
+        for column in columns:
+            result |= column.map(self.mentions).astype(bool)
+        return result
+
+    def bucket(self, texts: Iterable[str]) -> List[Set[str]]:
+        """Tickers mentioned by each text"""
+        return [self.tickers_in(text) for text in texts]
+
+
+def _default_aliases() -> Dict[str, List[str]]:
+    from .reddit_utils import ticker_to_company  # Built-in table; imported lazily (reddit_utils uses this module)
+
+    aliases = {}
+    for ticker, names in ticker_to_company.items():
+        # "Snap Inc." also matches a plain "Snap"
+        names = split_aliases(names)
+        aliases[ticker] = names + [short for short in map(strip_legal_suffix, names) if short not in names]
+    return aliases
+
+
+def load_company_aliases() -> Dict[str, List[str]]:
+    """
+    Alias table for the current configuration
+
+    Built-in defaults, extended by the file at company_aliases.path (default:
+    <data_dir>/company_aliases.json or .csv when present) and by company_aliases.aliases.
+    Entries from later sources replace earlier ones for the same ticker.
+    """
+    config = get_config()
+    alias_config = config.get("company_aliases", {})
+    aliases = _default_aliases()
+
+    path = alias_config.get("path")
+    if path is None and config.get("data_dir"):
+        path = next(
+            (candidate for candidate in (
+                os.path.join(config["data_dir"], "company_aliases.json"),
+                os.path.join(config["data_dir"], "company_aliases.csv"),
+            ) if os.path.exists(candidate)),
+            None,
+        )
+    if path:
+        aliases.update(load_alias_file(path))
+    aliases.update({t.upper(): split_aliases(v) for t, v in alias_config.get("aliases", {}).items()})
+    return aliases
+
+
+# Global matcher (rebuilt after config changes)
+_global_matcher: Optional[CompanyMatcher] = None
+_global_matcher_lock = threading.Lock()
+# Config version the alias table was loaded for
+_global_matcher_version = -1
+
+
+def get_company_matcher() -> CompanyMatcher:
+    """Get or create the company matcher for the current alias table"""
+    global _global_matcher, _global_matcher_version
+
+    version = get_config_version()
+    if _global_matcher_version == version and _global_matcher is not None:
+        return _global_matcher
+
+    with _global_matcher_lock:
+        if _global_matcher_version != version or _global_matcher is None:
+            _global_matcher = CompanyMatcher(load_company_aliases())
+            _global_matcher_version = version
+    return _global_matcher
@@ -4,6 +4,8 @@ from typing import Dict, Optional
 # Use default config but allow it to be overridden
 _config: Optional[Dict] = None
 DATA_DIR: Optional[str] = None
+# Bumped on every set_config() so derived state (e.g. routing tables) can be invalidated
+_config_version: int = 0
 
 
 def initialize_config():
@@ -16,11 +18,12 @@ def initialize_config():
 
 def set_config(config: Dict):
     """Update the configuration with custom values."""
-    global _config, DATA_DIR
+    global _config, DATA_DIR, _config_version
     if _config is None:
         _config = default_config.DEFAULT_CONFIG.copy()
     _config.update(config)
     DATA_DIR = _config["data_dir"]
+    _config_version += 1
 
 
 def get_config() -> Dict:
@@ -30,5 +33,10 @@ def get_config() -> Dict:
     return _config.copy()
 
 
+def get_config_version() -> int:
+    """Get a counter that changes whenever the configuration is updated."""
+    return _config_version
+
+
 # Initialize with default config
 initialize_config()
@@ -0,0 +1,306 @@
+"""
+Cooperative, thread-safe deadlines for vendor calls.
+The previous local.timeout() relied on SIGALRM, which only works in the main thread,
+so it did nothing in the tool executor threads and vendor pool workers where the data
+functions actually run. A deadline here is a plain expiry time carried in a
+contextvar: it follows the call into worker threads (when submitted with
+contextvars.copy_context().run) and asyncio tasks, bounds HTTP timeouts and sleeps,
+and is checked at safe points inside long loops. Nested scopes never extend their
+parent's budget.
+"""
+import time
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from .config import get_config
+
+# Shortest timeout handed to an HTTP client, so an almost-expired deadline still gets one attempt
+MIN_HTTP_TIMEOUT_SECONDS = 0.5
+
+# Overruns remembered for deadline_overruns()
+MAX_RECORDED_OVERRUNS = 256
+
+# Slice of a blocking wait between deadline/cancellation checks
+WAIT_POLL_SECONDS = 0.1
+
+
+class DeadlineExceeded(TimeoutError):
+    """A deadline scope ran out of time; ``label`` names the call that blew its budget"""
+
+    def __init__(self, label: str, budget: Optional[float], elapsed: float):
+        self.label = label
+        self.budget = budget
+        self.elapsed = elapsed
+        budget_text = "its" if budget is None else f"its {budget:g}s"
+        super().__init__(f"{label} exceeded {budget_text} deadline after {elapsed:.1f}s")
+
+
+class Deadline:
+    """Expiry time of one scope, optionally bounded by an enclosing deadline"""
+
+    def __init__(self, seconds: Optional[float], label: str = "", parent: Optional["Deadline"] = None):
+        """
+        Initialize the deadline
+
+        Args:
+            seconds: Budget from now; None inherits the parent's expiry (unbounded without one)
+            label: Name reported when the deadline is exceeded (e.g. "google:get_news")
+            parent: Enclosing deadline; this one never outlives it
+        """
+        self.label = label or (parent.label if parent is not None else "operation")
+        self.parent = parent
+        self.budget = seconds
+        self.started_at = time.monotonic()
+        expires_at = None if seconds is None else self.started_at + max(0.0, seconds)
+        if parent is not None and parent.expires_at is not None:
+            expires_at = parent.expires_at if expires_at is None else min(expires_at, parent.expires_at)
+        self.expires_at = expires_at
+        # Plain attributes: a flag write and list.append are atomic, and scopes are created per call
+        self._cancelled = False
+        # Names of the work that ran out of time under this deadline
+        self.overruns: List[str] = []
+
+    def __enter__(self) -> "Deadline":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._token)
+        return False
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (>= 0), or None when unbounded"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def cancel(self):
+        """Cancel the scope (and its children) cooperatively"""
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled or (self.parent is not None and self.parent.cancelled)
+
+    def expired(self) -> bool:
+        return (self.expires_at is not None and time.monotonic() >= self.expires_at) or self.cancelled
+
+    def exceeded_by(self) -> "Deadline":
+        """The scope to blame: the innermost cancelled one, else the one whose own budget ran out first"""
+        now = time.monotonic()
+        blamed, blamed_expiry = self, None
+        scope = self
+        while scope is not None:
+            if scope._cancelled:
+                return scope
+            if scope.budget is not None:
+                own_expiry = scope.started_at + scope.budget
+                if now >= own_expiry and (blamed_expiry is None or own_expiry <= blamed_expiry):
+                    blamed, blamed_expiry = scope, own_expiry
+            scope = scope.parent
+        return blamed
+
+    def error(self) -> DeadlineExceeded:
+        """The exception describing this deadline's overrun"""
+        blamed = self.exceeded_by()
+        return DeadlineExceeded(blamed.label, blamed.budget, blamed.elapsed())
+
+    def check(self):
+        """
+        Safe point: raise if the deadline passed or the scope was cancelled
+
+        Raises:
+            DeadlineExceeded: Naming the scope whose budget ran out
+        """
+        if self.expired():
+            raise self.error()
+
+    def note_overrun(self, name: str):
+        """Remember that work under this deadline (e.g. one vendor) ran out of time"""
+        if name not in self.overruns:
+            self.overruns.append(name)
+
+    def timeout(self, default: Optional[float]) -> Optional[float]:
+        """
+        Timeout for a blocking operation: ``default`` capped by the time left
+
+        Raises:
+            DeadlineExceeded: If the deadline already passed
+        """
+        self.check()
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        remaining = max(remaining, MIN_HTTP_TIMEOUT_SECONDS)
+        return remaining if default is None else min(default, remaining)
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("tradingagents_deadline", default=None)
+
+# Overrun log (label, budget, elapsed), most recent last
+_overruns: List[Dict] = []
+_overruns_lock = threading.Lock()
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Innermost deadline of the calling thread or task, if any"""
+    return _current.get()
+
+
+def deadline_scope(seconds: Optional[float], label: str = "") -> Deadline:
+    """
+    Deadline nested in the current one, for ``with deadline_scope(...) as deadline:``
+
+    Works in any thread and inside coroutines (the scope belongs to the running task).
+    The block is not interrupted: blocking calls take their timeouts from
+    http_timeout()/sleep(), and loops call check_deadline() between steps.
+
+    Args:
+        seconds: Budget for the block; None only inherits the enclosing deadline
+        label: Name reported if the block blows its budget
+    """
+    return Deadline(seconds, label, parent=_current.get())
+
+
+def check_deadline():
+    """Safe point for long loops: raise DeadlineExceeded if the current deadline passed"""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left on the current deadline, None when unbounded"""
+    deadline = _current.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def http_timeout(default: Optional[float] = None) -> Optional[float]:
+    """
+    Timeout for an HTTP request: ``default`` capped by the current deadline
+
+    Args:
+        default: Timeout outside any deadline (default: vendor_deadlines.http_timeout_seconds)
+    """
+    if default is None:
+        default = get_config().get("vendor_deadlines", {}).get("http_timeout_seconds", 30)
+    deadline = _current.get()
+    return default if deadline is None else deadline.timeout(default)
+
+
+def sleep(seconds: float):
+    """
+    time.sleep that respects the current deadline
+
+    Raises:
+        DeadlineExceeded: Instead of sleeping past the deadline (after sleeping until it)
+    """
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+    remaining = None if deadline is None else deadline.remaining()
+    if remaining is not None and seconds >= remaining:
+        time.sleep(remaining)
+        deadline.check()
+    time.sleep(seconds)
+
+
+def _poll_interval(deadline: Deadline) -> float:
+    remaining = deadline.remaining()
+    return WAIT_POLL_SECONDS if remaining is None else min(WAIT_POLL_SECONDS, remaining)
+
+
+def wait_event(event: threading.Event):
+    """
+    event.wait() that gives up at the current deadline or on cancellation
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the event is set
+    """
+    deadline = _current.get()
+    if deadline is None:
+        event.wait()
+        return
+    while not event.wait(_poll_interval(deadline)):
+        deadline.check()
+
+
+async def wait_future(future: "asyncio.Future"):
+    """
+    Await a shared future without cancelling it, giving up at the current deadline
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the future is done
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return await asyncio.shield(future)
+    while True:
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), _poll_interval(deadline))
+        except asyncio.TimeoutError:
+            deadline.check()
+
+
+@contextmanager
+def holding(lock):
+    """
+    ``with lock:`` that gives up waiting for the lock at the current deadline
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the lock is acquired
+    """
+    deadline = _current.get()
+    if deadline is None:
+        lock.acquire()
+    else:
+        while not lock.acquire(timeout=_poll_interval(deadline)):
+            deadline.check()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+async def asleep(seconds: float):
+    """asyncio.sleep counterpart of sleep()"""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+    remaining = None if deadline is None else deadline.remaining()
+    if remaining is not None and seconds >= remaining:
+        await asyncio.sleep(remaining)
+        deadline.check()
+    await asyncio.sleep(seconds)
+
+
+def record_overrun(error: DeadlineExceeded, culprit: str = ""):
+    """
+    Log an overrun and remember it for deadline_overruns()
+
+    Args:
+        error: The overrun
+        culprit: What was running when the time ran out, if not named by the error (e.g. the vendor)
+    """
+    suffix = f" (while waiting on {culprit})" if culprit and culprit not in error.label else ""
+    print(f"[DEADLINE] {error}{suffix}")
+    with _overruns_lock:
+        _overruns.append({
+            "label": error.label,
+            "culprit": culprit or error.label,
+            "budget": error.budget,
+            "elapsed": round(error.elapsed, 3),
+        })
+        del _overruns[:-MAX_RECORDED_OVERRUNS]
+
+
+def deadline_overruns() -> List[Dict]:
+    """Recent overruns, oldest first: which call blew which budget"""
+    with _overruns_lock:
+        return list(_overruns)
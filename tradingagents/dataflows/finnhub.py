@@ -8,9 +8,17 @@ from typing import Annotated
 from datetime import datetime, timedelta
 import finnhub
 
+from .async_http import get_async_client
+from .deadline import http_timeout
 
-def _get_finnhub_client():
-    """Get configured Finnhub client instance."""
+FINNHUB_API_BASE_URL = "https://finnhub.io/api/v1"
+
+# Articles rendered per company-news call; the news selection stage ranks and budgets them
+MAX_COMPANY_NEWS_ARTICLES = 50
+
+
+def _get_finnhub_api_key() -> str:
+    """Get the configured Finnhub API key."""
     api_key = os.getenv("FINNHUB_API_KEY")
     if not api_key or api_key == "your_finnhub_api_key_here":
         raise ValueError(
@@ -18,7 +26,26 @@ def _get_finnhub_client():
             "Please set FINNHUB_API_KEY in your .env file. "
             "Get a free key at: https://finnhub.io/register"
         )
-    return finnhub.Client(api_key=api_key)
+    return api_key
+
+
+def _get_finnhub_client():
+    """Get configured Finnhub client instance (request timeout bounded by the call's deadline)."""
+    client = finnhub.Client(api_key=_get_finnhub_api_key())
+    client.DEFAULT_TIMEOUT = http_timeout(client.DEFAULT_TIMEOUT)
+    return client
+
+
+async def _afinnhub_get(path: str, params: dict):
+    """GET a Finnhub REST endpoint on the shared pooled HTTP client and decode the JSON body."""
+    client = get_async_client()
+    response = await client.get(
+        f"{FINNHUB_API_BASE_URL}{path}",
+        params={**params, "token": _get_finnhub_api_key()},
+        timeout=http_timeout(),
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 def get_company_news_finnhub(
@@ -42,45 +69,62 @@ def get_company_news_finnhub(
         
         # Finnhub expects dates in YYYY-MM-DD format (already provided)
         news = client.company_news(ticker, _from=start_date, to=end_date)
-        
-        if not news:
-            return f"No Finnhub news found for {ticker} between {start_date} and {end_date}."
-        
-        # Format news into readable report
-        report = [
-            f"## Finnhub Company News for {ticker}",
-            f"**Period**: {start_date} to {end_date}",
-            f"**Total Articles**: {len(news)}\n"
-        ]
-        
-        for article in news[:20]:  # Limit to top 20 articles
-            headline = article.get('headline', 'No headline')
-            summary = article.get('summary', '')
-            source = article.get('source', 'Unknown')
-            url = article.get('url', '')
-            datetime_unix = article.get('datetime', 0)
-            
-            # Convert Unix timestamp to readable date
-            if datetime_unix:
-                article_date = datetime.fromtimestamp(datetime_unix).strftime('%Y-%m-%d %H:%M')
-            else:
-                article_date = 'Unknown date'
-            
-            report.append(f"### {headline}")
-            report.append(f"**Date**: {article_date} | **Source**: {source}")
-            if summary:
-                report.append(f"{summary[:300]}..." if len(summary) > 300 else summary)
-            if url:
-                report.append(f"[Read more]({url})")
-            report.append("")  # Blank line
-        
-        return "\n".join(report)
+        return _format_company_news(ticker, start_date, end_date, news)
+    
+    except Exception as e:
+        print(f"[INFO] Finnhub news unavailable: {e}")
+        return f"Finnhub news data not available for {ticker}."
+
+
+async def aget_company_news_finnhub(ticker: str, start_date: str, end_date: str) -> str:
+    """Async variant of get_company_news_finnhub (shared pooled HTTP client)."""
+    try:
+        news = await _afinnhub_get("/company-news", {"symbol": ticker, "from": start_date, "to": end_date})
+        return _format_company_news(ticker, start_date, end_date, news)
     
     except Exception as e:
         print(f"[INFO] Finnhub news unavailable: {e}")
         return f"Finnhub news data not available for {ticker}."
 
 
+def _format_company_news(ticker: str, start_date: str, end_date: str, news: list) -> str:
+    """Format a Finnhub company-news payload into a readable report."""
+    if not news:
+        return f"No Finnhub news found for {ticker} between {start_date} and {end_date}."
+    
+    # Format news into readable report
+    shown = news[:MAX_COMPANY_NEWS_ARTICLES]
+    total = f"{len(shown)} (first {len(shown)} of {len(news)})" if len(shown) < len(news) else str(len(news))
+    report = [
+        f"## Finnhub Company News for {ticker}",
+        f"**Period**: {start_date} to {end_date}",
+        f"**Total Articles**: {total}\n"
+    ]
+    
+    for article in shown:
+        headline = article.get('headline', 'No headline')
+        summary = article.get('summary', '')
+        source = article.get('source', 'Unknown')
+        url = article.get('url', '')
+        datetime_unix = article.get('datetime', 0)
+        
+        # Convert Unix timestamp to readable date
+        if datetime_unix:
+            article_date = datetime.fromtimestamp(datetime_unix).strftime('%Y-%m-%d %H:%M')
+        else:
+            article_date = 'Unknown date'
+        
+        report.append(f"### {headline}")
+        report.append(f"**Date**: {article_date} | **Source**: {source}")
+        if summary:
+            report.append(f"{summary[:300]}..." if len(summary) > 300 else summary)
+        if url:
+            report.append(f"[Read more]({url})")
+        report.append("")  # Blank line
+    
+    return "\n".join(report)
+
+
 def get_insider_sentiment_finnhub(
     ticker: Annotated[str, "Stock ticker symbol"],
     start_date: Annotated[str, "Start date in YYYY-MM-DD format"],
@@ -106,48 +150,65 @@ def get_insider_sentiment_finnhub(
         client = _get_finnhub_client()
         
         sentiment = client.stock_insider_sentiment(ticker, _from=start_date, to=end_date)
-        
-        if not sentiment or 'data' not in sentiment or not sentiment['data']:
-            return f"No insider sentiment data available for {ticker}."
-        
-        data = sentiment['data']
-        symbol = sentiment.get('symbol', ticker)
-        
-        report = [
-            f"## Finnhub Insider Sentiment for {symbol}",
-            f"**Period**: {start_date} to {end_date}",
-            f"**Data Points**: {len(data)}\n",
-            "### Monthly Insider Activity\n"
-        ]
-        
-        for entry in data:
-            year = entry.get('year', 'N/A')
-            month = entry.get('month', 'N/A')
-            change = entry.get('change', 0)
-            mspr = entry.get('mspr', 0)
-            
-            # Interpret the data
-            sentiment_label = "🟢 BULLISH" if change > 0 else "🔴 BEARISH" if change < 0 else "⚪ NEUTRAL"
-            
-            report.append(f"**{year}-{month:02d}** | {sentiment_label}")
-            report.append(f"- Net Share Change: {change:,} shares")
-            report.append(f"- MSPR (Monthly Share Purchase Ratio): {mspr:.2f}")
-            report.append("")
-        
-        # Add interpretation guide
-        report.append("\n### Interpretation Guide:")
-        report.append("- **Positive Net Change**: Insiders buying more than selling (bullish signal)")
-        report.append("- **Negative Net Change**: Insiders selling more than buying (bearish signal)")
-        report.append("- **MSPR > 0**: More purchases than sales")
-        report.append("- **MSPR < 0**: More sales than purchases")
-        
-        return "\n".join(report)
+        return _format_insider_sentiment(ticker, start_date, end_date, sentiment)
     
     except Exception as e:
         print(f"[INFO] Finnhub insider sentiment unavailable: {e}")
         return f"Finnhub insider sentiment data not available for {ticker}."
 
 
+async def aget_insider_sentiment_finnhub(ticker: str, start_date: str, end_date: str) -> str:
+    """Async variant of get_insider_sentiment_finnhub (shared pooled HTTP client)."""
+    try:
+        sentiment = await _afinnhub_get(
+            "/stock/insider-sentiment", {"symbol": ticker, "from": start_date, "to": end_date}
+        )
+        return _format_insider_sentiment(ticker, start_date, end_date, sentiment)
+    
+    except Exception as e:
+        print(f"[INFO] Finnhub insider sentiment unavailable: {e}")
+        return f"Finnhub insider sentiment data not available for {ticker}."
+
+
+def _format_insider_sentiment(ticker: str, start_date: str, end_date: str, sentiment: dict) -> str:
+    """Format a Finnhub insider-sentiment payload into a readable report."""
+    if not sentiment or 'data' not in sentiment or not sentiment['data']:
+        return f"No insider sentiment data available for {ticker}."
+    
+    data = sentiment['data']
+    symbol = sentiment.get('symbol', ticker)
+    
+    report = [
+        f"## Finnhub Insider Sentiment for {symbol}",
+        f"**Period**: {start_date} to {end_date}",
+        f"**Data Points**: {len(data)}\n",
+        "### Monthly Insider Activity\n"
+    ]
+    
+    for entry in data:
+        year = entry.get('year', 'N/A')
+        month = entry.get('month', 'N/A')
+        change = entry.get('change', 0)
+        mspr = entry.get('mspr', 0)
+        
+        # Interpret the data
+        sentiment_label = "🟢 BULLISH" if change > 0 else "🔴 BEARISH" if change < 0 else "⚪ NEUTRAL"
+        
+        report.append(f"**{year}-{month:02d}** | {sentiment_label}")
+        report.append(f"- Net Share Change: {change:,} shares")
+        report.append(f"- MSPR (Monthly Share Purchase Ratio): {mspr:.2f}")
+        report.append("")
+    
+    # Add interpretation guide
+    report.append("\n### Interpretation Guide:")
+    report.append("- **Positive Net Change**: Insiders buying more than selling (bullish signal)")
+    report.append("- **Negative Net Change**: Insiders selling more than buying (bearish signal)")
+    report.append("- **MSPR > 0**: More purchases than sales")
+    report.append("- **MSPR < 0**: More sales than purchases")
+    
+    return "\n".join(report)
+
+
 def get_insider_transactions_finnhub(
     ticker: Annotated[str, "Stock ticker symbol"]
 ) -> str:
@@ -166,50 +227,65 @@ def get_insider_transactions_finnhub(
         client = _get_finnhub_client()
         
         transactions = client.stock_insider_transactions(ticker)
-        
-        if not transactions or 'data' not in transactions or not transactions['data']:
-            return f"No insider transactions available for {ticker}."
-        
-        data = transactions['data']
-        symbol = transactions.get('symbol', ticker)
-        
-        report = [
-            f"## Finnhub Insider Transactions for {symbol}",
-            f"**Recent Transactions**: {len(data)}\n"
-        ]
-        
-        for txn in data[:15]:  # Limit to 15 most recent
-            name = txn.get('name', 'Unknown')
-            share = txn.get('share', 0)
-            change = txn.get('change', 0)
-            filing_date = txn.get('filingDate', 'N/A')
-            transaction_date = txn.get('transactionDate', 'N/A')
-            transaction_code = txn.get('transactionCode', '')
-            
-            # Determine transaction type
-            if change > 0:
-                action = "🟢 BUY"
-            elif change < 0:
-                action = "🔴 SELL"
-            else:
-                action = "⚪ OTHER"
-            
-            report.append(f"### {action} - {name}")
-            report.append(f"- **Transaction Date**: {transaction_date}")
-            report.append(f"- **Filing Date**: {filing_date}")
-            report.append(f"- **Shares Changed**: {change:,}")
-            report.append(f"- **Total Shares After**: {share:,}")
-            if transaction_code:
-                report.append(f"- **Transaction Code**: {transaction_code}")
-            report.append("")
-        
-        return "\n".join(report)
+        return _format_insider_transactions(ticker, transactions)
+    
+    except Exception as e:
+        print(f"[INFO] Finnhub insider transactions unavailable: {e}")
+        return f"Finnhub insider transaction data not available for {ticker}."
+
+
+async def aget_insider_transactions_finnhub(ticker: str) -> str:
+    """Async variant of get_insider_transactions_finnhub (shared pooled HTTP client)."""
+    try:
+        transactions = await _afinnhub_get("/stock/insider-transactions", {"symbol": ticker})
+        return _format_insider_transactions(ticker, transactions)
     
     except Exception as e:
         print(f"[INFO] Finnhub insider transactions unavailable: {e}")
         return f"Finnhub insider transaction data not available for {ticker}."
 
 
+def _format_insider_transactions(ticker: str, transactions: dict) -> str:
+    """Format a Finnhub insider-transactions payload into a readable report."""
+    if not transactions or 'data' not in transactions or not transactions['data']:
+        return f"No insider transactions available for {ticker}."
+    
+    data = transactions['data']
+    symbol = transactions.get('symbol', ticker)
+    
+    report = [
+        f"## Finnhub Insider Transactions for {symbol}",
+        f"**Recent Transactions**: {len(data)}\n"
+    ]
+    
+    for txn in data[:15]:  # Limit to 15 most recent
+        name = txn.get('name', 'Unknown')
+        share = txn.get('share', 0)
+        change = txn.get('change', 0)
+        filing_date = txn.get('filingDate', 'N/A')
+        transaction_date = txn.get('transactionDate', 'N/A')
+        transaction_code = txn.get('transactionCode', '')
+        
+        # Determine transaction type
+        if change > 0:
+            action = "🟢 BUY"
+        elif change < 0:
+            action = "🔴 SELL"
+        else:
+            action = "⚪ OTHER"
+        
+        report.append(f"### {action} - {name}")
+        report.append(f"- **Transaction Date**: {transaction_date}")
+        report.append(f"- **Filing Date**: {filing_date}")
+        report.append(f"- **Shares Changed**: {change:,}")
+        report.append(f"- **Total Shares After**: {share:,}")
+        if transaction_code:
+            report.append(f"- **Transaction Code**: {transaction_code}")
+        report.append("")
+    
+    return "\n".join(report)
+
+
 def get_earnings_surprises_finnhub(
     ticker: Annotated[str, "Stock ticker symbol"],
     limit: Annotated[int, "Number of quarters to retrieve"] = 4
@@ -0,0 +1,133 @@
+"""
+Parsed, date-indexed cache of the local Finnhub JSON files.
+Each {ticker}_data_formatted.json maps yyyy-mm-dd keys to lists of entries. Local-mode
+backtests query the same files for every trading day, so each file is parsed once into
+a sorted date array answered by bisection, and re-read only when its mtime or size
+changes. Entry de-duplication uses hashable keys instead of list membership.
+"""
+import os
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+class FinnhubDateIndex:
+    """One Finnhub file: its non-empty dates, sorted, plus the entries for each date"""
+
+    def __init__(self, data: Dict[str, List[Dict]]):
+        """
+        Initialize the index
+
+        Args:
+            data: Parsed file content, {yyyy-mm-dd: [entry, ...]}
+        """
+        self._data = {key: value for key, value in data.items() if len(value) > 0}
+        # File order of the keys, so range() returns them in the order the file lists them
+        self._positions = {key: i for i, key in enumerate(self._data)}
+        self.dates: List[str] = sorted(self._data)
+
+    def range(self, start_date: str, end_date: str) -> Dict[str, List[Dict]]:
+        """
+        Entries dated ``start_date <= date <= end_date`` (string comparison, like the keys)
+
+        The returned lists are shared with the cache and must not be modified.
+        """
+        lo = bisect_left(self.dates, start_date)
+        hi = bisect_right(self.dates, end_date)
+        keys = sorted(self.dates[lo:hi], key=self._positions.__getitem__)
+        return {key: self._data[key] for key in keys}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+class FinnhubFileCache:
+    """LRU of parsed Finnhub files keyed by path, invalidated by mtime and size"""
+
+    def __init__(self, max_files: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            max_files: Parsed files kept in memory
+        """
+        self.max_files = max_files
+        self._files: "OrderedDict[str, Tuple[Tuple[float, int], FinnhubDateIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.loads = 0
+
+    def load(self, path: str) -> FinnhubDateIndex:
+        """
+        Parsed index of ``path``, reading the file only if it is new or has changed
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == signature:
+                self._files.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+
+        with open(path, "r") as f:
+            index = FinnhubDateIndex(json.load(f))
+
+        with self._lock:
+            self._files[path] = (signature, index)
+            self._files.move_to_end(path)
+            self.loads += 1
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+
+    def stats(self) -> Dict:
+        """Hit/load counters and current size"""
+        with self._lock:
+            return {"files": len(self._files), "hits": self.hits, "loads": self.loads}
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of a JSON value; equal values (as compared with ==) freeze equally"""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def unique_entries(groups: Iterable[Iterable[Dict]]) -> Iterator[Dict]:
+    """Entries of all groups in order, skipping any equal to one already yielded (O(1) per entry)"""
+    seen = set()
+    for entries in groups:
+        for entry in entries:
+            key = _freeze(entry)
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+
+# Global cache instance
+_global_cache: Optional[FinnhubFileCache] = None
+_global_cache_lock = threading.Lock()
+
+
+def get_finnhub_file_cache() -> FinnhubFileCache:
+    """Get or create the process-wide Finnhub file cache"""
+    global _global_cache
+
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = FinnhubFileCache()
+    return _global_cache
@@ -1,15 +1,56 @@
 from typing import Annotated
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from .googlenews_utils import getNewsData
+from .config import get_config
+from .googlenews_utils import getNewsData, agetNewsData
 
 
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
+    max_results: Annotated[int, "stop after this many articles (default: google_news.max_results)"] = None,
 ) -> str:
     """Get Google News with (query, curr_date, look_back_days) parameters."""
+    window = _search_window(query, curr_date, look_back_days)
+    if window is None:
+        return ""
+    query, before, curr_date = window
+
+    try:
+        news_results = getNewsData(query, before, curr_date, _max_results(max_results))
+    except Exception as e:
+        print(f"[ERROR] Google News scraping failed: {e}")
+        return ""
+
+    return _format_google_news(query, before, curr_date, news_results)
+
+
+async def aget_google_news(query: str, curr_date: str, look_back_days: int, max_results: int = None) -> str:
+    """Async variant of get_google_news (shared pooled HTTP client)."""
+    window = _search_window(query, curr_date, look_back_days)
+    if window is None:
+        return ""
+    query, before, curr_date = window
+
+    try:
+        news_results = await agetNewsData(query, before, curr_date, _max_results(max_results))
+    except Exception as e:
+        print(f"[ERROR] Google News scraping failed: {e}")
+        return ""
+
+    return _format_google_news(query, before, curr_date, news_results)
+
+
+def _max_results(max_results):
+    """Caller's article limit, else the configured one (0/None in config: every page)"""
+    if max_results is None:
+        max_results = get_config().get("google_news", {}).get("max_results")
+    return max_results or None
+
+
+def _search_window(query, curr_date, look_back_days):
+    """Normalize (query, curr_date, look_back_days) into (query, start, end), or None on a bad date."""
     # Type safety: ensure parameters are correct types
     query = str(query).replace(" ", "+")
     curr_date = str(curr_date)  # Ensure curr_date is string
@@ -19,17 +60,15 @@ def get_google_news(
         start_date = datetime.strptime(curr_date, "%Y-%m-%d")
     except ValueError as e:
         print(f"[ERROR] Invalid date format for curr_date='{curr_date}': {e}")
-        return ""
+        return None
     
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
+    return query, before, curr_date
 
-    try:
-        news_results = getNewsData(query, before, curr_date)
-    except Exception as e:
-        print(f"[ERROR] Google News scraping failed: {e}")
-        return ""
 
+def _format_google_news(query, before, curr_date, news_results) -> str:
+    """Render scraped Google News results as a markdown report."""
     news_str = ""
 
     for news in news_results:
@@ -53,10 +92,35 @@ def get_google_company_news(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
     """Adapter for get_news signature: converts (ticker, start_date, end_date) to Google News format."""
-    # Calculate look_back_days from date range
+    # Use end_date as curr_date and calculate backwards
+    return get_google_news(ticker, end_date, _look_back_days(start_date, end_date))
+
+
+async def aget_google_company_news(ticker: str, start_date: str, end_date: str) -> str:
+    """Async variant of get_google_company_news."""
+    return await aget_google_news(ticker, end_date, _look_back_days(start_date, end_date))
+
+
+def get_google_global_news(
+    curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"] = 7,
+    limit: Annotated[int, "Maximum number of articles to return"] = 5,
+) -> str:
+    """Adapter for get_global_news signature: searches the configured macro query."""
+    return get_google_news(_global_query(), curr_date, look_back_days, max_results=limit)
+
+
+async def aget_google_global_news(curr_date: str, look_back_days: int = 7, limit: int = 5) -> str:
+    """Async variant of get_google_global_news."""
+    return await aget_google_news(_global_query(), curr_date, look_back_days, max_results=limit)
+
+
+def _global_query() -> str:
+    return get_config().get("google_news", {}).get("global_query") or "stock market economy"
+
+
+def _look_back_days(start_date: str, end_date: str) -> int:
+    """Calculate look_back_days from a (start_date, end_date) range."""
     start_dt = datetime.strptime(start_date, "%Y-%m-%d")
     end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-    look_back_days = (end_dt - start_dt).days
-    
-    # Use end_date as curr_date and calculate backwards
-    return get_google_news(ticker, end_date, look_back_days)
\ No newline at end of file
+    return (end_dt - start_dt).days
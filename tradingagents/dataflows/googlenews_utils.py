@@ -1,102 +1,485 @@
-import json
+"""
+Google News scraping.
+Result pages go through one GoogleNewsScraper: a shared keep-alive requests.Session,
+a per-host PolitenessScheduler instead of a fixed random sleep before every request,
+and a small worker pool that downloads the next page while the current one is parsed.
+Paging stops as soon as the caller's limit is reached. Any transport can be plugged
+in, e.g. FixtureFetcher to replay saved result pages.
+"""
+import os
+import re
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextvars import copy_context
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
-import time
-import random
+from requests.adapters import HTTPAdapter
 from tenacity import (
+    Retrying,
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
     retry_if_result,
 )
 
+from .async_http import get_async_client
+from .config import get_config
+from .deadline import asleep, check_deadline, http_timeout, remaining_time, sleep
+
+# Results Google returns per page (the `start` offset step)
+RESULTS_PER_PAGE = 10
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
     return response.status_code == 429
 
 
-@retry(
-    retry=(retry_if_result(is_rate_limited)),
+def _response_host(response) -> str:
+    return urlsplit(str(response.url)).netloc
+
+
+def _back_off_host(retry_state):
+    """Before a 429 retry sleeps, push back every worker's next request to that host"""
+    response = retry_state.outcome.result()
+    get_politeness_scheduler().back_off(_response_host(response), retry_state.next_action.sleep)
+
+
+# Retry policy for rate-limited (429) responses, shared by the sync, async and scraper paths
+RATE_LIMIT_RETRY = dict(
+    retry=retry_if_result(is_rate_limited),
     wait=wait_exponential(multiplier=1, min=4, max=60),
     stop=stop_after_attempt(5),
+    before_sleep=_back_off_host,
 )
+
+
+class PolitenessScheduler:
+    """
+    Spaces requests to each host: one request per ``min_interval`` plus random jitter.
+    Slots are reserved under a lock, so any number of workers (threads or tasks) share
+    the same pace, and a 429 on one of them delays all of them.
+    """
+
+    def __init__(self, min_interval: float = 1.0, jitter: float = 1.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "waited_seconds": 0.0, "backoffs": 0}
+
+    def reserve(self, host: str) -> float:
+        """Claim the next free slot for ``host``; returns the seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval + random.uniform(0, self.jitter)
+            wait = slot - now
+            self.stats["requests"] += 1
+            self.stats["waited_seconds"] += wait
+        return wait
+
+    def wait(self, host: str):
+        """Block until this caller's turn (respects the current deadline)"""
+        wait = self.reserve(host)
+        if wait > 0:
+            sleep(wait)
+
+    async def await_turn(self, host: str):
+        """Async counterpart of wait()"""
+        wait = self.reserve(host)
+        if wait > 0:
+            await asleep(wait)
+
+    def back_off(self, host: str, seconds: float):
+        """Hold every request to ``host`` for ``seconds`` (after a rate-limited response)"""
+        with self._lock:
+            resume = time.monotonic() + seconds
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), resume)
+            self.stats["backoffs"] += 1
+        print(f"[GOOGLE NEWS] Rate limited by {host}, backing off {seconds:.0f}s")
+
+    def configure(self, min_interval: float, jitter: float):
+        with self._lock:
+            self.min_interval = min_interval
+            self.jitter = jitter
+
+
+class FixtureResponse:
+    """Minimal response (status_code, content, url) served by FixtureFetcher"""
+
+    def __init__(self, status_code: int, content: bytes, url: str):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+
+class FixtureFetcher:
+    """
+    Transport that replays saved result pages from ``directory`` instead of Google.
+    Page ``n`` of a query is read from ``<query>_p<n>.html`` (see fixture_name());
+    a missing file is served as an empty 404 page, which ends the paging. With
+    ``record=True`` missing pages are fetched live once and saved.
+    """
+
+    def __init__(self, directory: str, record: bool = False):
+        self.path = directory
+        self.record = record
+
+    def __call__(self, url: str, headers: Dict[str, str]) -> FixtureResponse:
+        params = parse_qs(urlsplit(url).query)
+        query = params.get("q", [""])[0]
+        page = int(params.get("start", ["0"])[0]) // RESULTS_PER_PAGE
+        path = os.path.join(self.path, fixture_name(query, page))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return FixtureResponse(200, f.read(), url)
+        if self.record:
+            response = _session_get(url, headers)
+            if response.status_code == 200:
+                os.makedirs(self.path, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(response.content)
+            return response
+        return FixtureResponse(404, b"", url)
+
+
+def fixture_name(query: str, page: int) -> str:
+    """File name of a saved result page, e.g. ('AAPL stock', 1) -> 'aapl_stock_p1.html'"""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", query).strip("_").lower() or "query"
+    return f"{slug}_p{page}.html"
+
+
+# Keep-alive session shared by every scraper thread
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _session_get(url: str, headers: Dict[str, str]):
+    """Default transport: GET on the shared keep-alive session"""
+    return _get_session().get(url, headers=headers, timeout=http_timeout())
+
+
+class _SearchAbandoned(Exception):
+    """A speculative page request whose search already finished"""
+
+
+class GoogleNewsScraper:
+    """
+    Pages through Google News results with overlapped fetching and parsing.
+
+    Page requests run on a small worker pool: while page k is parsed, page k+1
+    (up to ``prefetch_pages`` ahead) is already downloading, each request waiting its
+    turn on the politeness scheduler and retried on 429 with RATE_LIMIT_RETRY.
+    Speculative requests are skipped once the caller's limit is certain to be reached.
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[Callable] = None,
+        scheduler: Optional[PolitenessScheduler] = None,
+        max_workers: int = 4,
+        prefetch_pages: int = 1,
+        max_pages: int = 10,
+        retry_wait=None,
+    ):
+        """
+        Initialize the scraper
+
+        Args:
+            fetch: Transport (url, headers) -> response with status_code/content/url
+                (default: the shared keep-alive session)
+            scheduler: Per-host pacing (default: the global politeness scheduler)
+            max_workers: Concurrent page requests across all searches
+            prefetch_pages: Pages requested ahead of the one being parsed (0 = strictly sequential)
+            max_pages: Hard cap on pages per search
+            retry_wait: Override of the 429 backoff wait (tests)
+        """
+        self.fetch = fetch or _session_get
+        self.scheduler = scheduler or get_politeness_scheduler()
+        self.prefetch_pages = max(0, prefetch_pages)
+        self.max_pages = max(1, max_pages)
+        self._retry_kwargs = dict(RATE_LIMIT_RETRY, sleep=sleep, before_sleep=self._back_off)
+        if retry_wait is not None:
+            self._retry_kwargs["wait"] = retry_wait
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="google-news")
+
+    def fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None, abandoned: Optional[threading.Event] = None):
+        """
+        Fetch one page politely, retrying rate-limited responses
+
+        Raises:
+            tenacity.RetryError: If the host is still rate limiting after the last attempt
+        """
+        return Retrying(**self._retry_kwargs)(self._request, url, headers or HEADERS, abandoned)
+
+    def _back_off(self, retry_state):
+        response = retry_state.outcome.result()
+        self.scheduler.back_off(_response_host(response), retry_state.next_action.sleep)
+
+    def _request(self, url, headers, abandoned):
+        self.scheduler.wait(urlsplit(url).netloc)
+        if abandoned is not None and abandoned.is_set():
+            raise _SearchAbandoned(url)
+        return self.fetch(url, headers)
+
+    def search(self, query: str, start_date: str, end_date: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Scrape the results of one query, in page order
+
+        Args:
+            query: Search query
+            start_date: Start date in yyyy-mm-dd or mm/dd/yyyy format
+            end_date: End date in yyyy-mm-dd or mm/dd/yyyy format
+            limit: Stop paging once this many results are collected (None: all pages)
+
+        Returns:
+            List of {link, title, snippet, date, source}; pages fetched before a
+            failure (retries exhausted, deadline) are kept
+        """
+        start_date = _to_search_date(start_date)
+        end_date = _to_search_date(end_date)
+        limit = limit or None
+
+        news_results = []
+        pending = {}
+        abandoned = threading.Event()
+        next_page = 0
+        page = 0
+        try:
+            while page < self.max_pages:
+                # Keep up to prefetch_pages requests ahead, unless the pages in flight already cover the limit
+                while next_page < self.max_pages and (next_page == page or (
+                    next_page - page <= self.prefetch_pages
+                    and (limit is None or len(news_results) + RESULTS_PER_PAGE * (next_page - page) < limit)
+                )):
+                    url = _search_url(query, start_date, end_date, next_page)
+                    pending[next_page] = self._pool.submit(copy_context().run, self.fetch_page, url, HEADERS, abandoned)
+                    next_page += 1
+
+                try:
+                    # Pages fetched so far are kept when the deadline passes
+                    check_deadline()
+                    response = pending.pop(page).result(timeout=remaining_time())
+                except FutureTimeout:
+                    print("Failed after multiple retries: deadline reached while waiting for a page")
+                    break
+                except Exception as e:
+                    print(f"Failed after multiple retries: {e}")
+                    break
+
+                # Parsed while the next page is downloading
+                page_results, has_next_page = parse_results_page(response.content)
+                news_results.extend(page_results)
+                page += 1
+                if not has_next_page or (limit is not None and len(news_results) >= limit):
+                    break
+        finally:
+            abandoned.set()
+            for future in pending.values():
+                future.cancel()
+
+        return news_results[:limit] if limit is not None else news_results
+
+    def search_many(
+        self, queries: Sequence[str], start_date: str, end_date: str, limit: Optional[int] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Scrape several queries at once; their page requests interleave on the shared
+        pool and politeness schedule, so one query's parsing overlaps the others' fetches.
+
+        Returns:
+            {query: results} in the order of ``queries``
+        """
+        queries = list(dict.fromkeys(queries))
+        if len(queries) <= 1:
+            return {query: self.search(query, start_date, end_date, limit) for query in queries}
+        with ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix="google-news-query") as pool:
+            futures = {
+                query: pool.submit(copy_context().run, self.search, query, start_date, end_date, limit)
+                for query in queries
+            }
+            return {query: future.result() for query, future in futures.items()}
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global pacing per host, kept across scraper rebuilds
+_global_scheduler: Optional[PolitenessScheduler] = None
+_global_scraper: Optional[GoogleNewsScraper] = None
+_global_scraper_settings = None
+_global_lock = threading.Lock()
+
+
+def _google_news_config() -> Dict:
+    return get_config().get("google_news", {})
+
+
+def get_politeness_scheduler() -> PolitenessScheduler:
+    """Get or create the global per-host politeness scheduler (pace from the google_news config)"""
+    global _global_scheduler
+    settings = _google_news_config()
+    min_interval = settings.get("min_interval_seconds", 1.0)
+    jitter = settings.get("jitter_seconds", 1.0)
+    if _global_scheduler is None:
+        with _global_lock:
+            if _global_scheduler is None:
+                _global_scheduler = PolitenessScheduler(min_interval, jitter)
+    if (_global_scheduler.min_interval, _global_scheduler.jitter) != (min_interval, jitter):
+        _global_scheduler.configure(min_interval, jitter)
+    return _global_scheduler
+
+
+def get_google_news_scraper() -> GoogleNewsScraper:
+    """Get or create the global scraper (rebuilt when the google_news config changes)"""
+    global _global_scraper, _global_scraper_settings
+
+    settings = _google_news_config()
+    key = tuple(settings.get(name) for name in ("max_workers", "prefetch_pages", "max_pages", "fixture_path"))
+    if _global_scraper is not None and _global_scraper_settings == key:
+        return _global_scraper
+
+    scheduler = get_politeness_scheduler()
+    with _global_lock:
+        if _global_scraper is None or _global_scraper_settings != key:
+            if _global_scraper is not None:
+                _global_scraper.close()
+            fixture_path = settings.get("fixture_path")
+            _global_scraper = GoogleNewsScraper(
+                fetch=FixtureFetcher(fixture_path) if fixture_path else None,
+                scheduler=scheduler,
+                max_workers=settings.get("max_workers", 4),
+                prefetch_pages=settings.get("prefetch_pages", 1),
+                max_pages=settings.get("max_pages", 10),
+            )
+            _global_scraper_settings = key
+    return _global_scraper
+
+
 def make_request(url, headers):
-    """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    """Make one polite request on the shared session, with retry logic for rate limiting"""
+    return get_google_news_scraper().fetch_page(url, headers)
+
+
+@retry(**RATE_LIMIT_RETRY, sleep=asleep)
+async def amake_request(url, headers):
+    """Async variant of make_request on the shared pooled HTTP client"""
+    # Same per-host pace as the threaded scraper (without blocking the loop)
+    await get_politeness_scheduler().await_turn(urlsplit(url).netloc)
+    client = get_async_client()
+    response = await client.get(url, headers=headers, timeout=http_timeout())
     return response
 
 
-def getNewsData(query, start_date, end_date):
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
+
+def _to_search_date(date_str):
+    """Convert yyyy-mm-dd to the mm/dd/yyyy format used by the search URL"""
+    if "-" in date_str:
+        return datetime.strptime(date_str, "%Y-%m-%d").strftime("%m/%d/%Y")
+    return date_str
+
+
+def _search_url(query, start_date, end_date, page):
+    """Build the Google News search URL for one results page"""
+    offset = str(page * RESULTS_PER_PAGE)
+    return (
+        f"https://www.google.com/search?q={query}"
+        f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+        f"&tbm=nws&start={offset}"
+    )
+
+
+def parse_results_page(content):
+    """
+    Parse one Google News results page.
+
+    Returns:
+        (news_results, has_next_page)
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    results_on_page = soup.select("div.SoaBEf")
+
+    news_results = []
+    for el in results_on_page:
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+
+    # Check for the "Next" link (pagination)
+    has_next_page = bool(results_on_page) and soup.find("a", id="pnnext") is not None
+    return news_results, has_next_page
+
+
+def getNewsData(query, start_date, end_date, max_results=None):
     """
     Scrape Google News search results for a given query and date range.
     query: str - search query
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    max_results: int - stop paging once this many results are collected (None: all pages)
     """
-    if "-" in start_date:
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        start_date = start_date.strftime("%m/%d/%Y")
-    if "-" in end_date:
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        end_date = end_date.strftime("%m/%d/%Y")
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    return get_google_news_scraper().search(query, start_date, end_date, limit=max_results)
+
+
+async def agetNewsData(query, start_date, end_date, max_results=None):
+    """Async variant of getNewsData (pages in order, paced by the shared politeness scheduler)"""
+    start_date = _to_search_date(start_date)
+    end_date = _to_search_date(end_date)
+    max_pages = max(1, _google_news_config().get("max_pages", 10))
 
     news_results = []
     page = 0
-    while True:
-        offset = str(page * 10)
-        url = (
-            f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
-        )
-
+    while page < max_pages:
         try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
+            check_deadline()
+            response = await amake_request(_search_url(query, start_date, end_date, page), HEADERS)
+            page_results, has_next_page = parse_results_page(response.content)
+            news_results.extend(page_results)
+            if not has_next_page or (max_results and len(news_results) >= max_results):
                 break
 
             page += 1
@@ -105,4 +488,4 @@ def getNewsData(query, start_date, end_date):
             print(f"Failed after multiple retries: {e}")
             break
 
-    return news_results
+    return news_results[:max_results] if max_results else news_results
@@ -0,0 +1,169 @@
+"""
+Vectorized technical indicator engine for the market analyst's indicator tools.
+Computes the 13 supported indicators from the OHLCV arrays in one pass (cumulative
+sums for the rolling windows, compiled exponential smoothing for EMA/SMMA) instead of
+wrapping the frame with stockstats and walking it row by row for each indicator.
+Formulas and warm-up behaviour follow stockstats so values match its output.
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Supported indicators (stockstats names and default windows)
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+MFI_WINDOW = 14
+VWMA_WINDOW = 14
+BOLL_WINDOW = 20
+BOLL_STD_TIMES = 2
+MACD_WINDOWS = (12, 26, 9)  # short, long, signal
+
+
+def _rolling_sum(arr: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over ``window`` rows, partial windows at the start (min_periods=1)"""
+    cumsum = np.cumsum(arr)
+    out = cumsum.copy()
+    out[window:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+
+def _window_counts(n: int, window: int) -> np.ndarray:
+    """Number of rows in each trailing window"""
+    return np.minimum(np.arange(1, n + 1), window).astype(float)
+
+
+def _sma(arr: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_sum(arr, window) / _window_counts(len(arr), window)
+
+
+def _std(arr: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample standard deviation (ddof=1); NaN for single-row windows"""
+    centered = arr - arr.mean()  # Keeps the sum-of-squares difference well conditioned
+    counts = _window_counts(len(arr), window)
+    sums = _rolling_sum(centered, window)
+    squares = _rolling_sum(centered * centered, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (squares - sums * sums / counts) / (counts - 1)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def _ema(arr: np.ndarray, span: int) -> np.ndarray:
+    """Adjusted EMA (stockstats ``ema``); the recursion runs in pandas' compiled ewm"""
+    return pd.Series(arr).ewm(span=span, adjust=True, min_periods=1).mean().to_numpy()
+
+
+def _smma(arr: np.ndarray, window: int) -> np.ndarray:
+    """Wilder's smoothed moving average (stockstats ``smma``)"""
+    return pd.Series(arr).ewm(alpha=1.0 / window, adjust=True, min_periods=0).mean().to_numpy()
+
+
+def _diff(arr: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(arr)
+    out[1:] = np.diff(arr)
+    return out
+
+
+def compute_indicators(prices: pd.DataFrame, indicators: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Compute indicators over a daily OHLCV frame
+
+    Args:
+        prices: Frame with Open/High/Low/Close/Volume columns (any case), sorted by date
+        indicators: Subset of SUPPORTED_INDICATORS (default: all of them)
+
+    Returns:
+        DataFrame on the same index with one float64 column per requested indicator
+
+    Raises:
+        ValueError: If an indicator is not supported
+    """
+    wanted = list(SUPPORTED_INDICATORS if indicators is None else indicators)
+    unsupported = [name for name in wanted if name not in SUPPORTED_INDICATORS]
+    if unsupported:
+        raise ValueError(
+            f"Indicator(s) {unsupported} are not supported. Please choose from: {list(SUPPORTED_INDICATORS)}"
+        )
+
+    columns = {c.lower(): c for c in prices.columns}
+    close = prices[columns["close"]].to_numpy(dtype=float)
+    high = prices[columns["high"]].to_numpy(dtype=float)
+    low = prices[columns["low"]].to_numpy(dtype=float)
+    volume = prices[columns["volume"]].to_numpy(dtype=float)
+    wanted_set = set(wanted)
+    result: Dict[str, np.ndarray] = {}
+
+    if len(close) == 0:
+        return pd.DataFrame({name: close for name in wanted}, index=prices.index)
+
+    if "close_50_sma" in wanted_set:
+        result["close_50_sma"] = _sma(close, 50)
+    if "close_200_sma" in wanted_set:
+        result["close_200_sma"] = _sma(close, 200)
+    if "close_10_ema" in wanted_set:
+        result["close_10_ema"] = _ema(close, 10)
+
+    if wanted_set & {"macd", "macds", "macdh"}:
+        short_w, long_w, signal_w = MACD_WINDOWS
+        macd = _ema(close, short_w) - _ema(close, long_w)
+        macds = _ema(macd, signal_w)
+        result.update(macd=macd, macds=macds, macdh=macd - macds)
+
+    if "rsi" in wanted_set:
+        change = _diff(close)
+        up = _smma(np.where(change > 0, change, 0.0), RSI_WINDOW)
+        down = _smma(np.where(change < 0, -change, 0.0), RSI_WINDOW)
+        total = up + down
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(total != 0, 100 * (up / total), 50.0)
+        rsi[0] = 50.0
+        result["rsi"] = rsi
+
+    if wanted_set & {"boll", "boll_ub", "boll_lb"}:
+        mid = _sma(close, BOLL_WINDOW)
+        width = BOLL_STD_TIMES * _std(close, BOLL_WINDOW)
+        result.update(boll=mid, boll_ub=mid + width, boll_lb=mid - width)
+
+    if "atr" in wanted_set:
+        prev_close = np.concatenate(([close[0]], close[:-1]))
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        result["atr"] = _smma(np.nan_to_num(true_range), ATR_WINDOW)
+
+    if wanted_set & {"vwma", "mfi"}:
+        typical = (close + high + low) / 3.0
+        money_flow = typical * volume
+
+        if "vwma" in wanted_set:
+            flow_sum = _rolling_sum(money_flow, VWMA_WINDOW)
+            volume_sum = _rolling_sum(volume, VWMA_WINDOW)
+            result["vwma"] = np.divide(
+                flow_sum, volume_sum, out=np.zeros_like(flow_sum), where=volume_sum != 0
+            )
+
+        if "mfi" in wanted_set:
+            typical_change = _diff(typical)
+            positive = _rolling_sum(np.where(typical_change > 0, money_flow, 0.0), MFI_WINDOW)
+            negative = _rolling_sum(np.where(typical_change < 0, money_flow, 0.0), MFI_WINDOW)
+            total = positive + negative
+            mfi = np.divide(positive, total, out=np.full_like(positive, 0.5), where=total > 0)
+            mfi[:MFI_WINDOW] = 0.5
+            result["mfi"] = mfi
+
+    return pd.DataFrame({name: result[name] for name in wanted}, index=prices.index)
+
@@ -1,5 +1,10 @@
-from typing import Annotated
+from typing import Annotated, Dict, NamedTuple, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextvars import copy_context
+import asyncio
 import os
+import time
+import threading
 
 # CRITICAL: Auto-enable local source blocking if not explicitly set
 # This prevents Reddit data hangs in all environments (cloud and local)
@@ -9,8 +14,13 @@ if os.getenv("DISABLE_LOCAL_SOURCES") is None:
 
 # Import from vendor-specific modules
 from .local import get_YFin_data, get_finnhub_news, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
-from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_fundamentals as get_yfinance_fundamentals, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
-from .google import get_google_news, get_google_company_news
+from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_stock_stats_indicators_table, get_fundamentals as get_yfinance_fundamentals, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
+from .google import (
+    get_google_company_news,
+    get_google_global_news,
+    aget_google_company_news,
+    aget_google_global_news,
+)
 from .openai import get_stock_news_openai, get_global_news_openai, get_fundamentals_openai
 from .alpha_vantage import (
     get_stock as get_alpha_vantage_stock,
@@ -20,19 +30,38 @@ from .alpha_vantage import (
     get_cashflow as get_alpha_vantage_cashflow,
     get_income_statement as get_alpha_vantage_income_statement,
     get_insider_transactions as get_alpha_vantage_insider_transactions,
-    get_news as get_alpha_vantage_news
+    get_news as get_alpha_vantage_news,
+    aget_stock as aget_alpha_vantage_stock,
+    aget_fundamentals as aget_alpha_vantage_fundamentals,
+    aget_balance_sheet as aget_alpha_vantage_balance_sheet,
+    aget_cashflow as aget_alpha_vantage_cashflow,
+    aget_income_statement as aget_alpha_vantage_income_statement,
+    aget_insider_transactions as aget_alpha_vantage_insider_transactions,
+    aget_news as aget_alpha_vantage_news,
 )
 from .finnhub import (
     get_company_news_finnhub,
     get_insider_sentiment_finnhub,
     get_insider_transactions_finnhub,
     get_earnings_surprises_finnhub,
-    get_institutional_ownership_finnhub
+    get_institutional_ownership_finnhub,
+    aget_company_news_finnhub,
+    aget_insider_sentiment_finnhub,
+    aget_insider_transactions_finnhub,
 )
 from .alpha_vantage_common import AlphaVantageRateLimitError
 
 # Configuration and routing logic
-from .config import get_config
+from .config import get_config, get_config_version
+from .vendor_cache import get_vendor_cache, get_run_cache, is_cache_bypassed, make_cache_key
+from .vendor_health import get_vendor_health
+from .singleflight import get_single_flight
+from .vendor_rate_limit import get_vendor_rate_limiter
+from .async_http import is_async_http_available
+from .output_encoding import encode_tool_output, register_encoder
+from .macro_cache import get_macro_cache, trade_date_of
+from .news_normalize import encode_news_output
+from .deadline import DeadlineExceeded, deadline_scope, record_overrun
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -45,7 +74,8 @@ TOOLS_CATEGORIES = {
     "technical_indicators": {
         "description": "Technical analysis indicators",
         "tools": [
-            "get_indicators"
+            "get_indicators",
+            "get_indicators_batch"
         ]
     },
     "fundamental_data": {
@@ -82,6 +112,9 @@ VENDOR_METHODS = {
         "yfinance": get_stock_stats_indicators_window,
         # Removed 'local' - it was just calling yfinance anyway (no local data)
     },
+    "get_indicators_batch": {
+        "yfinance": get_stock_stats_indicators_table,
+    },
     # fundamental_data
     "get_fundamentals": {
         "yfinance": get_yfinance_fundamentals,
@@ -113,7 +146,7 @@ VENDOR_METHODS = {
     },
     "get_global_news": {
         "openai": get_global_news_openai,
-        "google": get_google_news,  # Add Google as alternative
+        "google": get_google_global_news,  # Adapter for (curr_date, look_back_days, limit) signature
         "local": get_reddit_global_news
     },
     "get_insider_sentiment": {
@@ -128,12 +161,68 @@ VENDOR_METHODS = {
     },
 }
 
+# Native asyncio implementations used by aroute_to_vendor (shared pooled HTTP client).
+# Vendors missing here (yfinance, local files, OpenAI) run on the vendor thread pool instead.
+ASYNC_VENDOR_METHODS = {
+    "get_stock_data": {
+        "alpha_vantage": aget_alpha_vantage_stock,
+    },
+    "get_fundamentals": {
+        "alpha_vantage": aget_alpha_vantage_fundamentals,
+    },
+    "get_balance_sheet": {
+        "alpha_vantage": aget_alpha_vantage_balance_sheet,
+    },
+    "get_cashflow": {
+        "alpha_vantage": aget_alpha_vantage_cashflow,
+    },
+    "get_income_statement": {
+        "alpha_vantage": aget_alpha_vantage_income_statement,
+    },
+    "get_news": {
+        "alpha_vantage": aget_alpha_vantage_news,
+        "finnhub": aget_company_news_finnhub,
+        "google": aget_google_company_news,
+    },
+    "get_global_news": {
+        "google": aget_google_global_news,
+    },
+    "get_insider_sentiment": {
+        "finnhub": aget_insider_sentiment_finnhub,
+    },
+    "get_insider_transactions": {
+        "finnhub": aget_insider_transactions_finnhub,
+        "alpha_vantage": aget_alpha_vantage_insider_transactions,
+    },
+}
+
+# Reverse index of TOOLS_CATEGORIES for O(1) category lookup
+METHOD_CATEGORIES = {
+    tool: category
+    for category, info in TOOLS_CATEGORIES.items()
+    for tool in info["tools"]
+}
+
+# News outputs join several vendors: deduplicate stories across them, then rank and budget them
+for _news_method in ("get_news", "get_global_news"):
+    register_encoder(_news_method, encode_news_output)
+
+# Verbose per-call routing logs (attempt order, per-implementation success)
+_ROUTER_DEBUG = os.getenv("TRADINGAGENTS_ROUTER_DEBUG", "false").lower() == "true"
+
+
+def _debug(message: str):
+    """Print a routing debug line when TRADINGAGENTS_ROUTER_DEBUG=true."""
+    if _ROUTER_DEBUG:
+        print(message)
+
+
 def get_category_for_method(method: str) -> str:
     """Get the category that contains the specified method."""
-    for category, info in TOOLS_CATEGORIES.items():
-        if method in info["tools"]:
-            return category
-    raise ValueError(f"Method '{method}' not found in any category")
+    try:
+        return METHOD_CATEGORIES[method]
+    except KeyError:
+        raise ValueError(f"Method '{method}' not found in any category")
 
 def get_vendor(category: str, method: str = None) -> str:
     """Get the configured vendor for a data category or specific tool method.
@@ -150,122 +239,662 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
-def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
-    category = get_category_for_method(method)
-    vendor_config = get_vendor(category, method)
+class RoutePlan(NamedTuple):
+    """Pre-resolved routing for one method, compiled from the current config."""
+    method: str
+    primary_vendors: Tuple[str, ...]     # Configured vendors that are available
+    vendor_order: Tuple[str, ...]        # Primaries first, then remaining fallbacks
+    resolved_vendor: str                 # Comma-joined primaries (cache key component)
 
-    # Handle comma-separated vendors
-    primary_vendors = [v.strip() for v in vendor_config.split(',')]
 
-    if method not in VENDOR_METHODS:
-        raise ValueError(f"Method '{method}' not supported")
+# Compiled routing table, rebuilt only when set_config() bumps the config version
+_routing_table: Dict[str, RoutePlan] = {}
+_routing_settings: Dict = {}
+_routing_table_version = -1
+_routing_table_lock = threading.Lock()
+
+
+def _compile_routing_table() -> Tuple[Dict[str, RoutePlan], Dict]:
+    """Resolve vendor order for every routed method from the current config."""
+    config = get_config()
 
-    # Get all available vendors for this method for fallback
-    all_available_vendors = list(VENDOR_METHODS[method].keys())
-    
     # Check if local sources should be disabled (cloud deployment optimization)
     disable_local = os.getenv("DISABLE_LOCAL_SOURCES", "false").lower() == "true"
-    if disable_local:
-        # Filter local from BOTH available vendors AND primary vendors
-        all_available_vendors = [v for v in all_available_vendors if v != "local"]
-        primary_vendors = [v for v in primary_vendors if v != "local"]
-        print(f"[INFO] DISABLE_LOCAL_SOURCES=true: Filtered 'local' vendor from {method}")
-    
-    # Create fallback vendor list: primary vendors first, then remaining vendors as fallbacks
-    fallback_vendors = primary_vendors.copy()
-    for vendor in all_available_vendors:
-        if vendor not in fallback_vendors:
-            fallback_vendors.append(vendor)
-
-    # Debug: Print fallback ordering
-    primary_str = " → ".join(primary_vendors)
-    fallback_str = " → ".join(fallback_vendors)
-    print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
 
-    # Track results and execution state
-    results = []
-    vendor_attempt_count = 0
-    any_primary_vendor_attempted = False
-    successful_vendor = None
+    table = {}
+    for method, implementations in VENDOR_METHODS.items():
+        vendor_config = get_vendor(get_category_for_method(method), method)
+
+        # Handle comma-separated vendors
+        primary_vendors = [v.strip() for v in vendor_config.split(',')]
+        all_available_vendors = list(implementations.keys())
 
-    for vendor in fallback_vendors:
-        # CRITICAL: Double-check local sources are disabled (defense in depth)
-        if vendor == "local" and disable_local:
-            print(f"[INFO] Skipping 'local' vendor '{vendor}' for {method} (DISABLE_LOCAL_SOURCES=true)")
-            continue
-        
-        if vendor not in VENDOR_METHODS[method]:
-            if vendor in primary_vendors:
+        if disable_local:
+            # Filter local from BOTH available vendors AND primary vendors
+            all_available_vendors = [v for v in all_available_vendors if v != "local"]
+            primary_vendors = [v for v in primary_vendors if v != "local"]
+
+        for vendor in primary_vendors:
+            if vendor not in implementations:
                 print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
-            continue
 
-        vendor_impl = VENDOR_METHODS[method][vendor]
-        is_primary_vendor = vendor in primary_vendors
-        vendor_attempt_count += 1
+        # Create fallback vendor list: primary vendors first, then remaining vendors as fallbacks
+        vendor_order = [v for v in primary_vendors if v in implementations]
+        for vendor in all_available_vendors:
+            if vendor not in vendor_order:
+                vendor_order.append(vendor)
+
+        table[method] = RoutePlan(
+            method=method,
+            primary_vendors=tuple(primary_vendors),
+            vendor_order=tuple(vendor_order),
+            resolved_vendor=",".join(primary_vendors),
+        )
+        _debug(f"DEBUG: {method} - Primary: [{' → '.join(primary_vendors)}] | Full fallback order: [{' → '.join(vendor_order)}]")
+
+    if disable_local:
+        print("[INFO] DISABLE_LOCAL_SOURCES=true: Filtered 'local' vendor from routing table")
+
+    macro_config = config.get("macro_cache", {})
+    settings = {
+        "concurrency": dict(config.get("vendor_concurrency", {})),
+        "single_flight": config.get("vendor_single_flight", True),
+        "deadlines": dict(config.get("vendor_deadlines", {})),
+        # Ticker-independent methods served once per trade date from the macro cache
+        "macro_methods": frozenset(macro_config.get("methods", ()) if macro_config.get("enabled", True) else ()),
+    }
+    return table, settings
+
+
+def get_routing_plan(method: str) -> RoutePlan:
+    """Get the compiled routing plan for a method, recompiling after config changes."""
+    global _routing_table, _routing_settings, _routing_table_version
+
+    version = get_config_version()
+    if _routing_table_version != version:
+        with _routing_table_lock:
+            if _routing_table_version != version:
+                _routing_table, _routing_settings = _compile_routing_table()
+                _routing_table_version = version
+
+    plan = _routing_table.get(method)
+    if plan is None:
+        raise ValueError(f"Method '{method}' not supported")
+    return plan
+
+
+def invalidate_routing_table():
+    """Force recompilation on the next call (e.g. after changing DISABLE_LOCAL_SOURCES or VENDOR_METHODS)."""
+    global _routing_table_version
+    with _routing_table_lock:
+        _routing_table_version = -1
+
+
+# Shared, bounded worker pool for concurrent and hedged vendor calls
+_vendor_pool: Optional[ThreadPoolExecutor] = None
+_vendor_pool_lock = threading.Lock()
+
+
+def _get_vendor_pool() -> ThreadPoolExecutor:
+    """Get or create the shared vendor worker pool."""
+    global _vendor_pool
+    with _vendor_pool_lock:
+        if _vendor_pool is None:
+            max_workers = get_config().get("vendor_concurrency", {}).get("max_workers", 8)
+            _vendor_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vendor")
+    return _vendor_pool
 
-        # Track if we attempted any primary vendor
-        if is_primary_vendor:
-            any_primary_vendor_attempted = True
 
-        # Debug: Print current attempt
-        vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
-        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
+def _call_vendor(method: str, vendor: str, is_primary_vendor: bool, health, attempt: int, args, kwargs) -> list:
+    """Run every implementation registered for one vendor and record its health.
+
+    The vendor runs under its own deadline (vendor_deadlines.vendor_budget_seconds,
+    within the call's), which caps its HTTP timeouts and quota wait.
+
+    Returns the list of results (empty if all implementations failed).
+    """
+    vendor_impl = VENDOR_METHODS[method][vendor]
+
+    # Debug: Print current attempt
+    vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
+    _debug(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{attempt})")
+
+    with deadline_scope(_routing_settings["deadlines"].get("vendor_budget_seconds"), f"{vendor}:{method}") as budget:
+        # Wait for this vendor's quota; out of budget means fall back without a health penalty
+        limiter = get_vendor_rate_limiter()
+        if limiter is not None and not limiter.acquire(vendor, budget.remaining()):
+            health.release_probe(vendor, method)
+            return []
 
         # Handle list of methods for a vendor
         if isinstance(vendor_impl, list):
             vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
+            _debug(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
         else:
             vendor_methods = [(vendor_impl, vendor)]
 
         # Run methods for this vendor
         vendor_results = []
+        last_error = None
+        vendor_start = time.time()
         for impl_func, vendor_name in vendor_methods:
+            if budget.expired():
+                break
             try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
+                _debug(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
                 result = impl_func(*args, **kwargs)
                 vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
+                _debug(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
+
             except AlphaVantageRateLimitError as e:
                 if vendor == "alpha_vantage":
                     print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
+                    _debug(f"DEBUG: Rate limit details: {e}")
+                last_error = e
                 # Continue to next vendor for fallback
                 continue
             except Exception as e:
                 # Log error but continue with other implementations
                 print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
+                last_error = e
                 continue
 
-        # Add this vendor's results
-        if vendor_results:
-            results.extend(vendor_results)
-            successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
-            
-            # Stopping logic: Stop after first successful vendor for single-vendor configs
-            # Multiple vendor configs (comma-separated) may want to collect from multiple sources
-            if len(primary_vendors) == 1:
-                print(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
-                break
+        if budget.expired():
+            last_error = _note_deadline_overrun(budget, vendor)
+
+    _record_vendor_outcome(method, vendor, health, vendor_results, last_error, time.time() - vendor_start)
+    return vendor_results
+
+
+def _note_deadline_overrun(budget, vendor: str) -> DeadlineExceeded:
+    """Report a vendor that ran out of time (its own budget or the call's) and blame it on the call."""
+    error = budget.error()
+    record_overrun(error, vendor)
+    scope = budget.parent
+    while scope is not None:
+        scope.note_overrun(vendor)
+        scope = scope.parent
+    return error
+
+
+def _record_vendor_outcome(method: str, vendor: str, health, vendor_results: list, last_error, vendor_latency: float):
+    """Update the vendor's circuit after a call."""
+    if vendor_results:
+        health.record_success(vendor, method, vendor_latency)
+        _debug(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+    else:
+        if last_error is not None:
+            health.record_failure(vendor, method, last_error, vendor_latency)
         else:
-            print(f"FAILED: Vendor '{vendor}' produced no results")
+            health.release_probe(vendor, method)
+        print(f"FAILED: Vendor '{vendor}' produced no results")
+
+
+def _call_vendors_concurrently(method: str, vendors: list, health, call, args, kwargs) -> dict:
+    """Call several vendors in parallel on the shared pool, within the call's deadline.
+
+    Returns a dict mapping vendor to its results; vendors that miss the deadline
+    contribute nothing (their workers see the same deadline and give up on it).
+    """
+    if not vendors:
+        return {}
+
+    pool = _get_vendor_pool()
+    futures = {
+        pool.submit(copy_context().run, _call_vendor, method, vendor, True, health, attempt, args, kwargs): vendor
+        for attempt, vendor in enumerate(vendors, start=1)
+    }
+    done, not_done = wait(futures, timeout=call.remaining())
+
+    vendor_results = {}
+    for future in done:
+        vendor = futures[future]
+        try:
+            vendor_results[vendor] = future.result()
+        except Exception as e:
+            print(f"FAILED: Vendor '{vendor}' raised during concurrent call: {e}")
+            vendor_results[vendor] = []
+    for future in not_done:
+        vendor = futures[future]
+        print(f"TIMEOUT: Vendor '{vendor}' did not answer {method} within {call.budget}s, dropping its results")
+        # The worker records the vendor's failure when it returns (its HTTP timeouts share this deadline)
+        call.note_overrun(vendor)
+
+    return vendor_results
+
+
+def _call_vendor_hedged(method: str, primary: str, hedge_vendor, health, delay: float, call, args, kwargs):
+    """Call the primary vendor and, if it is slow, race it against one fallback.
+
+    Returns (winning_vendor, results, vendors_started).
+    """
+    pool = _get_vendor_pool()
+    futures = {pool.submit(copy_context().run, _call_vendor, method, primary, True, health, 1, args, kwargs): primary}
+
+    remaining = call.remaining()
+    done, _ = wait(futures, timeout=delay if remaining is None else min(delay, remaining))
+    if not done and hedge_vendor is not None and not call.expired() and health.allow(hedge_vendor, method):
+        print(f"HEDGE: '{primary}' slower than {delay:.1f}s for {method}, starting '{hedge_vendor}'")
+        futures[pool.submit(copy_context().run, _call_vendor, method, hedge_vendor, False, health, 2, args, kwargs)] = hedge_vendor
+
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=call.remaining(), return_when=FIRST_COMPLETED)
+        if not done:
+            for future in pending:
+                vendor = futures[future]
+                print(f"TIMEOUT: Vendor '{vendor}' did not answer {method} within {call.budget}s")
+                call.note_overrun(vendor)
+            break
+        # Prefer the primary when both finished in the same wake-up
+        for future in sorted(done, key=lambda f: futures[f] != primary):
+            try:
+                vendor_results = future.result()
+            except Exception:
+                vendor_results = []
+            if vendor_results:
+                return futures[future], vendor_results, list(futures.values())
+
+    return None, [], list(futures.values())
+
+
+def _prefer_vendors_with_budget(vendors: list) -> list:
+    """Move vendors whose quota is exhausted behind those that can be called right away."""
+    limiter = get_vendor_rate_limiter()
+    if limiter is None or not limiter.is_limited():
+        return vendors
+    return sorted(vendors, key=lambda vendor: not limiter.has_budget(vendor))
+
 
+def _lookup_cached(method: str, plan: RoutePlan, cache, run_cache, cache_key) -> Optional[str]:
+    """Serve a call from the run-scoped (prefetch) cache or the persistent response cache."""
+    if run_cache.active:
+        cached = run_cache.get(cache_key)
+        if cached is not None:
+            _debug(f"CACHE: RUN HIT for {method} ({plan.resolved_vendor})")
+            return cached
+
+    # Read per lookup: TRADINGAGENTS_CACHE_BYPASS can change without a config version bump
+    if cache is not None and not is_cache_bypassed():
+        cached = cache.get(method, cache_key)
+        if cached is not None:
+            _debug(f"CACHE: HIT for {method} ({plan.resolved_vendor})")
+            if run_cache.active:
+                run_cache.put(cache_key, cached)
+            return cached
+    return None
+
+
+def route_to_vendor(method: str, *args, **kwargs):
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    The vendor output is passed through the method's output encoder (compact, token
+    budgeted form for the agents); caches hold the raw output.
+    """
+    return encode_tool_output(method, route_to_vendor_raw(method, *args, **kwargs), args)
+
+
+def route_to_vendor_raw(method: str, *args, **kwargs):
+    """route_to_vendor without output encoding (used to warm the caches)."""
+    plan = get_routing_plan(method)
+
+    if method in _routing_settings["macro_methods"]:
+        scope = _macro_scope(plan, args, kwargs)
+        if scope is not None:
+            trade_date, params = scope
+            return get_macro_cache().get_or_compute(
+                method, trade_date, lambda: _route_cached(plan, args, kwargs), params
+            )
+    return _route_cached(plan, args, kwargs)
+
+
+def _macro_scope(plan: RoutePlan, args, kwargs) -> Optional[Tuple[str, tuple]]:
+    """(trade date, other parameters) of a macro method call, None without a valid curr_date."""
+    trade_date = trade_date_of(kwargs.get("curr_date", args[0] if args else None))
+    if trade_date is None:
+        return None
+    other_kwargs = {k: v for k, v in kwargs.items() if k != "curr_date"}
+    other_args = args[1:] if "curr_date" not in kwargs else args
+    return trade_date, (plan.resolved_vendor, other_args, other_kwargs)
+
+
+def _route_cached(plan: RoutePlan, args, kwargs):
+    """Serve a call from the vendor/run caches or the vendors (coalescing identical in-flight calls)."""
+    method = plan.method
+    cache = get_vendor_cache()
+    run_cache = get_run_cache()
+    single_flight = _routing_settings["single_flight"]
+    cache_key = None
+    if cache is not None or single_flight or run_cache.active:
+        cache_key = make_cache_key(method, plan.resolved_vendor, args, kwargs)
+
+    cached = _lookup_cached(method, plan, cache, run_cache, cache_key)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        output, successful_vendor = _route_uncached(plan, args, kwargs)
+        if cache is not None:
+            cache.put(method, cache_key, successful_vendor, output, cache.ttl_for(method, args, kwargs))
+        if run_cache.active:
+            run_cache.put(cache_key, output)
+        return output
+
+    # Coalesce identical in-flight calls into one vendor request
+    if single_flight:
+        return get_single_flight().do(cache_key, method, fetch)
+    return fetch()
+
+
+def _call_budget(method: str) -> Optional[float]:
+    """Time budget of one routed call: per-method override, else vendor_concurrency.call_deadline_seconds."""
+    budgets = _routing_settings["deadlines"].get("method_budgets", {})
+    return budgets.get(method, _routing_settings["concurrency"].get("call_deadline_seconds"))
+
+
+def _route_uncached(plan: RoutePlan, args, kwargs) -> Tuple[str, Optional[str]]:
+    """Execute a routing plan against the vendors, within the call's deadline.
+
+    Returns (output, successful_vendor).
+    """
+    with deadline_scope(_call_budget(plan.method), plan.method) as call:
+        return _route_within(plan, call, args, kwargs)
+
+
+def _route_within(plan: RoutePlan, call, args, kwargs) -> Tuple[str, Optional[str]]:
+    method = plan.method
+    primary_vendors = plan.primary_vendors
+    concurrency = _routing_settings["concurrency"]
+
+    # Reorder by vendor health: open circuits go last, healthy fast fallbacks first
+    health = get_vendor_health()
+    fallback_vendors = _prefer_vendors_with_budget(health.order(method, plan.vendor_order, primary_vendors))
+
+    # Track results and execution state
+    results = []
+    vendor_attempt_count = 0
+    successful_vendor = None
+    skipped_open_vendors = []
+    attempted_vendors = set()
+
+    def is_runnable(vendor):
+        """Skip vendors with an open circuit (disabled/unsupported ones are compiled out)."""
+        # Circuit breaker: skip vendors that are cooling down after failures
+        if not health.allow(vendor, method):
+            print(f"CIRCUIT_OPEN: Skipping vendor '{vendor}' for {method} (cooling down)")
+            skipped_open_vendors.append(vendor)
+            return False
+        return True
+
+    if len(primary_vendors) > 1 and concurrency.get("parallel_primaries", False):
+        # Concurrent fan-out across the comma-separated vendors, merged in configured order
+        runnable = [v for v in primary_vendors if v in plan.vendor_order and is_runnable(v)]
+        vendor_attempt_count += len(runnable)
+        attempted_vendors.update(primary_vendors)
+        fan_out_results = _call_vendors_concurrently(method, runnable, health, call, args, kwargs)
+        for vendor in runnable:
+            if fan_out_results.get(vendor):
+                results.extend(fan_out_results[vendor])
+                successful_vendor = successful_vendor or vendor
+        if results:
+            _debug(f"DEBUG: Concurrent fan-out for {method} succeeded, skipping fallback vendors")
+
+    elif len(primary_vendors) == 1 and concurrency.get("hedge", False):
+        # Hedged request: start the first fallback if the primary is slower than usual
+        primary = primary_vendors[0]
+        hedge_vendor = next((v for v in fallback_vendors if v != primary), None)
+        attempted_vendors.add(primary)
+        if primary in plan.vendor_order and is_runnable(primary):
+            delay = max(
+                concurrency.get("hedge_min_delay_seconds", 2.0),
+                health.latency_percentile(primary, method, concurrency.get("hedge_percentile", 0.9)) or 0.0,
+            )
+            winner, hedge_results, started = _call_vendor_hedged(
+                method, primary, hedge_vendor, health, delay, call, args, kwargs
+            )
+            vendor_attempt_count += len(started)
+            attempted_vendors.update(started)
+            if hedge_results:
+                results.extend(hedge_results)
+                successful_vendor = winner
+
+    if not results:
+        for vendor in fallback_vendors:
+            if vendor in attempted_vendors:
+                continue
+            # No time left for another fallback (checked before is_runnable takes a half-open probe)
+            if call.expired():
+                break
+            if not is_runnable(vendor):
+                continue
+
+            vendor_attempt_count += 1
+            vendor_results = _call_vendor(
+                method, vendor, vendor in primary_vendors, health, vendor_attempt_count, args, kwargs
+            )
+
+            # Add this vendor's results
+            if vendor_results:
+                results.extend(vendor_results)
+                successful_vendor = vendor
+
+                # Stopping logic: Stop after first successful vendor for single-vendor configs
+                # Multiple vendor configs (comma-separated) may want to collect from multiple sources
+                if len(primary_vendors) == 1:
+                    _debug(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
+                    break
+
+    return _join_results(method, results, vendor_attempt_count, skipped_open_vendors, call), successful_vendor
+
+
+def _join_results(method: str, results: list, vendor_attempt_count: int, skipped_open_vendors: list, call) -> str:
+    """Merge vendor results into the tool's string output, raising if every vendor failed."""
     # Final result summary
     if not results:
         print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        if call.expired():
+            error = call.error()
+            raise DeadlineExceeded(
+                f"{error.label} (vendors out of time: {', '.join(call.overruns) or 'none started'})",
+                error.budget,
+                error.elapsed,
+            )
+        if skipped_open_vendors:
+            raise RuntimeError(
+                f"All vendor implementations failed for method '{method}' "
+                f"(circuit open for: {', '.join(skipped_open_vendors)})"
+            )
         raise RuntimeError(f"All vendor implementations failed for method '{method}'")
     else:
-        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
+        _debug(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
 
     # Always return string to maintain consistent tool return type for LangGraph
     if len(results) == 1:
         # Convert single result to string if it's not already
         result = results[0]
-        return str(result) if not isinstance(result, str) else result
+        output = str(result) if not isinstance(result, str) else result
     else:
         # Convert all results to strings and concatenate
-        return '\n'.join(str(result) for result in results)
\ No newline at end of file
+        output = '\n'.join(str(result) for result in results)
+
+    return output
+
+
+async def _acall_vendor(method: str, vendor: str, is_primary_vendor: bool, health, attempt: int, args, kwargs) -> list:
+    """Async counterpart of _call_vendor.
+
+    Awaits the vendor's native async client when one is registered (cancelled when the
+    vendor's deadline passes); otherwise the blocking implementation runs on the shared
+    vendor pool under the same deadline.
+    """
+    async_impl = ASYNC_VENDOR_METHODS.get(method, {}).get(vendor)
+    if async_impl is None or not is_async_http_available():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_vendor_pool(), copy_context().run, _call_vendor, method, vendor, is_primary_vendor, health, attempt, args, kwargs
+        )
+
+    vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
+    _debug(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (async, attempt #{attempt})")
+
+    with deadline_scope(_routing_settings["deadlines"].get("vendor_budget_seconds"), f"{vendor}:{method}") as budget:
+        limiter = get_vendor_rate_limiter()
+        if limiter is not None and not await limiter.aacquire(vendor, budget.remaining()):
+            health.release_probe(vendor, method)
+            return []
+
+        vendor_results = []
+        last_error = None
+        vendor_start = time.time()
+        try:
+            vendor_results.append(await asyncio.wait_for(async_impl(*args, **kwargs), timeout=budget.remaining()))
+            _debug(f"SUCCESS: {async_impl.__name__} from vendor '{vendor}' completed successfully")
+        except AlphaVantageRateLimitError as e:
+            if vendor == "alpha_vantage":
+                print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
+                _debug(f"DEBUG: Rate limit details: {e}")
+            last_error = e
+        except asyncio.TimeoutError:
+            last_error = _note_deadline_overrun(budget, vendor)
+        except Exception as e:
+            print(f"FAILED: {async_impl.__name__} from vendor '{vendor}' failed: {e}")
+            last_error = _note_deadline_overrun(budget, vendor) if budget.expired() else e
+
+    _record_vendor_outcome(method, vendor, health, vendor_results, last_error, time.time() - vendor_start)
+    return vendor_results
+
+
+async def _acall_vendor_with_deadline(method: str, vendor: str, health, attempt: int, call, args, kwargs) -> list:
+    """Run _acall_vendor for a primary vendor, recording a timeout if it misses the call's deadline."""
+    try:
+        return await asyncio.wait_for(
+            _acall_vendor(method, vendor, True, health, attempt, args, kwargs), timeout=call.remaining()
+        )
+    except asyncio.TimeoutError:
+        print(f"TIMEOUT: Vendor '{vendor}' did not answer {method} within {call.budget}s, dropping its results")
+        error = call.error()
+        record_overrun(error, vendor)
+        call.note_overrun(vendor)
+        health.record_failure(vendor, method, error, call.elapsed())
+        return []
+
+
+async def aroute_to_vendor(method: str, *args, **kwargs):
+    """Async counterpart of route_to_vendor.
+
+    Shares the routing table, response cache, single-flight group and vendor health
+    with the sync path. Comma-separated primaries are awaited concurrently; hedging
+    is not applied since a slow async call does not hold a thread.
+    """
+    return encode_tool_output(method, await aroute_to_vendor_raw(method, *args, **kwargs), args)
+
+
+async def aroute_to_vendor_raw(method: str, *args, **kwargs):
+    """aroute_to_vendor without output encoding."""
+    plan = get_routing_plan(method)
+
+    if method in _routing_settings["macro_methods"]:
+        scope = _macro_scope(plan, args, kwargs)
+        if scope is not None:
+            trade_date, params = scope
+            return await get_macro_cache().aget_or_compute(
+                method, trade_date, lambda: _aroute_cached(plan, args, kwargs), params
+            )
+    return await _aroute_cached(plan, args, kwargs)
+
+
+async def _aroute_cached(plan: RoutePlan, args, kwargs):
+    """Async counterpart of _route_cached (identical in-flight calls coalesce per event loop)."""
+    method = plan.method
+    cache = get_vendor_cache()
+    run_cache = get_run_cache()
+    single_flight = _routing_settings["single_flight"]
+    cache_key = None
+    if cache is not None or single_flight or run_cache.active:
+        cache_key = make_cache_key(method, plan.resolved_vendor, args, kwargs)
+
+    cached = _lookup_cached(method, plan, cache, run_cache, cache_key)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        output, successful_vendor = await _aroute_uncached(plan, args, kwargs)
+        if cache is not None:
+            cache.put(method, cache_key, successful_vendor, output, cache.ttl_for(method, args, kwargs))
+        if run_cache.active:
+            run_cache.put(cache_key, output)
+        return output
+
+    # Coalesce identical in-flight calls on this event loop into one vendor request
+    if single_flight:
+        return await get_single_flight().ado(cache_key, method, fetch)
+    return await fetch()
+
+
+async def _aroute_uncached(plan: RoutePlan, args, kwargs) -> Tuple[str, Optional[str]]:
+    """Async counterpart of _route_uncached (the deadline scope belongs to the running task).
+
+    Returns (output, successful_vendor).
+    """
+    with deadline_scope(_call_budget(plan.method), plan.method) as call:
+        return await _aroute_within(plan, call, args, kwargs)
+
+
+async def _aroute_within(plan: RoutePlan, call, args, kwargs) -> Tuple[str, Optional[str]]:
+    method = plan.method
+    primary_vendors = plan.primary_vendors
+    concurrency = _routing_settings["concurrency"]
+
+    health = get_vendor_health()
+    fallback_vendors = _prefer_vendors_with_budget(health.order(method, plan.vendor_order, primary_vendors))
+
+    results = []
+    vendor_attempt_count = 0
+    successful_vendor = None
+    skipped_open_vendors = []
+    attempted_vendors = set()
+
+    def is_runnable(vendor):
+        """Skip vendors with an open circuit."""
+        if not health.allow(vendor, method):
+            print(f"CIRCUIT_OPEN: Skipping vendor '{vendor}' for {method} (cooling down)")
+            skipped_open_vendors.append(vendor)
+            return False
+        return True
+
+    if len(primary_vendors) > 1 and concurrency.get("parallel_primaries", False):
+        # Concurrent fan-out across the comma-separated vendors, merged in configured order
+        runnable = [v for v in primary_vendors if v in plan.vendor_order and is_runnable(v)]
+        vendor_attempt_count += len(runnable)
+        attempted_vendors.update(primary_vendors)
+        fan_out_results = await asyncio.gather(*(
+            _acall_vendor_with_deadline(method, vendor, health, attempt, call, args, kwargs)
+            for attempt, vendor in enumerate(runnable, start=1)
+        ))
+        for vendor, vendor_results in zip(runnable, fan_out_results):
+            if vendor_results:
+                results.extend(vendor_results)
+                successful_vendor = successful_vendor or vendor
+
+    if not results:
+        for vendor in fallback_vendors:
+            if vendor in attempted_vendors:
+                continue
+            if call.expired():
+                break
+            if not is_runnable(vendor):
+                continue
+
+            vendor_attempt_count += 1
+            vendor_results = await _acall_vendor(
+                method, vendor, vendor in primary_vendors, health, vendor_attempt_count, args, kwargs
+            )
+            if vendor_results:
+                results.extend(vendor_results)
+                successful_vendor = vendor
+
+                # Stop after first successful vendor for single-vendor configs
+                if len(primary_vendors) == 1:
+                    break
+
+    return _join_results(method, results, vendor_attempt_count, skipped_open_vendors, call), successful_vendor
@@ -5,29 +5,25 @@ from .config import DATA_DIR
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
-from .reddit_utils import fetch_top_from_category
-from tqdm import tqdm
-import signal
+from .reddit_utils import fetch_top_from_category_range
+from .simfin_store import get_simfin_store
+from .finnhub_index import get_finnhub_file_cache, unique_entries
+from .deadline import deadline_scope
 from contextlib import contextmanager
 
 # Timeout context manager for preventing infinite hangs
 @contextmanager
 def timeout(seconds=60):
-    """Context manager to timeout long-running operations"""
-    def timeout_handler(signum, frame):
-        raise TimeoutError(f"Operation timed out after {seconds} seconds")
-    
-    # Set up timeout (Unix-only, Windows uses alternative approach)
-    if os.name != 'nt':  # Unix/Linux/Mac
-        old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(seconds)
-        try:
-            yield
-        finally:
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, old_handler)
-    else:  # Windows - no signal support, skip timeout
-        yield
+    """
+    Bound a block to ``seconds``; works in any thread and in coroutines
+
+    Cooperative (see deadline.py): HTTP timeouts and sleeps inside the block are capped
+    by the deadline and long loops stop at their check_deadline() points. Raises
+    DeadlineExceeded (a TimeoutError) if the block finishes after its deadline.
+    """
+    with deadline_scope(seconds, label="local operation") as deadline:
+        yield deadline
+        deadline.check()
 
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -161,12 +157,8 @@ def get_finnhub_company_insider_sentiment(
         return ""
 
     result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    for entry in unique_entries(data.values()):
+        result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -198,13 +190,8 @@ def get_finnhub_company_insider_transactions(
         return ""
 
     result_str = ""
-
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    for entry in unique_entries(data.values()):
+        result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -235,15 +222,8 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
-
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    # Parsed once per file (re-read when it changes); non-empty dates in range found by bisection
+    return get_finnhub_file_cache().load(data_path).range(start_date, end_date)
 
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
@@ -253,35 +233,14 @@ def get_simfin_balance_sheet(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "balance_sheet",
-        "companies",
-        "us",
-        f"us-balance-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # As-of lookup in the indexed store: latest report published on or before the current date
+    latest_balance_sheet = get_simfin_store().latest("balance_sheet", freq, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -300,35 +259,14 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "cash_flow",
-        "companies",
-        "us",
-        f"us-cashflow-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # As-of lookup in the indexed store: latest report published on or before the current date
+    latest_cash_flow = get_simfin_store().latest("cash_flow", freq, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -347,35 +285,14 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "income_statements",
-        "companies",
-        "us",
-        f"us-income-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # As-of lookup in the indexed store: latest report published on or before the current date
+    latest_income = get_simfin_store().latest("income_statements", freq, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -419,27 +336,15 @@ def get_reddit_global_news(
     before = curr_date_dt - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from before to curr_date
-    curr_iter_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (curr_date_dt - curr_iter_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {curr_date}", total=total_iterations)
-
     try:
-        while curr_iter_date <= curr_date_dt:
-            curr_date_str = curr_iter_date.strftime("%Y-%m-%d")
-            fetch_result = fetch_top_from_category(
-                "global_news",
-                curr_date_str,
-                limit,
-                data_path=reddit_data_path,
-            )
-            posts.extend(fetch_result)
-            curr_iter_date += relativedelta(days=1)
-            pbar.update(1)
-
-        pbar.close()
+        # One pass over the date-partitioned index for the whole window
+        posts = fetch_top_from_category_range(
+            "global_news",
+            before,
+            curr_date,
+            limit,
+            data_path=reddit_data_path,
+        )
 
         if len(posts) == 0:
             return ""
@@ -456,11 +361,9 @@ def get_reddit_global_news(
     except (FileNotFoundError, OSError) as e:
         # Handle Windows path issues and missing data directories gracefully
         print(f"[INFO] Local reddit data not accessible: {type(e).__name__}")
-        pbar.close()
         return ""
     except Exception as e:
         print(f"[WARNING] Unexpected error fetching local reddit news: {e}")
-        pbar.close()
         return ""
 
 
@@ -492,34 +395,16 @@ def get_reddit_company_news(
         print(f"[INFO] Skipping local reddit company news (data not available)")
         return ""
 
-    start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
-
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = start_date_dt
-
-    total_iterations = (end_date_dt - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {query} from {start_date} to {end_date}",
-        total=total_iterations,
-    )
-
     try:
-        while curr_date <= end_date_dt:
-            curr_date_str = curr_date.strftime("%Y-%m-%d")
-            fetch_result = fetch_top_from_category(
-                "company_news",
-                curr_date_str,
-                10,  # max limit per day
-                query,
-                data_path=os.path.join(DATA_DIR, "reddit_data"),
-            )
-            posts.extend(fetch_result)
-            curr_date += relativedelta(days=1)
-            pbar.update(1)
-
-        pbar.close()
+        # One pass over the date-partitioned index for the whole window
+        posts = fetch_top_from_category_range(
+            "company_news",
+            start_date,
+            end_date,
+            10,  # max limit per day
+            query,
+            data_path=reddit_path,
+        )
 
         if len(posts) == 0:
             return ""
@@ -535,9 +420,7 @@ def get_reddit_company_news(
     
     except (FileNotFoundError, OSError) as e:
         print(f"[INFO] Local reddit data not accessible: {type(e).__name__}")
-        pbar.close()
         return ""
     except Exception as e:
         print(f"[WARNING] Unexpected error fetching local reddit company news: {e}")
-        pbar.close()
         return ""
\ No newline at end of file
@@ -0,0 +1,316 @@
+"""
+Date-scoped shared cache for ticker-independent macro data.
+get_global_news and the economic calendar depend only on the trade date, yet a batch of
+N tickers on one date fetched them N times (the 15-minute vendor_cache TTL runs out long
+before a large batch finishes, and the economic calendar bypassed the router entirely).
+Entries here are keyed by (name, trade date, parameters) and computed once: concurrent
+callers in the process wait for the first computation, and other processes find the
+result on disk (serialized by a lock file where the platform supports it). Async callers
+on one event loop share a single computation too; across loops and processes the async
+path is best-effort (it skips the blocking file lock and relies on the stored entry).
+Waiting for another caller's computation never outlasts the waiter's own deadline.
+
+Refresh semantics: an entry computed after its trade date ended is final; an entry
+computed on the trade date itself (intraday use) is refreshed after
+``intraday_refresh_minutes``; ``force_refresh`` recomputes entries stored before the
+current process started, and refresh() drops entries explicitly.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: entries are still shared on disk, without the cross-process lock
+    fcntl = None
+
+from .config import get_config, get_config_version
+from .deadline import WAIT_POLL_SECONDS, current_deadline, holding, sleep
+from .singleflight import SingleFlight
+from .vendor_cache import _looks_like_error, _normalize_arg
+
+
+def _params_key(params: Any) -> str:
+    payload = json.dumps(_normalize_arg(params), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _as_date(trade_date: str) -> Optional[date]:
+    try:
+        return datetime.strptime(str(trade_date)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def trade_date_of(value) -> Optional[str]:
+    """The yyyy-mm-dd trade date of an argument ("2024-05-10", "2024-05-10 15:30"), None if it is not one"""
+    if not isinstance(value, str) or _as_date(value) is None:
+        return None
+    return value[:10]
+
+
+class MacroCache:
+    """Once-per-trade-date results, in memory and under ``root/<trade_date>/``"""
+
+    def __init__(self, root: str, intraday_refresh_seconds: float = 3600, force_refresh: bool = False):
+        """
+        Initialize the cache
+
+        Args:
+            root: Directory of the on-disk entries (shared between processes)
+            intraday_refresh_seconds: Lifetime of entries computed on their own trade date
+            force_refresh: Recompute entries stored before this cache was created
+        """
+        self.root = root
+        self.intraday_refresh_seconds = intraday_refresh_seconds
+        self.stale_before = time.time() if force_refresh else 0.0
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        # One lock per entry: callers of the same entry wait for a single computation
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._flight = SingleFlight()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "computed": 0}
+
+    def _path(self, name: str, trade_date: str, params_key: str) -> str:
+        return os.path.join(self.root, str(trade_date)[:10], f"{name}-{params_key}.json")
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Whether a stored entry can be served (see the module docstring)"""
+        computed_at = entry["computed_at"]
+        if computed_at < self.stale_before:
+            return False
+        trade_date = _as_date(entry["trade_date"])
+        if trade_date is not None and datetime.fromtimestamp(computed_at).date() > trade_date:
+            return True
+        return time.time() - computed_at < self.intraday_refresh_seconds
+
+    def lookup(self, name: str, trade_date: str, params: Any = ()) -> Optional[str]:
+        """Fresh value for the entry from memory or disk, None when it must be computed"""
+        key = self._path(name, trade_date, _params_key(params))
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and self.is_fresh(entry):
+            self.stats["memory_hits"] += 1
+            return entry["value"]
+
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self.is_fresh(entry):
+            return None
+        with self._lock:
+            self._entries[key] = entry
+        self.stats["disk_hits"] += 1
+        return entry["value"]
+
+    def store(self, name: str, trade_date: str, value: str, params: Any = ()) -> bool:
+        """Save a computed value (error-looking vendor outputs are not stored)"""
+        if not isinstance(value, str) or _looks_like_error(value):
+            return False
+        key = self._path(name, trade_date, _params_key(params))
+        entry = {
+            "name": name,
+            "trade_date": str(trade_date)[:10],
+            "params": _normalize_arg(params),
+            "computed_at": time.time(),
+            "value": value,
+        }
+        with self._lock:
+            self._entries[key] = entry
+        try:
+            os.makedirs(os.path.dirname(key), exist_ok=True)
+            temp_path = f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, key)
+        except OSError as e:
+            print(f"[MACRO] Could not persist {name} for {trade_date}: {e}")
+        return True
+
+    def get_or_compute(self, name: str, trade_date: str, compute: Callable[[], str], params: Any = ()) -> str:
+        """
+        Serve the entry, computing it at most once per trade date across callers
+
+        Args:
+            name: Data set, e.g. "get_global_news"
+            trade_date: Trade date the data is scoped to (yyyy-mm-dd)
+            compute: Produces the value on a miss
+            params: Other arguments the value depends on (look-back window, vendor, ...)
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline passes while another caller computes
+        """
+        value = self.lookup(name, trade_date, params)
+        if value is not None:
+            return value
+
+        key = self._path(name, trade_date, _params_key(params))
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with holding(key_lock):
+            value = self.lookup(name, trade_date, params)
+            if value is not None:
+                return value
+            with self._file_lock(key):
+                # Another process may have finished it while we waited for the file lock
+                value = self.lookup(name, trade_date, params)
+                if value is not None:
+                    return value
+                value = compute()
+                self.stats["computed"] += 1
+                self.store(name, trade_date, value, params)
+                return value
+
+    async def aget_or_compute(
+        self, name: str, trade_date: str, compute: Callable[[], Awaitable[str]], params: Any = ()
+    ) -> str:
+        """Async get_or_compute: concurrent callers on one event loop await a single computation"""
+        value = self.lookup(name, trade_date, params)
+        if value is not None:
+            return value
+
+        async def fill() -> str:
+            value = self.lookup(name, trade_date, params)
+            if value is not None:
+                return value
+            value = await compute()
+            self.stats["computed"] += 1
+            self.store(name, trade_date, value, params)
+            return value
+
+        return await self._flight.ado(self._path(name, trade_date, _params_key(params)), name, fill)
+
+    def _file_lock(self, key: str):
+        return _FileLock(f"{key}.lock") if fcntl is not None else _NullLock()
+
+    def refresh(self, name: Optional[str] = None, trade_date: Optional[str] = None) -> int:
+        """
+        Drop entries (all, one data set and/or one trade date) from memory and disk
+
+        Returns:
+            Number of on-disk entries removed
+        """
+        def matches(entry_name: str, entry_date: str) -> bool:
+            return (name is None or entry_name == name) and (trade_date is None or entry_date == str(trade_date)[:10])
+
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if matches(e["name"], e["trade_date"])]:
+                del self._entries[key]
+
+        removed = 0
+        if not os.path.isdir(self.root):
+            return removed
+        for entry_date in os.listdir(self.root):
+            directory = os.path.join(self.root, entry_date)
+            if not os.path.isdir(directory):
+                continue
+            for file_name in os.listdir(directory):
+                if file_name.endswith(".json") and matches(file_name.rsplit("-", 1)[0], entry_date):
+                    try:
+                        os.remove(os.path.join(directory, file_name))
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+
+class _FileLock:
+    """Exclusive advisory lock on a side file (POSIX)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a")
+        try:
+            if current_deadline() is None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                return self
+            # Poll so that a waiter gives up at its own deadline
+            while True:
+                try:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return self
+                except BlockingIOError:
+                    sleep(WAIT_POLL_SECONDS)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        return False
+
+
+class _NullLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+# Global macro cache (shared by every graph in the process)
+_global_cache: Optional[MacroCache] = None
+_global_cache_lock = threading.Lock()
+_global_cache_version = -1
+
+
+def get_macro_cache() -> Optional[MacroCache]:
+    """
+    Get or create the macro cache for the current configuration
+
+    Returns None when disabled via ``macro_cache.enabled``.
+    """
+    global _global_cache, _global_cache_version
+
+    version = get_config_version()
+    if _global_cache_version == version:
+        return _global_cache
+
+    config = get_config()
+    cache_config = config.get("macro_cache", {})
+    with _global_cache_lock:
+        if not cache_config.get("enabled", True):
+            _global_cache = None
+        else:
+            root = cache_config.get("path") or os.path.join(config["data_cache_dir"], "macro_cache")
+            refresh_seconds = cache_config.get("intraday_refresh_minutes", 60) * 60
+            force_refresh = cache_config.get("force_refresh", False)
+            if (
+                _global_cache is None
+                or _global_cache.root != root
+                or bool(_global_cache.stale_before) != force_refresh
+            ):
+                _global_cache = MacroCache(root, refresh_seconds, force_refresh)
+            _global_cache.intraday_refresh_seconds = refresh_seconds
+        _global_cache_version = version
+    return _global_cache
+
+
+def is_macro_method(name: str) -> bool:
+    """Whether a data set is served through the macro cache"""
+    return name in get_config().get("macro_cache", {}).get("methods", ())
+
+
+def macro_cached(name: str, trade_date: str, compute: Callable[[], str], params: Any = ()) -> str:
+    """get_or_compute on the global macro cache (computes directly when it is disabled or not for ``name``)"""
+    cache = get_macro_cache()
+    trade_date = trade_date_of(trade_date)
+    if cache is None or trade_date is None or not is_macro_method(name):
+        return compute()
+    return cache.get_or_compute(name, trade_date, compute, params)
+
+
+def refresh_macro_data(name: Optional[str] = None, trade_date: Optional[str] = None) -> int:
+    """Force the next request of the matching macro entries to recompute (intraday refresh)"""
+    cache = get_macro_cache()
+    return 0 if cache is None else cache.refresh(name, trade_date)
@@ -0,0 +1,723 @@
+"""
+Cross-vendor news normalization for the routed news tools.
+get_news and get_global_news join the outputs of several vendors (e.g. "finnhub,google",
+or local Finnhub files plus Reddit), so the same wire story reaches the analysts several
+times. The news encoder parses every vendor's rendering into NewsArticle records, drops
+exact duplicates by canonical URL and near-duplicates by MinHash over shingled titles
+(verified by exact Jaccard similarity) and keeps the best-sourced copy of each story.
+The remaining articles are then ranked by relevance to the call (ticker mention density,
+recency, outlet, vendor relevance/sentiment fields) and greedily packed into the call's
+token budget, so the news prompts stay bounded however verbose the vendors are.
+Articles and tokens removed are counted per method.
+"""
+import csv
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from .alpha_vantage_news import NEWS_TABLE_COLUMNS
+from .config import get_config
+from .output_encoding import estimate_tokens, trim_text_output
+
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "title_similarity": 0.6,
+    "shingle_size": 4,
+    "minhash_permutations": 32,
+    "minhash_bands": 16,
+    "source_weights": {},
+}
+
+# Outlet reputation used to pick the copy of a story to keep (lowercase source names)
+SOURCE_WEIGHTS = {
+    "reuters": 3.0,
+    "bloomberg": 3.0,
+    "associated press": 3.0,
+    "ap": 3.0,
+    "the wall street journal": 3.0,
+    "wsj": 3.0,
+    "dow jones": 3.0,
+    "financial times": 3.0,
+    "cnbc": 2.0,
+    "marketwatch": 2.0,
+    "barron's": 2.0,
+    "the new york times": 2.0,
+    "forbes": 1.5,
+    "business insider": 1.5,
+    "yahoo": 1.0,
+    "yahoo finance": 1.0,
+    "seeking alpha": 1.0,
+    "benzinga": 1.0,
+    "motley fool": 0.5,
+    "reddit": 0.0,
+}
+
+# Vendor feeds ordered by how complete their records are (URL, timestamp, summary)
+VENDOR_WEIGHTS = {
+    "finnhub": 1.0,
+    "alpha_vantage": 1.0,
+    "google": 0.5,
+    "reddit": 0.0,
+}
+
+# Query parameters that only track the click, never select the article
+_TRACKING_PARAMS = re.compile(r"^(utm_.*|fbclid|gclid|mc_cid|mc_eid|ref|ref_src|cmpid|guccounter|ncid|src)$")
+
+# "Headline - Reuters", "Headline | CNBC": outlet suffixes some vendors append to titles
+_TITLE_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+
+_GOOGLE_TITLE = re.compile(r"^(.*?)\s*\(source: ([^)]*)\)\s*$")
+_DATED_TITLE = re.compile(r"^(.*?)\s*\((\d{4}-\d{2}-\d{2})\)\s*$")
+_FINNHUB_META = re.compile(r"^\*\*Date\*\*: (.*?) \| \*\*Source\*\*: (.*)$")
+_READ_MORE = re.compile(r"^\[Read more\]\((.*)\)$")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_AV_TABLE_HEADER = ",".join(NEWS_TABLE_COLUMNS)
+_AV_TABLE_TICKER = re.compile(r"News Sentiment for ([A-Za-z0-9.\-]+),")
+
+# Header patterns of the vendor renderings, checked in order
+_SECTION_VENDORS = (
+    (re.compile(r"^## Finnhub Company News"), "finnhub"),
+    (re.compile(r"Google News, from "), "google"),
+    (re.compile(r"News Reddit, from "), "reddit"),
+    (re.compile(r"^## Alpha Vantage News"), "alpha_vantage"),
+    (re.compile(r"^## .+ News, from \d{4}-\d{2}-\d{2}"), "finnhub"),  # Local Finnhub files
+)
+
+
+class NewsArticle(NamedTuple):
+    """One article, whichever vendor rendered it"""
+    title: str
+    summary: str
+    source: str
+    url: str
+    published: str          # As rendered by the vendor (date or date time), "" if unknown
+    vendor: str
+    text: str               # Original rendering, re-emitted for kept articles
+    section: int            # Index of the vendor section it came from
+    relevance: Optional[Dict[str, float]] = None  # Vendor relevance per ticker (Alpha Vantage), 0-1
+    sentiment: Optional[float] = None             # Vendor overall sentiment score, -1 (bearish) to 1
+
+
+class NewsSection(NamedTuple):
+    """A vendor's block in a joined output: header lines plus its articles (or raw text)"""
+    vendor: Optional[str]   # None: unrecognized text, passed through unchanged
+    header: List[str]
+    articles: List[NewsArticle]
+    converted: bool = False  # Built from a raw payload (JSON): always re-rendered
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL for exact-duplicate detection
+
+    Lowercases scheme and host, drops "www." / "m." / "amp." prefixes, tracking query
+    parameters, the fragment, trailing slashes and AMP path suffixes.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = re.sub(r"/(amp|amp\.html)$", "", parts.path).rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(key.lower())
+    ))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase words of a title without the outlet suffix ("Apple Beats - Reuters" -> "apple beats")"""
+    title = _TITLE_SOURCE_SUFFIX.sub("", title.strip())
+    return _NON_WORD.sub(" ", title.lower()).strip()
+
+
+def title_shingles(title: str, size: int = 4) -> frozenset:
+    """Character ``size``-grams of the normalized title (the whole title when shorter)"""
+    text = normalize_title(title)
+    if len(text) <= size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# MinHash permutations h -> (a * h + b) mod p over 31-bit shingle hashes (products fit in uint64)
+_MERSENNE_31 = np.uint64((1 << 31) - 1)
+_permutations: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _permutation_params(count: int) -> Tuple[np.ndarray, np.ndarray]:
+    params = _permutations.get(count)
+    if params is None:
+        rng = np.random.default_rng(0x5EED)
+        a = rng.integers(1, int(_MERSENNE_31), size=count, dtype=np.uint64)
+        b = rng.integers(0, int(_MERSENNE_31), size=count, dtype=np.uint64)
+        params = _permutations[count] = (a, b)
+    return params
+
+
+def _shingle_hash(shingle: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little") & 0x7FFFFFFF
+
+
+def minhash_signature(shingles: frozenset, permutations: int = 32) -> np.ndarray:
+    """MinHash signature of a shingle set (all-max for an empty set)"""
+    a, b = _permutation_params(permutations)
+    if not shingles:
+        return np.full(permutations, _MERSENNE_31, dtype=np.uint64)
+    hashes = np.fromiter((_shingle_hash(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(a, hashes) + b[:, None]) % _MERSENNE_31).min(axis=1)
+
+
+def _source_weight(article: NewsArticle, weights: Dict[str, float]) -> float:
+    source = article.source.lower().strip()
+    if source.startswith("r/") or article.vendor == "reddit":
+        source = "reddit"
+    return weights.get(source, weights.get(source.replace(".com", ""), 0.5))
+
+
+def article_quality(article: NewsArticle, weights: Optional[Dict[str, float]] = None) -> float:
+    """Score used to keep one copy per story: outlet, vendor feed, then record completeness"""
+    weights = weights if weights is not None else SOURCE_WEIGHTS
+    return (
+        _source_weight(article, weights)
+        + VENDOR_WEIGHTS.get(article.vendor, 0.5)
+        + (0.5 if article.url else 0.0)
+        + (0.25 if article.published else 0.0)
+        + min(len(article.summary), 300) / 600
+    )
+
+
+def _section_vendor(header: str) -> Optional[str]:
+    for pattern, vendor in _SECTION_VENDORS:
+        if pattern.search(header):
+            return vendor
+    return None
+
+
+def _parse_article(lines: List[str], vendor: str, section: int) -> NewsArticle:
+    """Build a record from one "### title" block of a vendor rendering"""
+    title = lines[0][4:].strip()
+    source = url = published = ""
+    if vendor == "google":
+        match = _GOOGLE_TITLE.match(title)
+        if match:
+            title, source = match.group(1), match.group(2).strip()
+    else:
+        match = _DATED_TITLE.match(title)
+        if match:
+            title, published = match.group(1), match.group(2)
+    if vendor == "reddit":
+        source = "reddit"
+
+    summary_lines = []
+    for line in lines[1:]:
+        meta = _FINNHUB_META.match(line)
+        read_more = _READ_MORE.match(line)
+        if meta:
+            published, source = meta.group(1).strip(), meta.group(2).strip()
+        elif read_more:
+            url = read_more.group(1).strip()
+        elif line.strip():
+            summary_lines.append(line.strip())
+    return NewsArticle(
+        title=title,
+        summary=" ".join(summary_lines),
+        source=source,
+        url=url,
+        published=published,
+        vendor=vendor,
+        text="\n".join(lines).rstrip() + "\n",
+        section=section,
+    )
+
+
+def _as_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _alpha_vantage_section(payload: Dict, index: int) -> NewsSection:
+    """Records of an Alpha Vantage NEWS_SENTIMENT payload, rendered like the other vendors"""
+    articles = []
+    for item in payload.get("feed", []):
+        published = str(item.get("time_published", ""))
+        if re.match(r"^\d{8}T\d{4}", published):
+            published = f"{published[:4]}-{published[4:6]}-{published[6:8]} {published[9:11]}:{published[11:13]}"
+        article = NewsArticle(
+            title=str(item.get("title", "")).strip(),
+            summary=str(item.get("summary", "")).strip(),
+            source=str(item.get("source", "")).strip(),
+            url=str(item.get("url", "")).strip(),
+            published=published,
+            vendor="alpha_vantage",
+            text="",
+            section=index,
+            relevance={
+                str(entry.get("ticker", "")).upper(): _as_float(entry.get("relevance_score"))
+                for entry in item.get("ticker_sentiment", [])
+                if _as_float(entry.get("relevance_score")) is not None
+            } or None,
+            sentiment=_as_float(item.get("overall_sentiment_score")),
+        )
+        text = [f"### {article.title}", f"**Date**: {article.published} | **Source**: {article.source}"]
+        if article.summary:
+            text.append(article.summary)
+        if article.url:
+            text.append(f"[Read more]({article.url})")
+        articles.append(article._replace(text="\n".join(text) + "\n"))
+    return NewsSection("alpha_vantage", [f"## Alpha Vantage News Sentiment ({len(articles)} articles)"], articles, True)
+
+
+def _table_article(line: str, ticker: str, section: int) -> NewsArticle:
+    """Record of one row of the compact Alpha Vantage article table"""
+    row = dict(zip(NEWS_TABLE_COLUMNS, next(csv.reader([line]))))
+    relevance = _as_float(row.get("relevance"))
+    return NewsArticle(
+        title=row.get("title", ""),
+        summary=row.get("summary", ""),
+        source=row.get("source", ""),
+        url="",
+        published=row.get("time", ""),
+        vendor="alpha_vantage",
+        text=line,
+        section=section,
+        relevance={ticker: relevance} if ticker and relevance is not None else None,
+        sentiment=_as_float(row.get("sentiment")),
+    )
+
+
+def _split_json_payloads(output: str) -> List[Tuple[str, object]]:
+    """Split an output into text chunks and JSON objects (the raw Alpha Vantage responses)"""
+    chunks = []
+    decoder = json.JSONDecoder()
+    position = 0
+    for match in re.finditer(r"(?m)^\s*\{", output):
+        if match.start() < position:
+            continue
+        start = output.index("{", match.start())
+        try:
+            payload, end = decoder.raw_decode(output, start)
+        except ValueError:
+            continue
+        if isinstance(payload, dict) and "feed" in payload:
+            chunks.append(("text", output[position:match.start()]))
+            chunks.append(("json", payload))
+            position = end
+    chunks.append(("text", output[position:]))
+    return chunks
+
+
+def parse_news_output(output: str) -> List[NewsSection]:
+    """
+    Split a joined news output into vendor sections of NewsArticle records
+
+    Text outside a recognized vendor rendering becomes a section with ``vendor=None``
+    that is re-emitted unchanged.
+    """
+    sections: List[NewsSection] = []
+    for kind, chunk in _split_json_payloads(output):
+        if kind == "json":
+            sections.append(_alpha_vantage_section(chunk, len(sections)))
+            continue
+        current = None
+        block: List[str] = []
+        table_ticker = None  # Set while reading the rows of a compact Alpha Vantage table
+
+        def close_block():
+            if block:
+                current.articles.append(_parse_article(block, current.vendor, len(sections) - 1))
+                block.clear()
+
+        for line in chunk.splitlines():
+            if line.startswith("##") and not line.startswith("###"):
+                if current is not None:
+                    close_block()
+                current = NewsSection(_section_vendor(line), [line], [])
+                sections.append(current)
+                table_ticker = None
+            elif current is None:
+                current = NewsSection(None, [line], [])
+                sections.append(current)
+            elif current.vendor == "alpha_vantage" and line == _AV_TABLE_HEADER:
+                current.header.append(line)
+                match = _AV_TABLE_TICKER.search(current.header[0])
+                table_ticker = match.group(1).upper() if match else ""
+            elif table_ticker is not None and line.strip():
+                current.articles.append(_table_article(line, table_ticker, len(sections) - 1))
+            elif current.vendor is not None and (line.startswith("### ") or block):
+                if line.startswith("### "):
+                    close_block()
+                block.append(line)
+            else:
+                current.header.append(line)
+        if current is not None:
+            close_block()
+    return sections
+
+
+def deduplicate_articles(
+    articles: Sequence[NewsArticle], settings: Optional[Dict] = None
+) -> Tuple[List[NewsArticle], Dict[str, int]]:
+    """
+    Keep the best-sourced copy of each story
+
+    Exact duplicates share a canonical URL (or the same normalized title); near
+    duplicates are found with MinHash LSH over title shingles and confirmed when their
+    exact Jaccard similarity reaches ``title_similarity``.
+
+    Returns:
+        (kept articles in their original order, {"exact": n, "near": n} removed)
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    weights = {**SOURCE_WEIGHTS, **{k.lower(): v for k, v in settings["source_weights"].items()}}
+    count = len(articles)
+    parent = list(range(count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+            return True
+        return False
+
+    removed = {"exact": 0, "near": 0}
+    seen: Dict[str, int] = {}
+    for i, article in enumerate(articles):
+        for key in (canonical_url(article.url), "title:" + normalize_title(article.title)):
+            if key in ("", "title:"):
+                continue
+            if key in seen:
+                removed["exact"] += union(seen[key], i)
+            else:
+                seen[key] = i
+
+    shingles = [title_shingles(article.title, settings["shingle_size"]) for article in articles]
+    permutations = settings["minhash_permutations"]
+    rows = max(1, permutations // settings["minhash_bands"])
+    buckets: Dict[Tuple, List[int]] = {}
+    for i in range(count):
+        if find(i) != i or not shingles[i]:
+            continue
+        signature = minhash_signature(shingles[i], permutations)
+        candidates = set()
+        for band in range(0, permutations, rows):
+            key = (band, signature[band:band + rows].tobytes())
+            candidates.update(buckets.get(key, ()))
+            buckets.setdefault(key, []).append(i)
+        for j in sorted(candidates):
+            if find(j) != find(i) and jaccard(shingles[i], shingles[j]) >= settings["title_similarity"]:
+                removed["near"] += union(j, i)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(count):
+        groups.setdefault(find(i), []).append(i)
+    keep = sorted(
+        max(members, key=lambda i: (article_quality(articles[i], weights), -i))
+        for members in groups.values()
+    )
+    return [articles[i] for i in keep], removed
+
+
+# Article counts in vendor section headers (Finnhub "**Total Articles**: 50", Alpha Vantage "(50 articles)")
+_HEADER_COUNTS = (
+    (re.compile(r"^\*\*Total Articles\*\*: .*$"), "**Total Articles**: {count}"),
+    (re.compile(r"\(\d+ articles\)"), "({count} articles)"),
+)
+
+
+def _recount_header(header: Sequence[str], count: int) -> List[str]:
+    """Section header lines with their article counts rewritten to ``count``"""
+    lines = []
+    for line in header:
+        for pattern, replacement in _HEADER_COUNTS:
+            line = pattern.sub(replacement.format(count=count), line)
+        lines.append(line)
+    return lines
+
+
+def render_sections(sections: Sequence[NewsSection], kept: Sequence[NewsArticle]) -> str:
+    """
+    Re-emit the sections with only the kept articles
+
+    Vendor sections left empty are dropped, and the article counts in the headers of
+    filtered sections are rewritten to the number of articles that follow.
+    """
+    kept_by_section: Dict[int, List[NewsArticle]] = {}
+    for article in kept:
+        kept_by_section.setdefault(article.section, []).append(article)
+    lines = []
+    for index, section in enumerate(sections):
+        articles = kept_by_section.get(index, [])
+        if section.vendor is not None and section.articles and not articles:
+            continue
+        header = section.header
+        if len(articles) != len(section.articles):
+            header = _recount_header(header, len(articles))
+        lines.extend(header)
+        lines.extend(article.text for article in articles)
+    return "\n".join(lines).strip() + "\n"
+
+
+class NewsSelection(NamedTuple):
+    """What one call's analyst asked for, and how much of the prompt the news may take"""
+    ticker: Optional[str]           # Company of get_news (None for global news: no mention score)
+    reference_date: Optional[str]   # End of the news window (yyyy-mm-dd), for recency
+    token_budget: int               # Tokens for the whole output (0 = unlimited)
+    max_articles: Optional[int] = None
+    half_life_days: float = 3.0     # Recency score halves every half_life_days
+    weights: Optional[Dict[str, float]] = None
+
+
+# Relative weight of each relevance signal (signals an article lacks are left out of its average)
+SCORE_WEIGHTS = {
+    "mention": 2.0,     # Ticker/company mention density
+    "recency": 1.0,
+    "source": 1.0,      # Outlet reputation (SOURCE_WEIGHTS)
+    "vendor": 1.5,      # Vendor relevance/sentiment fields (Alpha Vantage)
+}
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_ISO_DATE = re.compile(r"^(\d{4}-\d{2}-\d{2})")
+_HEADER_END_DATE = re.compile(r"to (\d{4}-\d{2}-\d{2})")
+
+
+def mention_density(article: NewsArticle, matcher) -> float:
+    """0-1: half for a title mention, half for the share of summary sentences mentioning the company"""
+    sentences = [sentence for sentence in _SENTENCE_END.split(article.summary) if sentence.strip()]
+    in_title = matcher.mentions(article.title)
+    in_summary = sum(1 for sentence in sentences if matcher.mentions(sentence))
+    return 0.5 * in_title + (0.5 * in_summary / len(sentences) if sentences else 0.0)
+
+
+def _age_days(published: str, reference_date: Optional[str]) -> Optional[float]:
+    match = _ISO_DATE.match(published or "")
+    if not match or not reference_date:
+        return None
+    try:
+        age = datetime.strptime(reference_date, "%Y-%m-%d") - datetime.strptime(match.group(1), "%Y-%m-%d")
+    except ValueError:
+        return None
+    return max(0.0, age.days)
+
+
+def _vendor_signal(article: NewsArticle, ticker: Optional[str]) -> Optional[float]:
+    """Vendor relevance for the ticker, blended with sentiment strength when the vendor scores it"""
+    signals = []
+    if article.relevance:
+        relevance = article.relevance.get(ticker.upper()) if ticker else None
+        signals.append(relevance if relevance is not None else max(article.relevance.values()) / 2)
+    if article.sentiment is not None:
+        signals.append(min(1.0, abs(article.sentiment) * 2))
+    return sum(signals) / len(signals) if signals else None
+
+
+def score_article(article: NewsArticle, selection: NewsSelection, matcher=None,
+                  source_weights: Optional[Dict[str, float]] = None) -> float:
+    """
+    Relevance of an article to the call, 0-1
+
+    Weighted average of the signals available for it: ticker mention density (needs
+    ``matcher``), recency against the reference date, outlet reputation and the
+    vendor's own relevance/sentiment scores.
+    """
+    weights = {**SCORE_WEIGHTS, **(selection.weights or {})}
+    signals = {"source": min(1.0, _source_weight(article, source_weights or SOURCE_WEIGHTS) / 3.0)}
+    if matcher is not None:
+        signals["mention"] = mention_density(article, matcher)
+    age = _age_days(article.published, selection.reference_date)
+    if age is not None:
+        signals["recency"] = 0.5 ** (age / max(selection.half_life_days, 1e-6))
+    vendor = _vendor_signal(article, selection.ticker)
+    if vendor is not None:
+        signals["vendor"] = vendor
+    total = sum(weights.get(name, 0.0) for name in signals)
+    if total <= 0:
+        return 0.0
+    return sum(weights.get(name, 0.0) * value for name, value in signals.items()) / total
+
+
+def select_articles(
+    articles: Sequence[NewsArticle], selection: NewsSelection, reserved_tokens: int = 0,
+    source_weights: Optional[Dict[str, float]] = None,
+) -> List[NewsArticle]:
+    """
+    Greedily pack the highest-scoring articles into the token budget
+
+    Articles are taken best first while they fit the budget left after
+    ``reserved_tokens`` (section headers); one that does not fit is skipped for smaller
+    ones. The best article is always kept.
+
+    Returns:
+        The selected articles in their original order
+    """
+    matcher = None
+    if selection.ticker:
+        from .company_matcher import get_company_matcher  # Lazy: builds the alias table on first use
+        matcher = get_company_matcher().for_ticker(selection.ticker.upper())
+    ranked = sorted(
+        range(len(articles)),
+        key=lambda i: (-score_article(articles[i], selection, matcher, source_weights), i),
+    )
+    remaining = selection.token_budget - reserved_tokens if selection.token_budget > 0 else None
+    limit = selection.max_articles or len(articles)
+    chosen = []
+    for i in ranked:
+        if len(chosen) >= limit:
+            break
+        cost = estimate_tokens(articles[i].text)
+        if remaining is not None and cost > remaining and chosen:
+            continue
+        chosen.append(i)
+        if remaining is not None:
+            remaining -= cost
+    return [articles[i] for i in sorted(chosen)]
+
+
+class NewsDeduplicator:
+    """Deduplicates (and optionally budgets) routed news outputs, with per-method counters"""
+
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def normalize(self, method: str, output: str, selection: Optional[NewsSelection] = None) -> str:
+        """
+        Deduplicate one news output, then select articles under ``selection``'s budget
+
+        Outputs without recognizable articles are returned as is.
+        """
+        if not output:
+            return output
+        sections = parse_news_output(output)
+        articles = [article for section in sections for article in section.articles]
+        if not articles:
+            return output
+
+        removed = {"exact": 0, "near": 0}
+        kept = articles
+        if self.settings["enabled"] and len(articles) > 1:
+            kept, removed = deduplicate_articles(articles, self.settings)
+        selected = kept
+        if selection is not None:
+            weights = {**SOURCE_WEIGHTS, **{k.lower(): v for k, v in self.settings["source_weights"].items()}}
+            selected = select_articles(kept, selection, _header_tokens(sections), weights)
+        if len(selected) == len(articles) and not any(section.converted for section in sections):
+            return output
+
+        normalized = render_sections(sections, selected)
+        if len(selected) < len(kept):
+            normalized += f"({len(kept) - len(selected)} lower-ranked articles omitted to fit the news budget)\n"
+        tokens_removed = estimate_tokens(output) - estimate_tokens(normalized)
+        with self._lock:
+            counters = self._counters.setdefault(
+                method, {"calls": 0, "articles_in": 0, "articles_out": 0, "selected": 0, "tokens_removed": 0}
+            )
+            counters["calls"] += 1
+            counters["articles_in"] += len(articles)
+            counters["articles_out"] += len(kept)
+            counters["selected"] += len(selected)
+            counters["tokens_removed"] += tokens_removed
+        print(
+            f"[NEWS] {method}: {len(articles)} -> {len(kept)} articles "
+            f"({removed['exact']} exact, {removed['near']} near duplicates), {len(selected)} selected, "
+            f"-{tokens_removed} tokens"
+        )
+        return normalized
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of the per-method counters"""
+        with self._lock:
+            return {method: dict(counters) for method, counters in self._counters.items()}
+
+
+def _header_tokens(sections: Sequence[NewsSection]) -> int:
+    return sum(estimate_tokens("\n".join(section.header)) for section in sections)
+
+
+# Global deduplicator (counters live for the whole process)
+_global_deduplicator: Optional[NewsDeduplicator] = None
+_global_deduplicator_lock = threading.Lock()
+_global_deduplicator_settings = None
+
+
+def get_news_deduplicator() -> NewsDeduplicator:
+    """Get or create the deduplicator for the current news_dedup config"""
+    global _global_deduplicator, _global_deduplicator_settings
+
+    settings = get_config().get("news_dedup", {})
+    if _global_deduplicator is not None and _global_deduplicator_settings == settings:
+        return _global_deduplicator
+
+    with _global_deduplicator_lock:
+        if _global_deduplicator is None or _global_deduplicator_settings != settings:
+            previous = _global_deduplicator
+            _global_deduplicator = NewsDeduplicator(settings)
+            if previous is not None:
+                _global_deduplicator._counters = previous.snapshot()
+            _global_deduplicator_settings = dict(settings)
+    return _global_deduplicator
+
+
+def news_selection_for(method: str, args: Sequence = (), budget: int = 0) -> Optional[NewsSelection]:
+    """
+    Selection of one routed news call, from the news_selection config and the call's arguments
+
+    get_news is called as (ticker, start_date, end_date) and get_global_news as
+    (curr_date, look_back_days, limit): the ticker drives the mention score and the last
+    date argument is the reference for recency.
+
+    Args:
+        method: Routed method
+        args: Positional arguments of the call
+        budget: Fallback token budget (the method's output_encoding budget)
+    """
+    config = get_config()
+    settings = config.get("news_selection", {})
+    if not settings.get("enabled", True):
+        return None
+    max_articles = settings.get("max_articles")
+    if max_articles is None and config.get("economy_mode"):
+        max_articles = config.get("economy_config", {}).get("max_news_articles")
+    dates = [str(arg) for arg in args if isinstance(arg, str) and _ISO_DATE.match(arg)]
+    return NewsSelection(
+        ticker=str(args[0]).upper() if method == "get_news" and args else None,
+        reference_date=dates[-1] if dates else None,
+        token_budget=settings.get("token_budgets", {}).get(method, budget),
+        max_articles=max_articles,
+        half_life_days=settings.get("half_life_days", 3.0),
+        weights=settings.get("score_weights"),
+    )
+
+
+def encode_news_output(output: str, settings: Dict) -> str:
+    """Output encoder of the news methods: deduplication, relevance-ranked selection, token budget"""
+    method = settings.get("method", "get_news")
+    selection = news_selection_for(method, settings.get("args", ()), settings.get("budget", 0))
+    if selection is not None and selection.reference_date is None:
+        dates = _HEADER_END_DATE.findall(output)
+        selection = selection._replace(reference_date=max(dates) if dates else None)
+    return trim_text_output(get_news_deduplicator().normalize(method, output, selection), settings)
@@ -1,5 +1,6 @@
 from openai import OpenAI, NotFoundError, APIError
 from .config import get_config
+from .deadline import http_timeout
 
 
 def get_stock_news_openai(query, start_date, end_date):
@@ -8,7 +9,7 @@ def get_stock_news_openai(query, start_date, end_date):
     Will return empty string to allow fallback to other vendors.
     """
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = OpenAI(base_url=config["backend_url"], timeout=http_timeout())
 
     try:
         response = client.responses.create(
@@ -56,7 +57,7 @@ def get_global_news_openai(curr_date, look_back_days=7, limit=5):
     empty string if endpoint is not supported.
     """
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = OpenAI(base_url=config["backend_url"], timeout=http_timeout())
 
     try:
         response = client.responses.create(
@@ -105,7 +106,7 @@ def get_fundamentals_openai(ticker, curr_date):
     to other vendors like yfinance or alpha_vantage.
     """
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = OpenAI(base_url=config["backend_url"], timeout=http_timeout())
 
     try:
         response = client.responses.create(
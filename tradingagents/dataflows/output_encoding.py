@@ -0,0 +1,431 @@
+"""
+Token-efficient encoding of routed tool outputs before they reach the agents' prompts.
+Vendor functions render verbose text (full-precision CSV, one line per calendar day with
+"Not a trading day" fillers, raw statement dumps). route_to_vendor passes every output
+through the encoder registered for its method: tables are re-rendered compactly with
+significant-digit rounding, non-trading rows and empty columns are dropped, optional
+summary statistics are appended and the result is trimmed to a per-tool token budget.
+Savings are counted per method so each run can report the tokens it saved.
+"""
+import csv
+import io
+import math
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .config import get_config, get_config_version
+
+# Encoder signature: (output, settings) -> encoded output
+Encoder = Callable[[str, Dict], str]
+
+NOT_TRADING_MARKER = "Not a trading day"
+
+# Suffixes for large magnitudes (volumes, statement line items)
+_MAGNITUDES = ((1e12, "T"), (1e9, "B"), (1e6, "M"))
+
+_WINDOW_LINE = re.compile(r"^(\d{4}-\d{2}-\d{2}): (.*)$")
+
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "significant_digits": 5,
+    "drop_non_trading_days": True,
+    "summary_stats": True,
+    "default_token_budget": 6000,
+    "token_budgets": {},
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (4 chars ≈ 1 token, the estimate used by the LLM rate limiter)"""
+    return (len(text) + 3) // 4
+
+
+def format_number(value, digits: int = 5) -> str:
+    """
+    Render a number with ``digits`` significant digits and no exponent
+
+    Magnitudes of a million and above get a T/B/M suffix (52166000.0 -> 52.166M),
+    integral values are printed without a decimal point and missing values as "N/A".
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "N/A"
+    if isinstance(value, bool):
+        return str(value)
+    magnitude = abs(value)
+    for threshold, suffix in _MAGNITUDES:
+        if magnitude >= threshold:
+            return f"{value / threshold:.{digits}g}{suffix}"
+    if magnitude >= 10 ** digits or float(value).is_integer():
+        return str(int(round(value)))
+    text = f"{value:.{digits}g}"
+    if "e" in text:
+        text = f"{value:.{digits}f}".rstrip("0").rstrip(".")
+    return text
+
+
+def _is_table_line(line: str) -> bool:
+    return "," in line and not line.startswith("#")
+
+
+def _field_count(line: str) -> int:
+    """Number of CSV fields in a line (quoted cells such as "Officer, Director" count once)"""
+    return len(next(csv.reader([line]), []))
+
+
+def _split_table(output: str):
+    """Split an output into (lines before, CSV table lines, lines after); table may be empty"""
+    lines = output.splitlines()
+    # The header row is the first comma line followed by a row with as many fields
+    start = next(
+        (
+            i for i in range(len(lines) - 1)
+            if _is_table_line(lines[i]) and _field_count(lines[i]) == _field_count(lines[i + 1])
+        ),
+        None,
+    )
+    if start is None:
+        return lines, [], []
+    end = start
+    while end < len(lines) and _is_table_line(lines[end]):
+        end += 1
+    return lines[:start], lines[start:end], lines[end:]
+
+
+def _read_table(table_lines: List[str]) -> Optional[pd.DataFrame]:
+    try:
+        return pd.read_csv(io.StringIO("\n".join(table_lines)))
+    except Exception:
+        return None
+
+
+def _render_table(frame: pd.DataFrame, digits: int) -> List[str]:
+    """Compact CSV lines: numbers rounded to ``digits`` significant digits, dates without time"""
+    columns = [str(column) for column in frame.columns]
+    cells = []
+    for column in frame.columns:
+        series = frame[column]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            cells.append([format_number(value, digits) for value in series.tolist()])
+        else:
+            cells.append(["" if pd.isna(value) else _compact_text(value) for value in series.tolist()])
+    return [",".join(columns)] + [",".join(row) for row in zip(*cells)]
+
+
+def _compact_text(value) -> str:
+    text = str(value)
+    # "2024-07-03 00:00:00-04:00" -> "2024-07-03"
+    if len(text) > 10 and text[4:5] == "-" and text[7:8] == "-" and text[10:11] in (" ", "T"):
+        if text[11:19] == "00:00:00":
+            return text[:10]
+    return text.replace(",", ";")
+
+
+def _date_column(frame: pd.DataFrame) -> Optional[str]:
+    """First column that parses as dates (the time axis of price/insider tables)"""
+    for column in frame.columns[:2]:
+        if frame[column].dtype != object:
+            continue
+        parsed = pd.to_datetime(frame[column].astype(str).str[:10], errors="coerce", format="%Y-%m-%d")
+        if len(parsed) and parsed.notna().all():
+            return column
+    return None
+
+
+def _summary_lines(frame: pd.DataFrame, date_column: str, digits: int) -> List[str]:
+    """Close/Volume (or every numeric column): first -> last (change), low and high over the table"""
+    numeric = [c for c in frame.columns if c != date_column and pd.api.types.is_numeric_dtype(frame[c])]
+    if any(str(c).lower() == "close" for c in numeric):
+        numeric = [c for c in numeric if str(c).lower() in ("close", "adj close", "volume")]
+    if len(frame) < 2 or not numeric:
+        return []
+    ordered = frame.sort_values(date_column)
+    lines = [f"# Summary over {len(frame)} rows ({_compact_text(ordered[date_column].iloc[0])} to "
+             f"{_compact_text(ordered[date_column].iloc[-1])}):"]
+    for column in numeric:
+        values = ordered[column].dropna()
+        if values.empty:
+            continue
+        first, last = values.iloc[0], values.iloc[-1]
+        change = f" ({(last / first - 1) * 100:+.2f}%)" if first else ""
+        lines.append(
+            f"# {column}: {format_number(first, digits)} -> {format_number(last, digits)}{change}, "
+            f"low {format_number(values.min(), digits)}, high {format_number(values.max(), digits)}"
+        )
+    return lines
+
+
+def _fit_budget(head: List[str], rows: List[str], tail: List[str], budget: int, keep: str, unit: str) -> List[str]:
+    """
+    Drop table rows until the output fits ``budget`` tokens
+
+    Args:
+        head: Lines kept before the rows (headers, column names)
+        rows: Droppable rows in output order
+        tail: Lines kept after the rows (summaries, descriptions)
+        budget: Token budget for the whole output (<= 0 disables trimming)
+        keep: "first" keeps the leading rows, "last" the trailing ones
+        unit: What the dropped rows are, for the omission note
+    """
+    if budget <= 0:
+        return head + rows + tail
+    fixed = estimate_tokens("\n".join(head + tail)) + 12
+    kept: List[str] = []
+    used = fixed
+    ordered = rows if keep == "first" else rows[::-1]
+    for row in ordered:
+        cost = estimate_tokens(row) + 1
+        if used + cost > budget and kept:
+            break
+        kept.append(row)
+        used += cost
+    omitted = len(rows) - len(kept)
+    if not omitted:
+        return head + rows + tail
+    note = f"# ... {omitted} {unit} omitted to fit the token budget"
+    if keep == "first":
+        return head + kept + [note] + tail
+    return head + [note] + kept[::-1] + tail
+
+
+def encode_table_output(output: str, settings: Dict, summary: bool = False) -> str:
+    """
+    Re-render the first CSV table of an output compactly
+
+    Columns that are empty or all zero (e.g. Dividends/Stock Splits) and fully empty rows
+    are dropped, numbers are rounded to significant digits and rows are trimmed to the
+    token budget (for time series the most recent dates are kept).
+
+    Args:
+        output: Tool output with a CSV table after optional "#" header lines
+        settings: Encoder settings including the resolved "budget"
+        summary: Append first/last/low/high lines for time series
+    """
+    head, table_lines, tail = _split_table(output)
+    frame = _read_table(table_lines) if table_lines else None
+    if frame is None or frame.empty:
+        return trim_text_output(output, settings)
+
+    digits = settings["significant_digits"]
+    first = frame.columns[0]
+    data_columns = [c for c in frame.columns if c != first]
+    empty_rows = frame[data_columns].isna().all(axis=1) if data_columns else pd.Series(False, index=frame.index)
+    frame = frame[~empty_rows]
+    dropped = [
+        str(c) for c in data_columns
+        if frame[c].isna().all() or (pd.api.types.is_numeric_dtype(frame[c]) and (frame[c].fillna(0) == 0).all())
+    ]
+    frame = frame.drop(columns=dropped)
+    if first.startswith("Unnamed"):
+        frame = frame.rename(columns={first: ""})
+
+    # Drop the "Data retrieved on" timestamp and blank lines around the table
+    head = [line for line in head if line.strip() and not line.startswith("# Data retrieved on")]
+    if dropped:
+        head.append(f"# Omitted empty/zero columns: {', '.join(dropped)}")
+    if empty_rows.any():
+        head.append(f"# Omitted {int(empty_rows.sum())} empty rows")
+
+    rendered = _render_table(frame, digits)
+    date_column = _date_column(frame)
+    summary_lines = _summary_lines(frame, date_column, digits) if summary and date_column else []
+    tail = [line for line in tail if line.strip()]
+    keep, unit = "first", "rows"
+    if date_column is not None:
+        dates = frame[date_column].astype(str).tolist()
+        keep = "first" if dates and dates[0] > dates[-1] else "last"
+        unit = "older rows"
+    lines = _fit_budget(head + [rendered[0]], rendered[1:], summary_lines + tail, settings["budget"], keep, unit)
+    return "\n".join(lines)
+
+
+def encode_price_table(output: str, settings: Dict) -> str:
+    """OHLCV table encoder: compact table plus optional per-column summary statistics"""
+    return encode_table_output(output, settings, summary=settings["summary_stats"])
+
+
+def encode_indicator_window(output: str, settings: Dict) -> str:
+    """
+    Compact a ``date: value`` indicator window
+
+    Weekend/holiday filler lines are dropped, values are rounded and the window is
+    trimmed to the budget keeping the most recent sessions.
+    """
+    lines = output.splitlines()
+    head, rows, tail = [], [], []
+    digits = settings["significant_digits"]
+    dropped = 0
+    for line in lines:
+        match = _WINDOW_LINE.match(line)
+        if match is None:
+            if line.strip():
+                (tail if rows else head).append(line)
+            continue
+        date, value = match.groups()
+        if NOT_TRADING_MARKER in value:
+            if settings["drop_non_trading_days"]:
+                dropped += 1
+                continue
+            value = "N/A (no session)"
+        else:
+            try:
+                value = format_number(float(value), digits)
+            except ValueError:
+                pass
+        rows.append(f"{date}: {value}")
+    if not rows:
+        return trim_text_output(output, settings)
+    if dropped:
+        head.append(f"(trading days only; {dropped} weekend/holiday dates omitted)")
+    return "\n".join(_fit_budget(head, rows, tail, settings["budget"], "first", "older sessions"))
+
+
+def trim_text_output(output: str, settings: Dict) -> str:
+    """Default encoder: keep the output as is, cutting trailing lines beyond the token budget"""
+    budget = settings["budget"]
+    if budget <= 0 or estimate_tokens(output) <= budget:
+        return output
+    lines = output.splitlines()
+    return "\n".join(_fit_budget([], lines, [], budget, "first", "lines"))
+
+
+# Encoders by routed method; unlisted methods use trim_text_output
+_ENCODERS: Dict[str, Encoder] = {
+    "get_stock_data": encode_price_table,
+    "get_indicators": encode_indicator_window,
+    "get_indicators_batch": encode_table_output,
+    "get_balance_sheet": encode_table_output,
+    "get_cashflow": encode_table_output,
+    "get_income_statement": encode_table_output,
+    "get_insider_transactions": encode_table_output,
+}
+
+
+def register_encoder(method: str, encoder: Encoder):
+    """Use ``encoder`` for a routed method's outputs (replaces any previous encoder)"""
+    _ENCODERS[method] = encoder
+
+
+def get_encoder(method: str) -> Encoder:
+    return _ENCODERS.get(method, trim_text_output)
+
+
+class OutputEncoder:
+    """Applies the registered encoders and keeps per-method token counters"""
+
+    def __init__(self, settings: Optional[Dict] = None):
+        """
+        Initialize the encoder
+
+        Args:
+            settings: The ``output_encoding`` config block (defaults for missing keys)
+        """
+        self.settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def budget_for(self, method: str) -> int:
+        return self.settings["token_budgets"].get(method, self.settings["default_token_budget"])
+
+    def encode(self, method: str, output, args: tuple = ()):
+        """
+        Encode one tool output; errors in an encoder fall back to the raw output
+
+        Args:
+            method: Routed method
+            output: Vendor output
+            args: Positional arguments of the call (e.g. the ticker, for encoders that rank content)
+        """
+        if not self.settings["enabled"] or not isinstance(output, str) or not output:
+            return output
+        settings = {**self.settings, "budget": self.budget_for(method), "method": method, "args": args}
+        try:
+            encoded = get_encoder(method)(output, settings)
+        except Exception as e:
+            print(f"[ENCODE] Encoder for {method} failed, passing output through: {e}")
+            encoded = output
+
+        before, after = estimate_tokens(output), estimate_tokens(encoded)
+        with self._lock:
+            counters = self._counters.setdefault(method, {"calls": 0, "tokens_in": 0, "tokens_out": 0})
+            counters["calls"] += 1
+            counters["tokens_in"] += before
+            counters["tokens_out"] += after
+        return encoded
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of the per-method counters"""
+        with self._lock:
+            return {method: dict(counters) for method, counters in self._counters.items()}
+
+    def report_since(self, snapshot: Dict[str, Dict[str, int]]) -> Dict:
+        """
+        Tokens saved per method since ``snapshot`` was taken
+
+        Returns:
+            {"methods": {method: {calls, tokens_in, tokens_out, saved}}, "tokens_in",
+            "tokens_out", "saved", "saved_ratio"}
+        """
+        methods = {}
+        for method, counters in self.snapshot().items():
+            base = snapshot.get(method, {})
+            delta = {key: value - base.get(key, 0) for key, value in counters.items()}
+            if delta["calls"]:
+                delta["saved"] = delta["tokens_in"] - delta["tokens_out"]
+                methods[method] = delta
+        tokens_in = sum(m["tokens_in"] for m in methods.values())
+        tokens_out = sum(m["tokens_out"] for m in methods.values())
+        return {
+            "methods": methods,
+            "tokens_in": tokens_in,
+            "tokens_out": tokens_out,
+            "saved": tokens_in - tokens_out,
+            "saved_ratio": round((tokens_in - tokens_out) / tokens_in, 3) if tokens_in else 0.0,
+        }
+
+
+# Global encoder (counters live for the whole process)
+_global_encoder: Optional[OutputEncoder] = None
+_global_encoder_lock = threading.Lock()
+# Config version the encoder settings were read from
+_global_encoder_version = -1
+
+
+def get_output_encoder() -> OutputEncoder:
+    """Get or create the output encoder for the current configuration"""
+    global _global_encoder, _global_encoder_version
+
+    version = get_config_version()
+    if _global_encoder_version == version:
+        return _global_encoder
+
+    settings = get_config().get("output_encoding", {})
+    with _global_encoder_lock:
+        previous = _global_encoder
+        _global_encoder = OutputEncoder(settings)
+        if previous is not None:
+            # Keep the counters across config changes
+            _global_encoder._counters = previous.snapshot()
+        _global_encoder_version = version
+    return _global_encoder
+
+
+def encode_tool_output(method: str, output, args: tuple = ()):
+    """Encode a routed tool output with the current configuration"""
+    return get_output_encoder().encode(method, output, args)
+
+
+def format_encoding_report(report: Dict) -> str:
+    """One-line summary of a report_since() result"""
+    parts = [
+        f"{method} -{counters['saved']}"
+        for method, counters in sorted(report["methods"].items(), key=lambda item: -item[1]["saved"])
+        if counters["saved"]
+    ]
+    return (
+        f"[ENCODE] Tool outputs {report['tokens_in']} -> {report['tokens_out']} tokens "
+        f"(saved {report['saved']}, {report['saved_ratio']:.0%})"
+        + (f": {', '.join(parts)}" if parts else "")
+    )
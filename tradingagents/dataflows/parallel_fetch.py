@@ -4,11 +4,15 @@ This module provides concurrent data fetching capabilities to speed up analysis.
 """
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Callable, Any, Dict
+from contextvars import copy_context
+from functools import partial
+from typing import List, Callable, Any, Dict, Optional
 import time
 
+from .deadline import deadline_scope
 
-def fetch_parallel(tasks: List[Dict[str, Any]], max_workers: int = 5) -> Dict[str, Any]:
+
+def fetch_parallel(tasks: List[Dict[str, Any]], max_workers: int = 5, deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
     """
     Execute multiple data fetching tasks in parallel using ThreadPoolExecutor.
     
@@ -22,6 +26,8 @@ def fetch_parallel(tasks: List[Dict[str, Any]], max_workers: int = 5) -> Dict[st
             - 'args': tuple - Positional arguments
             - 'kwargs': dict - Keyword arguments (optional)
         max_workers: Maximum number of parallel workers (default: 5)
+        deadline_seconds: Optional time budget shared by all tasks; workers also inherit
+            the caller's deadline (see deadline.py)
     
     Returns:
         Dictionary mapping task names to their results
@@ -60,8 +66,9 @@ def fetch_parallel(tasks: List[Dict[str, Any]], max_workers: int = 5) -> Dict[st
     
     # Execute tasks in parallel
     start_total = time.time()
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(execute_task, task) for task in tasks]
+    with deadline_scope(deadline_seconds, "fetch_parallel"), ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each worker runs in a copy of the caller's context, so it sees the same deadline
+        futures = [executor.submit(copy_context().run, execute_task, task) for task in tasks]
         
         for future in futures:
             name, result, error = future.result()
@@ -81,15 +88,17 @@ def fetch_parallel(tasks: List[Dict[str, Any]], max_workers: int = 5) -> Dict[st
     return results
 
 
-async def fetch_parallel_async(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+async def fetch_parallel_async(tasks: List[Dict[str, Any]], deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
     """
     Execute multiple data fetching tasks in parallel using asyncio.
     
     This is an async version for use in async contexts. Prefer fetch_parallel()
-    for synchronous code (which is what the agents currently use).
+    for synchronous code (which is what the agents currently use). Coroutine
+    functions such as aroute_to_vendor are awaited directly.
     
     Args:
         tasks: List of task dictionaries (same format as fetch_parallel)
+        deadline_seconds: Optional time budget shared by all tasks
     
     Returns:
         Dictionary mapping task names to their results
@@ -106,9 +115,13 @@ async def fetch_parallel_async(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         
         try:
             start_time = time.time()
-            # Run in executor since most data functions are synchronous
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, func, *args, **kwargs)
+            if asyncio.iscoroutinefunction(func):
+                # Native async data functions (e.g. aroute_to_vendor) need no thread
+                result = await func(*args, **kwargs)
+            else:
+                # Run in executor since most data functions are synchronous
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, partial(copy_context().run, func, *args, **kwargs))
             elapsed = time.time() - start_time
             print(f"[ASYNC] Task '{name}' completed in {elapsed:.2f}s")
             return (name, result, None)
@@ -118,7 +131,8 @@ async def fetch_parallel_async(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     # Execute tasks in parallel
     start_total = time.time()
-    task_results = await asyncio.gather(*[execute_task_async(task) for task in tasks])
+    with deadline_scope(deadline_seconds, "fetch_parallel_async"):
+        task_results = await asyncio.gather(*[execute_task_async(task) for task in tasks])
     
     for name, result, error in task_results:
         if error:
@@ -0,0 +1,141 @@
+"""
+Prefetch stage for TradingAgentsGraph.propagate().
+Analysts discover their data needs one LLM turn at a time, which serializes vendor I/O
+behind LLM latency. Before the graph starts, this module fetches the tool inputs the
+selected analysts predictably ask for, concurrently, into the run-scoped cache so the
+later ToolNode calls are cache hits.
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from .config import get_config
+from .interface import get_routing_plan, route_to_vendor_raw
+from .parallel_fetch import fetch_parallel
+from .vendor_cache import get_run_cache
+from .y_finance import INDICATOR_DESCRIPTIONS, get_prepared_frame
+
+
+def _days_before(trade_date: str, days: int) -> str:
+    """yyyy-mm-dd date ``days`` before ``trade_date``"""
+    return (datetime.strptime(trade_date, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def build_prefetch_calls(ticker: str, trade_date: str, selected_analysts: List[str]) -> List[Tuple[str, tuple]]:
+    """
+    List the (method, args) tool calls the selected analysts are expected to make
+
+    Arguments mirror the tool wrappers' positional order and defaults so that the
+    prefetched entries share cache keys with the analysts' own calls. The market
+    analyst's get_indicators_batch call names its own indicator list, so it is not
+    listed here; warm_indicator_frame() prepares its inputs instead.
+    """
+    prefetch_config = get_config().get("prefetch", {})
+    news_start = _days_before(trade_date, prefetch_config.get("news_look_back_days", 7))
+
+    calls = []
+    if "market" in selected_analysts:
+        stock_start = _days_before(trade_date, prefetch_config.get("stock_look_back_days", 30))
+        calls.append(("get_stock_data", (ticker, stock_start, trade_date)))
+    if "social" in selected_analysts or "news" in selected_analysts:
+        calls.append(("get_news", (ticker, news_start, trade_date)))
+    if "news" in selected_analysts:
+        calls.append((
+            "get_global_news",
+            (
+                trade_date,
+                prefetch_config.get("global_news_look_back_days", 7),
+                prefetch_config.get("global_news_limit", 5),
+            ),
+        ))
+        calls.append(("get_insider_sentiment", (ticker, trade_date)))
+        calls.append(("get_insider_transactions", (ticker, trade_date)))
+    if "fundamentals" in selected_analysts:
+        calls.append(("get_fundamentals", (ticker, trade_date)))
+        calls.extend(
+            (method, (ticker, "quarterly", trade_date))
+            for method in ("get_balance_sheet", "get_cashflow", "get_income_statement")
+        )
+    return calls
+
+
+def indicator_frame_is_routed() -> bool:
+    """Whether get_indicators_batch is served from the prepared yfinance frame under the current config"""
+    return "yfinance" in get_routing_plan("get_indicators_batch").primary_vendors
+
+
+def warm_indicator_frame(ticker: str) -> int:
+    """
+    Load the prepared price frame and memoize every indicator column on it
+
+    Whichever subset the market analyst then passes to get_indicators_batch is
+    rendered from memory without another price download. Only scheduled when
+    indicator_frame_is_routed(); other vendors never read this frame.
+
+    Returns:
+        Number of indicator columns memoized on the frame
+    """
+    frame = get_prepared_frame(ticker)
+    for indicator in INDICATOR_DESCRIPTIONS:
+        frame.indicator(indicator)
+    return len(frame.memoized())
+
+
+def prefetch_analyst_data(ticker: str, trade_date: str, selected_analysts: List[str]) -> Dict:
+    """
+    Warm the run-scoped cache for one propagate() call
+
+    The caller must have opened the run cache (get_run_cache().open()).
+
+    Returns:
+        Report dict with the number of calls, successes and prefetch duration
+    """
+    trade_date = str(trade_date)
+    prefetch_config = get_config().get("prefetch", {})
+    max_workers = prefetch_config.get("max_workers", 8)
+    calls = build_prefetch_calls(ticker, trade_date, selected_analysts)
+
+    tasks = [
+        {"name": f"{method}{list(args)}", "func": route_to_vendor_raw, "args": (method, *args)}
+        for method, args in calls
+    ]
+    if "market" in selected_analysts and indicator_frame_is_routed():
+        tasks.append({"name": "indicator_frame", "func": warm_indicator_frame, "args": (ticker,)})
+
+    print(f"[PREFETCH] Warming {len(calls)} tool calls for {ticker} on {trade_date} ({', '.join(selected_analysts)})")
+    start = time.time()
+    results = fetch_parallel(tasks, max_workers=max_workers, deadline_seconds=prefetch_config.get("deadline_seconds"))
+    duration = time.time() - start
+
+    succeeded = sum(
+        1 for name, result in results.items()
+        if result is not None and name != "indicator_frame"
+    )
+
+    return {
+        "calls": len(calls),
+        "succeeded": succeeded,
+        "indicators_memoized": results.get("indicator_frame") or 0,
+        "duration_s": round(duration, 2),
+        "run_cache_before_graph": get_run_cache().stats(),
+    }
+
+
+def finish_prefetch_report(report: Dict) -> Dict:
+    """Add the graph-phase run-cache hit ratio to a prefetch report and print it"""
+    before = report.pop("run_cache_before_graph")
+    after = get_run_cache().stats()
+    hits = after["hits"] - before["hits"]
+    misses = after["misses"] - before["misses"]
+    lookups = hits + misses
+    report.update({
+        "tool_calls": lookups,
+        "cache_hits": hits,
+        "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+    })
+    print(
+        f"[PREFETCH] Prefetched {report['succeeded']}/{report['calls']} calls in {report['duration_s']:.2f}s; "
+        f"{hits}/{lookups} analyst tool calls served from prefetch "
+        f"(hit ratio {report['hit_ratio']:.0%})"
+    )
+    return report
@@ -0,0 +1,275 @@
+"""
+Process-wide LRU of prepared per-symbol price frames for the indicator tools.
+Every indicator call used to re-read the price history, re-parse dates and re-wrap it
+with stockstats. Prepared frames are kept in memory keyed by symbol and data version,
+with the derived indicator columns and date strings memoized on the frame, and the
+least recently used frames are evicted once the cache exceeds its byte budget.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from stockstats import wrap
+
+from .config import get_config, get_config_version
+from .indicator_engine import SUPPORTED_INDICATORS, compute_indicators
+from .price_store import get_price_store
+
+
+class PreparedFrame:
+    """A symbol's price history plus everything derived from it so far"""
+
+    def __init__(self, symbol: str, version: str, prices: pd.DataFrame):
+        """
+        Initialize the prepared frame
+
+        Args:
+            symbol: Ticker symbol (or local file label)
+            version: Data version the prices were loaded at
+            prices: Date-indexed OHLCV frame, sorted by date
+        """
+        self.symbol = symbol
+        self.version = version
+        self.prices = prices
+        self.dates = pd.DatetimeIndex(prices.index)
+        self.date_strings = np.asarray(self.dates.strftime("%Y-%m-%d"), dtype=object)
+        # Sorted epoch-ns session dates: the trading calendar, searched by bisection
+        self._sessions = self.dates.normalize().asi8
+        self._indicators: Dict[str, np.ndarray] = {}
+        self._stockstats = None
+        self._stockstats_bytes = 0
+        self._lock = threading.Lock()
+        self.nbytes = int(prices.memory_usage(index=True).sum()) + sum(len(d) + 49 for d in self.date_strings)
+        # Called after memoized columns grow the frame (the owning cache re-applies its budget)
+        self.on_grow: Optional[Callable[[], None]] = None
+
+    def position(self, date) -> Optional[int]:
+        """Row of ``date`` in O(log n), or None if it is not a trading session in the data"""
+        target = pd.Timestamp(date).normalize().value
+        row = int(np.searchsorted(self._sessions, target, side="left"))
+        if row < len(self._sessions) and self._sessions[row] == target:
+            return row
+        return None
+
+    def window(self, start, end) -> slice:
+        """Rows of the sessions with ``start <= date <= end`` (inclusive), found by bisection"""
+        first = np.searchsorted(self._sessions, pd.Timestamp(start).normalize().value, side="left")
+        last = np.searchsorted(self._sessions, pd.Timestamp(end).normalize().value, side="right")
+        return slice(int(first), int(max(first, last)))
+
+    def indicators(self, names: Iterable[str]) -> pd.DataFrame:
+        """Engine-supported indicator columns, computing only the ones not memoized yet"""
+        names = list(names)
+        with self._lock:
+            missing = [name for name in names if name not in self._indicators]
+            if missing:
+                computed = compute_indicators(self.prices, missing)
+                for name in missing:
+                    column = computed[name].to_numpy()
+                    self._indicators[name] = column
+                    self.nbytes += column.nbytes
+            result = pd.DataFrame({name: self._indicators[name] for name in names}, index=self.dates)
+        if missing:
+            self._grown()
+        return result
+
+    def indicator(self, name: str) -> np.ndarray:
+        """One indicator column; stockstats-only indicators are computed on a memoized wrap"""
+        if name in SUPPORTED_INDICATORS:
+            return self.indicators([name])[name].to_numpy()
+        with self._lock:
+            column = self._indicators.get(name)
+            if column is None:
+                if self._stockstats is None:
+                    self._stockstats = wrap(self.prices.reset_index())
+                column = self._stockstats[name].to_numpy(dtype=float)
+                self._indicators[name] = column
+                # The wrap is a full copy of the prices plus every intermediate column stockstats adds
+                wrap_bytes = int(self._stockstats.memory_usage(index=True).sum())
+                self.nbytes += column.nbytes + wrap_bytes - self._stockstats_bytes
+                self._stockstats_bytes = wrap_bytes
+                grown = True
+            else:
+                grown = False
+        if grown:
+            self._grown()
+        return column
+
+    def _grown(self):
+        if self.on_grow is not None:
+            self.on_grow()
+
+    def memoized(self) -> List[str]:
+        """Indicator columns computed so far"""
+        with self._lock:
+            return sorted(self._indicators)
+
+
+class PriceFrameCache:
+    """LRU of PreparedFrame objects bounded by their approximate memory footprint"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Evict least recently used frames beyond this total size
+        """
+        self.max_bytes = max_bytes
+        self._frames: "OrderedDict[str, PreparedFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, version: str, loader: Callable[[], pd.DataFrame]) -> PreparedFrame:
+        """
+        Prepared frame for ``key`` at ``version``, loading it on a miss
+
+        A newer version replaces the cached frame; concurrent misses for one key
+        share a single load.
+        """
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None and frame.version == version:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return frame
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                frame = self._frames.get(key)
+                if frame is not None and frame.version == version:
+                    self._frames.move_to_end(key)
+                    self.hits += 1
+                    return frame
+                self.misses += 1
+            try:
+                frame = PreparedFrame(key, version, loader())
+                frame.on_grow = self.trim
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            with self._lock:
+                self._frames[key] = frame
+                self._frames.move_to_end(key)
+                self._evict_locked()
+        return frame
+
+    def _evict_locked(self):
+        """Drop least recently used frames until the cache fits its budget (keeps the newest)"""
+        total = sum(frame.nbytes for frame in self._frames.values())
+        while total > self.max_bytes and len(self._frames) > 1:
+            _, frame = self._frames.popitem(last=False)
+            total -= frame.nbytes
+            self.evictions += 1
+
+    def trim(self):
+        """Re-apply the byte budget (called by the frames when memoized indicators grow them)"""
+        with self._lock:
+            self._evict_locked()
+
+    def clear(self, symbol: Optional[str] = None) -> int:
+        """Drop all frames, or only those of ``symbol``; returns the number removed"""
+        with self._lock:
+            keys = [k for k in self._frames if symbol is None or k == symbol.upper()]
+            for key in keys:
+                del self._frames[key]
+            return len(keys)
+
+    def entries(self) -> List[Dict]:
+        """Cached frames from least to most recently used"""
+        with self._lock:
+            frames = list(self._frames.values())
+        return [
+            {
+                "symbol": frame.symbol,
+                "version": frame.version,
+                "rows": len(frame.prices),
+                "bytes": frame.nbytes,
+                "indicators": frame.memoized(),
+            }
+            for frame in frames
+        ]
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "frames": len(self._frames),
+                "bytes": sum(frame.nbytes for frame in self._frames.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Global frame cache (shared by every graph in the process)
+_global_frame_cache: Optional[PriceFrameCache] = None
+_global_frame_cache_lock = threading.Lock()
+# Config version the cache budget was read from
+_global_frame_cache_version = -1
+
+
+def get_price_frame_cache() -> PriceFrameCache:
+    """Get or create the global prepared-frame cache for the current configuration"""
+    global _global_frame_cache, _global_frame_cache_version
+
+    version = get_config_version()
+    if _global_frame_cache_version == version:
+        return _global_frame_cache
+
+    max_bytes = get_config().get("price_store", {}).get("frame_cache_max_bytes", 256 * 1024 * 1024)
+    with _global_frame_cache_lock:
+        if _global_frame_cache is None:
+            _global_frame_cache = PriceFrameCache(max_bytes)
+        else:
+            _global_frame_cache.max_bytes = max_bytes
+            _global_frame_cache.trim()
+        _global_frame_cache_version = version
+    return _global_frame_cache
+
+
+def get_prepared_prices(symbol: str) -> PreparedFrame:
+    """Prepared frame for ``symbol`` from the price store, refreshed when its watermark is stale"""
+    symbol = symbol.upper()
+    store = get_price_store()
+    version = store.version(symbol)
+    return get_price_frame_cache().get(symbol, version, lambda: store.load(symbol, refresh=False))
+
+
+def get_prepared_local_prices(path: str) -> PreparedFrame:
+    """
+    Prepared frame for a local OHLCV CSV (``Date`` column), keyed by path and mtime
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    version = str(os.path.getmtime(path))
+
+    def load():
+        data = pd.read_csv(path)
+        dates = pd.to_datetime(data["Date"]).dt.normalize().rename("Date")
+        return data.set_index(dates).drop(columns="Date").sort_index()
+
+    return get_price_frame_cache().get(path, version, load)
+
+
+def get_price_frame_cache_stats() -> Dict:
+    """Current frame cache counters, for display in the CLI/Streamlit"""
+    return get_price_frame_cache().stats()
+
+
+def clear_price_frame_cache(symbol: Optional[str] = None) -> int:
+    """Drop cached prepared frames (all, or one symbol's)"""
+    return get_price_frame_cache().clear(symbol)
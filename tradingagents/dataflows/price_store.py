@@ -0,0 +1,368 @@
+"""
+Incremental per-symbol OHLCV store for the stockstats indicator path.
+Each symbol keeps its daily auto-adjusted history in one Parquet file plus a small
+watermark (last stored session, last refresh date). A refresh downloads only the
+sessions after the watermark instead of the full 15-year history, and files are
+replaced atomically so concurrent readers never see a partial write.
+"""
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+import yfinance as yf
+
+try:
+    import pyarrow  # noqa: F401  Parquet engine
+    _PARQUET = True
+except ImportError:  # Optional dependency: fall back to pickled frames
+    _PARQUET = False
+
+from .config import get_config
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def normalize_prices(data: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Typed, date-indexed, de-duplicated OHLCV frame from a single-symbol download"""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date"), dtype="float64")
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.droplevel(-1, axis=1)
+    frame = data[[c for c in PRICE_COLUMNS if c in data.columns]].astype("float64")
+    index = pd.to_datetime(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.normalize().rename("Date")
+    frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+    return frame.dropna(subset=["Close"])
+
+
+class FixtureDownloader:
+    """
+    Offline stand-in for ``yf.download`` that replays a recorded price file
+
+    The fixture is a long-format CSV or Parquet file with Date, Ticker, Open, High, Low,
+    Close and Volume columns (see universe.record_universe_fixture). Tickers missing
+    from the fixture come back without columns, like failed symbols in a live download.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        data = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+        data["Date"] = pd.to_datetime(data["Date"]).dt.normalize()
+        data["Ticker"] = data["Ticker"].str.upper()
+        self._frames = {
+            ticker: group.drop(columns="Ticker").set_index("Date").sort_index()
+            for ticker, group in data.groupby("Ticker")
+        }
+        self.calls = 0
+
+    def __call__(self, tickers, start=None, end=None, group_by="column", multi_level_index=True, **kwargs):
+        self.calls += 1
+        single = isinstance(tickers, str) and len(tickers.replace(",", " ").split()) == 1
+        symbols = tickers.replace(",", " ").split() if isinstance(tickers, str) else list(tickers)
+        parts = {}
+        for symbol in (s.upper() for s in symbols):
+            frame = self._frames.get(symbol)
+            if frame is None:
+                continue
+            if start is not None:
+                frame = frame[frame.index >= pd.Timestamp(start)]
+            if end is not None:
+                frame = frame[frame.index < pd.Timestamp(end)]
+            parts[symbol] = frame[[c for c in PRICE_COLUMNS if c in frame.columns]]
+
+        if single and not multi_level_index:
+            return next(iter(parts.values()), pd.DataFrame())
+        if not parts:
+            return pd.DataFrame()
+        data = pd.concat(parts, axis=1)  # (ticker, field) columns
+        return data if group_by == "ticker" else data.swaplevel(axis=1).sort_index(axis=1)
+
+
+class PriceStore:
+    """
+    Date-indexed daily price history, one file per symbol
+
+    A refresh re-downloads a few sessions before the watermark and compares them with
+    the stored bars. Auto-adjusted prices are rebased after every dividend or split,
+    so a mismatch means the stored history is stale and the symbol is re-downloaded
+    in full; otherwise only the new sessions are appended.
+    """
+
+    def __init__(self, root: str, history_years: int = 15, overlap_days: int = 7,
+                 refresh_interval_hours: float = 12.0, download: Optional[Callable] = None):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding the per-symbol files
+            history_years: Depth of the initial download
+            overlap_days: Calendar days re-fetched before the watermark to detect rebasing
+            refresh_interval_hours: Minimum time between refreshes of one symbol
+            download: ``yf.download``-compatible callable (default: yfinance; see FixtureDownloader)
+        """
+        self.root = root
+        self.history_years = history_years
+        self.overlap_days = overlap_days
+        self.refresh_interval_hours = refresh_interval_hours
+        self.download = download
+        self._ext = "parquet" if _PARQUET else "pkl"
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        # Counters
+        self.full_downloads = 0
+        self.incremental_downloads = 0
+        self.rows_appended = 0
+
+    def _lock_for(self, symbol: str) -> threading.Lock:
+        """Per-symbol lock so concurrent indicator calls share one download"""
+        with self._locks_lock:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _data_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol}.{self._ext}")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol}.json")
+
+    def _read_meta(self, symbol: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path(symbol), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_frame(self, symbol: str) -> Optional[pd.DataFrame]:
+        path = self._data_path(symbol)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path) if _PARQUET else pd.read_pickle(path)
+        except Exception as e:
+            print(f"[PRICE_STORE] Unreadable store file for {symbol}, re-downloading: {e}")
+            return None
+
+    def _atomic_write(self, path: str, write):
+        """Write to a temporary file in the same directory, then rename over ``path``"""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _write(self, symbol: str, frame: pd.DataFrame):
+        """Persist the frame, then the watermark (a crash between the two only costs a refresh)"""
+        if _PARQUET:
+            self._atomic_write(self._data_path(symbol), lambda p: frame.to_parquet(p))
+        else:
+            self._atomic_write(self._data_path(symbol), lambda p: frame.to_pickle(p))
+
+        meta = {
+            "symbol": symbol,
+            "first_session": frame.index[0].strftime("%Y-%m-%d") if len(frame) else None,
+            "last_session": frame.index[-1].strftime("%Y-%m-%d") if len(frame) else None,
+            "rows": len(frame),
+            "updated_at": datetime.now().isoformat(),  # Microseconds: part of the data version
+        }
+
+        def write_meta(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        self._atomic_write(self._meta_path(symbol), write_meta)
+
+    def _download(self, symbol: str, start: pd.Timestamp) -> pd.DataFrame:
+        """Download daily bars from ``start`` through today (yfinance's end is exclusive)"""
+        end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        data = (self.download or yf.download)(
+            symbol,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+        return normalize_prices(data)
+
+    def _is_fresh(self, meta: Optional[Dict]) -> bool:
+        if not meta or not meta.get("updated_at"):
+            return False
+        age = datetime.now() - datetime.fromisoformat(meta["updated_at"])
+        return age.total_seconds() < self.refresh_interval_hours * 3600
+
+    def full_history_start(self) -> pd.Timestamp:
+        """First date of a full-history download"""
+        return pd.Timestamp.today().normalize() - pd.DateOffset(years=self.history_years)
+
+    def refresh_start(self, last_session: pd.Timestamp) -> pd.Timestamp:
+        """First date of an incremental download (re-fetches the overlap used to detect rebasing)"""
+        return pd.Timestamp(last_session) - pd.Timedelta(days=self.overlap_days)
+
+    def _full_refresh(self, symbol: str) -> pd.DataFrame:
+        frame = self._download(symbol, self.full_history_start())
+        self.full_downloads += 1
+        print(f"[PRICE_STORE] {symbol}: downloaded {len(frame)} sessions (full history)")
+        return frame
+
+    def _merge(self, symbol: str, stored: pd.DataFrame, delta: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Append a downloaded delta; None if the overlap shows the adjusted history was rebased"""
+        if delta.empty:
+            return stored
+        watermark = stored.index[-1]
+
+        overlap = delta.index.intersection(stored.index)
+        if len(overlap):
+            old_close = stored.loc[overlap, "Close"]
+            new_close = delta.loc[overlap, "Close"]
+            # Only the last stored bar may legitimately change (it can be an intraday snapshot)
+            settled = overlap[overlap < watermark]
+            drift = ((new_close[settled] - old_close[settled]).abs() / old_close[settled].abs()).max()
+            if len(settled) and drift > 1e-4:
+                print(f"[PRICE_STORE] {symbol}: adjusted history changed (dividend/split), re-downloading")
+                return None
+
+        new_rows = delta.index.difference(stored.index)
+        frame = pd.concat([stored[stored.index < delta.index[0]], delta])
+        self.rows_appended += len(new_rows)
+        if len(new_rows):
+            print(f"[PRICE_STORE] {symbol}: appended {len(new_rows)} new session(s) after {watermark.strftime('%Y-%m-%d')}")
+        return frame
+
+    def _incremental_refresh(self, symbol: str, stored: pd.DataFrame) -> pd.DataFrame:
+        delta = self._download(symbol, self.refresh_start(stored.index[-1]))
+        self.incremental_downloads += 1
+        frame = self._merge(symbol, stored, delta)
+        return frame if frame is not None else self._full_refresh(symbol)
+
+    def _refresh_locked(self, symbol: str, stored: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """Fetch sessions newer than the watermark and persist the result (caller holds the symbol lock)"""
+        if stored is None or stored.empty:
+            frame = self._full_refresh(symbol)
+        else:
+            frame = self._incremental_refresh(symbol, stored)
+
+        if frame.empty:
+            # Nothing downloaded: keep what we have and do not record a refresh
+            return stored if stored is not None else frame
+        self._write(symbol, frame)
+        return frame
+
+    def load(self, symbol: str, refresh: bool = True) -> pd.DataFrame:
+        """
+        Load a symbol's daily history, refreshing it first if the watermark is stale
+
+        Args:
+            symbol: Ticker symbol
+            refresh: Whether to fetch sessions newer than the watermark
+
+        Returns:
+            DataFrame indexed by ``Date`` (DatetimeIndex) with float64 Open/High/Low/Close/Volume
+        """
+        symbol = symbol.upper()
+        with self._lock_for(symbol):
+            stored = self._read_frame(symbol)
+            if stored is not None and (not refresh or self._is_fresh(self._read_meta(symbol))):
+                return stored
+            return self._refresh_locked(symbol, stored)
+
+    def version(self, symbol: str) -> str:
+        """
+        Refresh ``symbol`` if its watermark is stale and return its data version
+
+        The version changes whenever the stored history is rewritten, so in-memory
+        copies keyed by it are never served stale. Reads only the watermark when fresh.
+        """
+        symbol = symbol.upper()
+        with self._lock_for(symbol):
+            meta = self._read_meta(symbol)
+            if not self._is_fresh(meta) or not os.path.exists(self._data_path(symbol)):
+                self._refresh_locked(symbol, self._read_frame(symbol))
+                meta = self._read_meta(symbol)
+        if not meta:
+            return "empty"
+        return f"{meta.get('last_session')}|{meta.get('rows')}|{meta.get('updated_at')}"
+
+    def ingest(self, symbol: str, downloaded: pd.DataFrame, full_history: bool = False) -> bool:
+        """
+        Merge prices downloaded elsewhere (e.g. a batched universe download) into the store
+
+        Args:
+            symbol: Ticker symbol
+            downloaded: Normalized frame from ``refresh_start`` (or the full history) onward
+            full_history: Replace the stored history instead of appending to it
+
+        Returns:
+            False if the symbol needs a full-history download instead (no stored history,
+            or its adjusted prices were rebased); True once the store is up to date
+        """
+        symbol = symbol.upper()
+        with self._lock_for(symbol):
+            if full_history:
+                frame = downloaded
+                self.full_downloads += 1
+            else:
+                stored = self._read_frame(symbol)
+                if stored is None or stored.empty:
+                    return False
+                frame = self._merge(symbol, stored, downloaded)
+                self.incremental_downloads += 1
+                if frame is None:
+                    return False
+            if not frame.empty:
+                self._write(symbol, frame)
+        return True
+
+    def needs_refresh(self, symbol: str) -> bool:
+        """Whether ``symbol`` has no stored history or its watermark is stale"""
+        symbol = symbol.upper()
+        return not self._is_fresh(self._read_meta(symbol)) or not os.path.exists(self._data_path(symbol))
+
+    def watermark(self, symbol: str) -> Optional[Dict]:
+        """Stored range and last refresh time for ``symbol`` (None if never fetched)"""
+        return self._read_meta(symbol.upper())
+
+    def stats(self) -> Dict:
+        """Download counters since process start"""
+        return {
+            "root": self.root,
+            "format": self._ext,
+            "full_downloads": self.full_downloads,
+            "incremental_downloads": self.incremental_downloads,
+            "rows_appended": self.rows_appended,
+        }
+
+
+# Global store instance
+_global_store: Optional[PriceStore] = None
+_global_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Get or create the global price store for the configured data_cache_dir"""
+    global _global_store
+
+    config = get_config()
+    store_config = config.get("price_store", {})
+    root = store_config.get("path") or os.path.join(config["data_cache_dir"], "price_store")
+    fixture_path = store_config.get("fixture_path")
+
+    with _global_store_lock:
+        current_fixture = getattr(_global_store.download, "path", None) if _global_store else None
+        if _global_store is None or _global_store.root != root or current_fixture != fixture_path:
+            _global_store = PriceStore(
+                root,
+                history_years=store_config.get("history_years", 15),
+                overlap_days=store_config.get("overlap_days", 7),
+                refresh_interval_hours=store_config.get("refresh_interval_hours", 12.0),
+                download=FixtureDownloader(fixture_path) if fixture_path else None,
+            )
+    return _global_store
+
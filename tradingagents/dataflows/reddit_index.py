@@ -0,0 +1,291 @@
+"""
+Date-partitioned index of the local Reddit JSONL dumps.
+Looking up one day used to re-read and json-parse every line of every subreddit file,
+and the news tools did that once per day of their window. Each subreddit file is now
+parsed once into a compact columnar table (day, ups, title, selftext, url) sorted by
+day, stored next to the other local caches and rebuilt when the file changes. A range
+query reads only the rows of its window and picks the top posts per day in one pass.
+"""
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  Parquet engine
+    _PARQUET = True
+except ImportError:  # Optional dependency: fall back to pickled frames
+    _PARQUET = False
+
+from .config import get_config
+from .deadline import check_deadline
+
+# Row filter applied to the window's posts (e.g. company mentions): rows -> boolean mask
+PostFilter = Callable[[pd.DataFrame], pd.Series]
+
+_SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _day_number(date: str) -> int:
+    """Days since 1970-01-01 for a yyyy-mm-dd date"""
+    return (datetime.strptime(date, "%Y-%m-%d") - _EPOCH).days
+
+
+def _day_string(day: int) -> str:
+    return datetime.fromtimestamp(int(day) * _SECONDS_PER_DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def parse_subreddit_file(path: str) -> pd.DataFrame:
+    """
+    Parse one subreddit JSONL dump into the indexed columns, sorted by UTC day
+
+    Posts of the same day keep their file order, which breaks upvote ties the same
+    way as the previous line-by-line scan.
+    """
+    days, ups, titles, texts, urls = [], [], [], [], []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            post = json.loads(line)
+            days.append(post["created_utc"])
+            ups.append(post.get("ups", 0))
+            titles.append(post.get("title", ""))
+            texts.append(post.get("selftext", ""))
+            urls.append(post.get("url", ""))
+
+    created = np.asarray(days, dtype="float64")
+    frame = pd.DataFrame({
+        "day": np.floor_divide(created, _SECONDS_PER_DAY).astype("int32"),
+        "ups": np.asarray(ups, dtype="int64") if ups else np.empty(0, dtype="int64"),
+        "title": pd.Series(titles, dtype=object),
+        "selftext": pd.Series(texts, dtype=object),
+        "url": pd.Series(urls, dtype=object),
+    })
+    return frame.sort_values("day", kind="mergesort").reset_index(drop=True)
+
+
+class RedditIndex:
+    """Columnar per-subreddit tables of the Reddit dumps, queried by date range"""
+
+    def __init__(self, root: str):
+        """
+        Initialize the index
+
+        Args:
+            root: Directory holding the indexed tables
+        """
+        self.root = root
+        self._ext = "parquet" if _PARQUET else "pkl"
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        # Counters
+        self.builds = 0
+        self.queries = 0
+
+    def _table_path(self, source: str) -> str:
+        """Indexed table for a JSONL file, named after its absolute path"""
+        digest = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, f"{os.path.basename(source)}.{digest}.{self._ext}")
+
+    def _lock_for(self, source: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(source, threading.Lock())
+
+    @staticmethod
+    def _signature(source: str) -> Dict:
+        stat = os.stat(source)
+        return {"source_size": stat.st_size, "source_mtime": stat.st_mtime}
+
+    def _read_meta(self, table_path: str) -> Optional[Dict]:
+        try:
+            with open(f"{table_path}.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def ensure(self, source: str) -> str:
+        """Build the table for ``source`` if it is missing or older than the file; returns its path"""
+        table_path = self._table_path(source)
+        signature = self._signature(source)
+        meta = self._read_meta(table_path)
+        if meta is not None and all(meta.get(k) == v for k, v in signature.items()):
+            return table_path
+
+        with self._lock_for(source):
+            meta = self._read_meta(table_path)
+            if meta is not None and all(meta.get(k) == v for k, v in signature.items()):
+                return table_path
+
+            start = datetime.now()
+            frame = parse_subreddit_file(source)
+            tmp_path = f"{table_path}.{os.getpid()}.tmp"
+            if _PARQUET:
+                # Small row groups let day-range reads skip most of a large file
+                frame.to_parquet(tmp_path, index=False, row_group_size=50_000)
+            else:
+                frame.to_pickle(tmp_path)
+            os.replace(tmp_path, table_path)
+            with open(f"{table_path}.json.tmp", "w", encoding="utf-8") as f:
+                json.dump({"source": source, **signature, "rows": len(frame)}, f)
+            os.replace(f"{table_path}.json.tmp", f"{table_path}.json")
+            self.builds += 1
+            print(
+                f"[REDDIT_INDEX] Indexed {os.path.basename(source)}: {len(frame)} posts "
+                f"in {(datetime.now() - start).total_seconds():.1f}s"
+            )
+        return table_path
+
+    def read_window(self, source: str, start_day: int, end_day: int) -> pd.DataFrame:
+        """Posts of ``source`` dated ``start_day <= day <= end_day``, in index order"""
+        table_path = self.ensure(source)
+        if _PARQUET:
+            return pd.read_parquet(table_path, filters=[("day", ">=", start_day), ("day", "<=", end_day)])
+        frame = pd.read_pickle(table_path)
+        days = frame["day"].to_numpy()
+        lo, hi = np.searchsorted(days, start_day, side="left"), np.searchsorted(days, end_day, side="right")
+        return frame.iloc[lo:hi]
+
+    def _category_files(self, category_path: str, max_limit: int) -> Optional[Tuple[List[str], int]]:
+        """Subreddit files of a category and the per-subreddit limit, or None if there are none"""
+        if not os.path.exists(category_path):
+            print(f"[INFO] Reddit data directory not found: {category_path}")
+            return None
+
+        jsonl_files = [f for f in os.listdir(category_path) if f.endswith('.jsonl')]
+        if len(jsonl_files) == 0:
+            print(f"[INFO] No .jsonl files found in: {category_path}")
+            return None
+
+        if max_limit < len(jsonl_files):
+            raise ValueError(
+                "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+            )
+        return jsonl_files, max_limit // len(jsonl_files)
+
+    @staticmethod
+    def _top_per_group(rows: pd.DataFrame, keys: List[str], limit: int) -> pd.DataFrame:
+        # Stable sort: upvote ties keep file order, like the per-day sort it replaces
+        rows = rows.sort_values(keys + ["ups"], ascending=[True] * len(keys) + [False], kind="mergesort")
+        return rows.groupby(keys, sort=False).head(limit)
+
+    @staticmethod
+    def _to_posts(window: pd.DataFrame) -> List[Dict]:
+        return [
+            {
+                "title": title,
+                "content": content,
+                "url": url,
+                "upvotes": int(ups),
+                "posted_date": _day_string(day),
+            }
+            for day, ups, title, content, url in zip(
+                window["day"].tolist(), window["ups"].tolist(), window["title"].tolist(),
+                window["selftext"].tolist(), window["url"].tolist(),
+            )
+        ]
+
+    def top_posts(self, category_path: str, start_date: str, end_date: str, max_limit: int,
+                  post_filter: Optional[PostFilter] = None) -> List[Dict]:
+        """
+        Top posts per day and subreddit over a date range, in one pass per subreddit
+
+        Args:
+            category_path: Directory with one .jsonl file per subreddit
+            start_date: First day, yyyy-mm-dd (UTC)
+            end_date: Last day, yyyy-mm-dd, inclusive
+            max_limit: Posts per day across the category, split evenly over the subreddits
+            post_filter: Optional mask over the window's rows (e.g. company mentions)
+
+        Returns:
+            Post dicts (title, content, url, upvotes, posted_date), ordered by day, then
+            subreddit (directory order), then upvotes descending
+
+        Raises:
+            ValueError: If max_limit is smaller than the number of subreddit files
+        """
+        files = self._category_files(category_path, max_limit)
+        if files is None:
+            return []
+        jsonl_files, limit_per_subreddit = files
+
+        self.queries += 1
+        start_day, end_day = _day_number(start_date), _day_number(end_date)
+
+        picked = []
+        for order, data_file in enumerate(jsonl_files):
+            check_deadline()
+            rows = self.read_window(os.path.join(category_path, data_file), start_day, end_day)
+            if post_filter is not None and not rows.empty:
+                rows = rows[post_filter(rows).to_numpy(dtype=bool)]
+            if rows.empty:
+                continue
+            picked.append(self._top_per_group(rows, ["day"], limit_per_subreddit).assign(subreddit=order))
+
+        if not picked:
+            return []
+        return self._to_posts(pd.concat(picked).sort_values(["day", "subreddit"], kind="mergesort"))
+
+    def top_posts_by_key(self, category_path: str, start_date: str, end_date: str, max_limit: int,
+                         keys_of: Callable[[pd.DataFrame], List[Iterable[str]]]) -> Dict[str, List[Dict]]:
+        """
+        top_posts() for many filters at once: every post is assigned its keys in a single
+        pass (e.g. all tickers it mentions) and ranked within each key
+
+        Args:
+            keys_of: Keys of each row of a window (e.g. CompanyMatcher.bucket over the texts)
+
+        Returns:
+            {key: posts as top_posts() would return them for that key's filter}
+        """
+        files = self._category_files(category_path, max_limit)
+        if files is None:
+            return {}
+        jsonl_files, limit_per_subreddit = files
+
+        self.queries += 1
+        start_day, end_day = _day_number(start_date), _day_number(end_date)
+
+        picked = []
+        for order, data_file in enumerate(jsonl_files):
+            check_deadline()
+            rows = self.read_window(os.path.join(category_path, data_file), start_day, end_day)
+            if rows.empty:
+                continue
+            keyed = rows.assign(key=[sorted(keys) for keys in keys_of(rows)]).explode("key").dropna(subset=["key"])
+            if keyed.empty:
+                continue
+            picked.append(self._top_per_group(keyed, ["key", "day"], limit_per_subreddit).assign(subreddit=order))
+
+        if not picked:
+            return {}
+        window = pd.concat(picked).sort_values(["key", "day", "subreddit"], kind="mergesort")
+        return {key: self._to_posts(group) for key, group in window.groupby("key", sort=True)}
+
+    def stats(self) -> Dict:
+        """Build and query counters since process start"""
+        return {"root": self.root, "format": self._ext, "builds": self.builds, "queries": self.queries}
+
+
+# Global index instance
+_global_index: Optional[RedditIndex] = None
+_global_index_lock = threading.Lock()
+
+
+def get_reddit_index() -> RedditIndex:
+    """Get or create the Reddit index under the configured data_cache_dir"""
+    global _global_index
+
+    root = os.path.join(get_config()["data_cache_dir"], "reddit_index")
+    with _global_index_lock:
+        if _global_index is None or _global_index.root != root:
+            _global_index = RedditIndex(root)
+    return _global_index
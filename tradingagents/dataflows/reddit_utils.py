@@ -7,6 +7,9 @@ from typing import Annotated
 import os
 import re
 
+from .company_matcher import get_company_matcher
+from .reddit_index import get_reddit_index
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -49,6 +52,37 @@ ticker_to_company = {
 }
 
 
+def company_filter(query: str):
+    """Row filter for posts whose title or text mentions the company (precompiled matcher)"""
+    matcher = get_company_matcher().for_ticker(query)
+
+    def matches(rows):
+        return matcher.mask(rows["title"], rows["selftext"])
+
+    return matches
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd (inclusive)."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """Top posts of every day in the range, from the date-partitioned index (one pass per subreddit)"""
+    # if is company_news, check that the title or the content has the company's name (query) mentioned
+    post_filter = company_filter(query) if "company" in category and query else None
+    return get_reddit_index().top_posts(
+        os.path.join(data_path, category), start_date, end_date, max_limit, post_filter
+    )
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -61,80 +95,35 @@ def fetch_top_from_category(
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
-
-    all_content = []
-
-    # Check if directory exists and has .jsonl files
-    category_path = os.path.join(base_path, category)
-    if not os.path.exists(category_path):
-        print(f"[INFO] Reddit data directory not found: {category_path}")
-        return []
-    
-    jsonl_files = [f for f in os.listdir(category_path) if f.endswith('.jsonl')]
-    if len(jsonl_files) == 0:
-        print(f"[INFO] No .jsonl files found in: {category_path}")
-        return []
+    return fetch_top_from_category_range(category, date, date, max_limit, query, data_path)
 
-    if max_limit < len(jsonl_files):
-        raise ValueError(
-            "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
-        )
 
-    limit_per_subreddit = max_limit // len(jsonl_files)
-
-    for data_file in jsonl_files:
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
-
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
-
-    return all_content
+def fetch_company_news_by_ticker(
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd (inclusive)."],
+    tickers: Annotated[list, "Tickers to bucket posts for (default: every ticker in the alias table)."] = None,
+    max_limit: Annotated[int, "Maximum number of posts per ticker and day."] = 10,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """
+    Company news posts for many tickers in one pass over the window
+
+    Each post is scanned once for every ticker it mentions; the result per ticker equals
+    fetch_top_from_category_range("company_news", ..., ticker).
+    """
+    matcher = get_company_matcher()
+    wanted = None if tickers is None else {ticker.upper() for ticker in tickers}
+
+    def keys_of(rows):
+        mentioned = [
+            matcher.tickers_in(title) | matcher.tickers_in(text)
+            for title, text in zip(rows["title"].tolist(), rows["selftext"].tolist())
+        ]
+        return mentioned if wanted is None else [keys & wanted for keys in mentioned]
+
+    return get_reddit_index().top_posts_by_key(
+        os.path.join(data_path, "company_news"), start_date, end_date, max_limit, keys_of
+    )
@@ -0,0 +1,299 @@
+"""
+Indexed SimFin fundamentals store for local mode.
+The SimFin bulk CSVs hold every US company in one file per statement and frequency, so
+each lookup used to parse the whole file and both date columns. A one-time ingest
+converts each CSV to one typed Parquet file per ticker, sorted by publish date, and
+lookups become an as-of bisection in that ticker's file. The ingest is redone
+automatically when the source CSV changes (size or mtime).
+"""
+import os
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _PARQUET = True
+except ImportError:  # Optional dependency: fall back to pickled frames
+    _PARQUET = False
+
+from .config import get_config
+
+# Statement directory -> file prefix in the SimFin bulk download
+STATEMENTS = {
+    "balance_sheet": "us-balance",
+    "cash_flow": "us-cashflow",
+    "income_statements": "us-income",
+}
+FREQUENCIES = ("annual", "quarterly")
+DATE_COLUMNS = ("Report Date", "Publish Date")
+
+
+def simfin_source_path(data_dir: str, statement: str, freq: str) -> str:
+    """Path of a SimFin bulk CSV under the local data directory"""
+    return os.path.join(
+        data_dir,
+        "fundamental_data",
+        "simfin_data_all",
+        statement,
+        "companies",
+        "us",
+        f"{STATEMENTS[statement]}-{freq}.csv",
+    )
+
+
+def _file_name(ticker: str) -> str:
+    """File-system safe name for a ticker partition"""
+    return "".join(c if c.isalnum() or c in "-._" else "_" for c in ticker)
+
+
+class SimFinStore:
+    """Ticker-partitioned, publish-date-sorted copies of the SimFin statement CSVs"""
+
+    def __init__(self, root: str, data_dir: str, max_cached_frames: int = 512):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding one sub-directory per statement and frequency
+            data_dir: Local data directory with the SimFin bulk CSVs
+            max_cached_frames: Ticker partitions kept in memory across lookups
+        """
+        self.root = root
+        self.data_dir = data_dir
+        self.max_cached_frames = max_cached_frames
+        self._ext = "parquet" if _PARQUET else "pkl"
+        self._lock = threading.Lock()
+        self._ingest_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._manifests: Dict[Tuple[str, str], Dict] = {}
+        self._frames: "OrderedDict[Tuple[str, str, str], Tuple[str, pd.DataFrame, np.ndarray]]" = OrderedDict()
+
+        # Counters
+        self.ingests = 0
+        self.lookups = 0
+        self.frame_hits = 0
+
+    def _table_dir(self, statement: str, freq: str) -> str:
+        return os.path.join(self.root, f"{statement}-{freq}")
+
+    def _manifest_path(self, statement: str, freq: str) -> str:
+        return os.path.join(self._table_dir(statement, freq), "_manifest.json")
+
+    def _read_manifest(self, statement: str, freq: str) -> Optional[Dict]:
+        try:
+            with open(self._manifest_path(statement, freq), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _source_signature(source: str) -> Optional[Dict]:
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        return {"source_size": stat.st_size, "source_mtime": stat.st_mtime}
+
+    def _is_current(self, manifest: Optional[Dict], source: str) -> bool:
+        """Whether an ingest matches the source CSV (an ingest without its CSV stays usable)"""
+        if not manifest:
+            return False
+        signature = self._source_signature(source)
+        if signature is None:
+            return True
+        return all(manifest.get(key) == value for key, value in signature.items())
+
+    def ingest(self, statement: str, freq: str) -> Dict:
+        """
+        Convert one SimFin CSV into per-ticker files (parsed once, sorted by publish date)
+
+        Returns:
+            The new manifest
+
+        Raises:
+            FileNotFoundError: If the source CSV does not exist
+        """
+        source = simfin_source_path(self.data_dir, statement, freq)
+        signature = self._source_signature(source)
+        if signature is None:
+            raise FileNotFoundError(source)
+
+        start = datetime.now()
+        df = pd.read_csv(source, sep=";")
+        # Parse once at ingest time, as the lookups used to on every call
+        for column in DATE_COLUMNS:
+            df[column] = pd.to_datetime(df[column], utc=True).dt.normalize()
+        # Stable sort keeps the CSV order among equal publish dates
+        df = df.dropna(subset=["Ticker"]).sort_values(["Ticker", "Publish Date"], kind="mergesort")
+
+        table_dir = self._table_dir(statement, freq)
+        os.makedirs(table_dir, exist_ok=True)
+        # Contiguous row ranges per ticker; Parquet partitions are zero-copy slices of one Arrow table
+        tickers = df["Ticker"].to_numpy()
+        bounds = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+        starts, ends = np.r_[0, bounds], np.r_[bounds, len(df)]
+        table = pa.Table.from_pandas(df) if _PARQUET else None
+        files = {}
+        for begin, end in zip(starts.tolist(), ends.tolist()):
+            if begin == end:
+                continue
+            ticker = str(tickers[begin])
+            name = f"{_file_name(ticker)}.{self._ext}"
+            path = os.path.join(table_dir, name)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            if _PARQUET:
+                pq.write_table(table.slice(begin, end - begin), tmp_path)
+            else:
+                df.iloc[begin:end].to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+            files[ticker] = name
+
+        manifest = {
+            "statement": statement,
+            "freq": freq,
+            "source": source,
+            **signature,
+            "rows": len(df),
+            "files": files,
+            "ingested_at": datetime.now().isoformat(),
+        }
+        tmp_path = f"{self._manifest_path(statement, freq)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path(statement, freq))
+
+        with self._lock:
+            self._manifests[(statement, freq)] = manifest
+            for key in [k for k in self._frames if k[:2] == (statement, freq)]:
+                del self._frames[key]
+            self.ingests += 1
+        print(
+            f"[SIMFIN] Ingested {os.path.basename(source)}: {len(df)} rows, {len(files)} tickers "
+            f"in {(datetime.now() - start).total_seconds():.1f}s"
+        )
+        return manifest
+
+    def ingest_all(self) -> List[Dict]:
+        """Ingest every statement/frequency whose source CSV exists"""
+        manifests = []
+        for statement in STATEMENTS:
+            for freq in FREQUENCIES:
+                if os.path.exists(simfin_source_path(self.data_dir, statement, freq)):
+                    manifests.append(self.ingest(statement, freq))
+        return manifests
+
+    def _manifest(self, statement: str, freq: str) -> Dict:
+        """Current manifest, ingesting on first use or after the source CSV changed"""
+        key = (statement, freq)
+        source = simfin_source_path(self.data_dir, statement, freq)
+        with self._lock:
+            manifest = self._manifests.get(key)
+            ingest_lock = self._ingest_locks.setdefault(key, threading.Lock())
+        if self._is_current(manifest, source):
+            return manifest
+
+        with ingest_lock:
+            manifest = self._read_manifest(statement, freq)
+            if not self._is_current(manifest, source):
+                manifest = self.ingest(statement, freq)
+            with self._lock:
+                self._manifests[key] = manifest
+        return manifest
+
+    def _ticker_frame(self, statement: str, freq: str, ticker: str) -> Optional[Tuple[pd.DataFrame, np.ndarray]]:
+        """A ticker's statements and their sorted publish dates (epoch ns), or None"""
+        manifest = self._manifest(statement, freq)
+        name = manifest["files"].get(ticker)
+        if name is None:
+            return None
+
+        key = (statement, freq, ticker)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] == manifest["ingested_at"]:
+                self._frames.move_to_end(key)
+                self.frame_hits += 1
+                return cached[1], cached[2]
+
+        path = os.path.join(self._table_dir(statement, freq), name)
+        frame = pd.read_parquet(path) if _PARQUET else pd.read_pickle(path)
+        publish_dates = frame["Publish Date"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        with self._lock:
+            self._frames[key] = (manifest["ingested_at"], frame, publish_dates)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_cached_frames:
+                self._frames.popitem(last=False)
+        return frame, publish_dates
+
+    def latest(self, statement: str, freq: str, ticker: str, curr_date: str) -> Optional[pd.Series]:
+        """
+        Most recent statement published on or before ``curr_date`` (as-of lookup)
+
+        Args:
+            statement: "balance_sheet", "cash_flow" or "income_statements"
+            freq: "annual" or "quarterly"
+            ticker: Ticker symbol as written in the SimFin files
+            curr_date: Trading date, yyyy-mm-dd
+
+        Returns:
+            The statement row (first one among equal publish dates), or None
+        """
+        with self._lock:
+            self.lookups += 1
+        found = self._ticker_frame(statement, freq, ticker)
+        if found is None:
+            return None
+        frame, publish_dates = found
+        cutoff = pd.to_datetime(curr_date, utc=True).normalize().value
+        row = int(np.searchsorted(publish_dates, cutoff, side="right")) - 1
+        if row < 0:
+            return None
+        row = int(np.searchsorted(publish_dates, publish_dates[row], side="left"))
+        return frame.iloc[row]
+
+    def stats(self) -> Dict:
+        """Ingest and lookup counters since process start"""
+        with self._lock:
+            return {
+                "root": self.root,
+                "format": self._ext,
+                "ingests": self.ingests,
+                "lookups": self.lookups,
+                "frame_hits": self.frame_hits,
+                "cached_frames": len(self._frames),
+            }
+
+
+# Global store instance
+_global_store: Optional[SimFinStore] = None
+_global_store_lock = threading.Lock()
+
+
+def get_simfin_store() -> SimFinStore:
+    """Get or create the SimFin store for the configured data_dir and data_cache_dir"""
+    global _global_store
+
+    config = get_config()
+    store_config = config.get("simfin_store", {})
+    root = store_config.get("path") or os.path.join(config["data_cache_dir"], "simfin_store")
+    data_dir = config["data_dir"]
+
+    with _global_store_lock:
+        if _global_store is None or _global_store.root != root or _global_store.data_dir != data_dir:
+            _global_store = SimFinStore(
+                root,
+                data_dir,
+                max_cached_frames=store_config.get("max_cached_frames", 512),
+            )
+    return _global_store
+
+
+def ingest_simfin_data() -> List[Dict]:
+    """One-time conversion of all local SimFin CSVs into the indexed store"""
+    return get_simfin_store().ingest_all()
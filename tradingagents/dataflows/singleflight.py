@@ -0,0 +1,189 @@
+"""
+Request coalescing (single-flight) for identical in-flight vendor calls.
+When several threads ask for the same method + normalized arguments at the same time
+(e.g. the Social and News analysts both calling get_news, or many graphs calling
+get_global_news for one date), only the first caller hits the vendor and the rest wait
+for its result.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .deadline import wait_event, wait_future
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared future whose leader was cancelled: its waiters retry the call"""
+
+
+class _InFlightCall:
+    """A vendor call currently being executed by a leader thread"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    while it is in flight block and receive the same result or exception.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _InFlightCall] = {}
+        # asyncio futures are loop-bound, so async calls coalesce per event loop
+        self._async_calls: Dict[Tuple[int, str], "asyncio.Future"] = {}
+        self._async_waiters: Dict[Tuple[int, str], int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, method: str, func: Callable[[], Any]) -> Any:
+        """
+        Execute ``func`` once per in-flight ``key``
+
+        Args:
+            key: Identity of the call (method + resolved vendor + normalized args)
+            method: Routed method name, used for per-method metrics
+            func: Zero-argument callable performing the vendor request
+
+        Returns:
+            The leader's result (waiters re-raise the leader's exception on failure)
+
+        Raises:
+            DeadlineExceeded: If a waiter's own deadline passes before the leader finishes
+        """
+        with self._lock:
+            method_stats = self._stats.setdefault(method, {"executed": 0, "coalesced": 0})
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                method_stats["coalesced"] += 1
+                is_leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                method_stats["executed"] += 1
+                is_leader = True
+
+        if not is_leader:
+            # The leader may run under a longer budget (e.g. the prefetch stage)
+            wait_event(call.done)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            if call.waiters:
+                print(f"[SINGLE_FLIGHT] {method}: shared one vendor request with {call.waiters} waiting call(s)")
+            call.done.set()
+
+    async def ado(self, key: str, method: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of ``do`` for coroutines running on one event loop
+
+        Args:
+            key: Identity of the call (method + resolved vendor + normalized args)
+            method: Routed method name, used for per-method metrics
+            func: Zero-argument coroutine function performing the vendor request
+
+        Returns:
+            The leader's result (waiters re-raise the leader's exception on failure;
+            if the leader is cancelled, a waiter takes over and runs ``func`` itself)
+
+        Raises:
+            DeadlineExceeded: If a waiter's own deadline passes before the leader finishes
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        while True:
+            with self._lock:
+                method_stats = self._stats.setdefault(method, {"executed": 0, "coalesced": 0})
+                future = self._async_calls.get(flight_key)
+                if future is not None:
+                    self._async_waiters[flight_key] += 1
+                    method_stats["coalesced"] += 1
+                    is_leader = False
+                else:
+                    future = loop.create_future()
+                    self._async_calls[flight_key] = future
+                    self._async_waiters[flight_key] = 0
+                    method_stats["executed"] += 1
+                    is_leader = True
+
+            if is_leader:
+                return await self._alead(flight_key, method, future, func)
+            try:
+                # Shielded: a waiter giving up (deadline, cancellation) leaves the shared call running
+                return await wait_future(future)
+            except _LeaderCancelled:
+                continue  # The next caller through becomes the leader
+
+    async def _alead(self, flight_key, method: str, future: "asyncio.Future", func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the call as leader and publish its outcome to the waiters"""
+        try:
+            result = await func()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Waiters were not cancelled: let them retry rather than see CancelledError
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._async_calls.pop(flight_key, None)
+                waiters = self._async_waiters.pop(flight_key, 0)
+            if waiters:
+                print(f"[SINGLE_FLIGHT] {method}: shared one vendor request with {waiters} waiting call(s)")
+            elif future.done() and not future.cancelled():
+                future.exception()  # Mark retrieved: nobody else awaits this future
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently executing"""
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Executed vs. coalesced call counts, per method and in total"""
+        with self._lock:
+            per_method = {m: dict(s) for m, s in self._stats.items()}
+        return {
+            "executed": sum(s["executed"] for s in per_method.values()),
+            "coalesced": sum(s["coalesced"] for s in per_method.values()),
+            "methods": per_method,
+        }
+
+    def reset_stats(self):
+        """Clear the counters (in-flight calls are unaffected)"""
+        with self._lock:
+            self._stats.clear()
+
+
+# Global single-flight group (shared by every graph in the process)
+_global_single_flight: Optional[SingleFlight] = None
+_global_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get or create the global single-flight group"""
+    global _global_single_flight
+
+    with _global_single_flight_lock:
+        if _global_single_flight is None:
+            _global_single_flight = SingleFlight()
+    return _global_single_flight
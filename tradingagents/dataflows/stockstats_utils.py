@@ -1,9 +1,8 @@
 import pandas as pd
-import yfinance as yf
-from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config, DATA_DIR
+from .price_frame_cache import get_prepared_prices, get_prepared_local_prices
 
 
 class StockstatsUtils:
@@ -21,62 +20,25 @@ class StockstatsUtils:
         config = get_config()
         online = config["data_vendors"]["technical_indicators"] != "local"
 
-        df = None
-        data = None
-
         if not online:
             try:
-                data = pd.read_csv(
+                frame = get_prepared_local_prices(
                     os.path.join(
                         DATA_DIR,
                         f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                     )
                 )
-                df = wrap(data)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
         else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+            # Prepared frame from the in-process cache (backed by the incremental price store)
+            frame = get_prepared_prices(symbol)
 
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        values = frame.indicator(indicator)  # memoized on the prepared frame
+        row = frame.position(pd.to_datetime(curr_date))  # binary search over the session dates
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
+        if row is not None:
+            indicator_value = values[row]
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
@@ -0,0 +1,243 @@
+"""
+Universe-scale price loading for multi-ticker runs.
+Instead of one yfinance round-trip per symbol, stale symbols are downloaded in batched
+multi-ticker requests, split into the per-symbol price store, and only the symbols that
+came back empty are retried. Works offline against a recorded fixture
+(price_store.fixture_path) so batch runs can be tested without network access.
+"""
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config, get_config_version
+from .price_store import PRICE_COLUMNS, PriceStore, get_price_store, normalize_prices
+
+
+def _split_batch(data: Optional[pd.DataFrame], symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Split a multi-ticker download into normalized per-symbol frames (empty ones dropped)"""
+    if data is None or data.empty:
+        return {}
+    frames = {}
+    if isinstance(data.columns, pd.MultiIndex):
+        # group_by="ticker" gives (ticker, field); the default gives (field, ticker)
+        level = 0 if set(data.columns.get_level_values(0)) & set(symbols) else 1
+        available = set(data.columns.get_level_values(level))
+        for symbol in symbols:
+            if symbol in available:
+                frames[symbol] = normalize_prices(data.xs(symbol, axis=1, level=level))
+    elif len(symbols) == 1:
+        frames[symbols[0]] = normalize_prices(data)
+    return {symbol: frame for symbol, frame in frames.items() if not frame.empty}
+
+
+class UniverseLoader:
+    """Batched, retrying loader that keeps many symbols of the price store up to date"""
+
+    def __init__(self, store: PriceStore, batch_size: int = 50, max_retries: int = 2,
+                 retry_backoff_seconds: float = 2.0, download: Optional[Callable] = None):
+        """
+        Initialize the loader
+
+        Args:
+            store: Price store the batches are split into
+            batch_size: Symbols per download request
+            max_retries: Extra attempts for symbols that failed or came back empty
+            retry_backoff_seconds: Wait before retry n is n times this
+            download: ``yf.download``-compatible callable (default: the store's downloader)
+        """
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.download = download
+        self.last_report: Optional[Dict] = None
+
+    def _download_batch(self, symbols: List[str], start: pd.Timestamp) -> Dict[str, pd.DataFrame]:
+        end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        download = self.download or self.store.download or yf.download
+        data = download(
+            symbols,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            group_by="ticker",
+            auto_adjust=True,
+            progress=False,
+            threads=True,
+        )
+        return _split_batch(data, symbols)
+
+    def _fetch(self, symbols: List[str], start: pd.Timestamp, report: Dict) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+        """Download ``symbols`` in batches, retrying only the ones still missing"""
+        results: Dict[str, pd.DataFrame] = {}
+        pending = list(symbols)
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                report["retried"] += len(pending)
+                print(f"[UNIVERSE] Retrying {len(pending)} symbol(s) (attempt {attempt + 1}): {', '.join(pending[:10])}")
+                time.sleep(self.retry_backoff_seconds * attempt)
+            for i in range(0, len(pending), self.batch_size):
+                batch = pending[i:i + self.batch_size]
+                report["requests"] += 1
+                try:
+                    results.update(self._download_batch(batch, start))
+                except Exception as e:
+                    print(f"[UNIVERSE] Batch of {len(batch)} symbol(s) failed: {e}")
+            pending = [symbol for symbol in pending if symbol not in results]
+        return results, pending
+
+    def refresh(self, symbols: Iterable[str]) -> Dict:
+        """
+        Bring every symbol's stored history up to date with as few requests as possible
+
+        Returns:
+            Report with the number of fresh/incremental/full symbols, requests made,
+            retried symbols, symbols that still failed and the duration
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        report = {"symbols": len(symbols), "fresh": 0, "incremental": 0, "full": 0,
+                  "requests": 0, "retried": 0, "failed": []}
+        start_time = time.time()
+
+        # Group stale symbols by download start: same watermark -> same batched request
+        groups: Dict[pd.Timestamp, List[str]] = {}
+        full: List[str] = []
+        for symbol in symbols:
+            if not self.store.needs_refresh(symbol):
+                report["fresh"] += 1
+                continue
+            meta = self.store.watermark(symbol)
+            if meta and meta.get("last_session"):
+                start = self.store.refresh_start(pd.Timestamp(meta["last_session"]))
+                groups.setdefault(start, []).append(symbol)
+            else:
+                full.append(symbol)
+
+        for start, group in sorted(groups.items()):
+            fetched, failed = self._fetch(group, start, report)
+            for symbol, delta in fetched.items():
+                if self.store.ingest(symbol, delta):
+                    report["incremental"] += 1
+                else:
+                    full.append(symbol)
+            report["failed"].extend(failed)
+
+        if full:
+            fetched, failed = self._fetch(full, self.store.full_history_start(), report)
+            for symbol, frame in fetched.items():
+                self.store.ingest(symbol, frame, full_history=True)
+                report["full"] += 1
+            report["failed"].extend(failed)
+
+        report["duration_s"] = round(time.time() - start_time, 2)
+        self.last_report = report
+        print(
+            f"[UNIVERSE] {report['symbols']} symbols: {report['fresh']} fresh, {report['incremental']} incremental, "
+            f"{report['full']} full, {len(report['failed'])} failed in {report['requests']} request(s), "
+            f"{report['duration_s']:.2f}s"
+        )
+        return report
+
+    def load(self, symbols: Iterable[str], start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Refresh ``symbols`` and return their stored histories
+
+        Args:
+            symbols: Ticker symbols
+            start: First date to include, yyyy-mm-dd (default: whole history)
+            end: Last date to include, yyyy-mm-dd, inclusive (default: latest session)
+
+        Returns:
+            {symbol: date-indexed OHLCV frame}; symbols without any data are omitted
+            (see ``last_report["failed"]``)
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        self.refresh(symbols)
+        frames = {}
+        for symbol in symbols:
+            if self.store.watermark(symbol) is None:
+                continue
+            frame = self.store.load(symbol, refresh=False)
+            if start is not None:
+                frame = frame[frame.index >= pd.Timestamp(start)]
+            if end is not None:
+                frame = frame[frame.index <= pd.Timestamp(end)]
+            frames[symbol] = frame
+        return frames
+
+
+# Global loader (follows the price store configuration)
+_global_loader: Optional[UniverseLoader] = None
+_global_loader_lock = threading.Lock()
+# Config version the loader was created against
+_global_loader_version = -1
+
+
+def get_universe_loader() -> UniverseLoader:
+    """Get or create the universe loader for the current configuration"""
+    global _global_loader, _global_loader_version
+
+    version = get_config_version()
+    store = get_price_store()
+    if _global_loader_version == version and _global_loader is not None and _global_loader.store is store:
+        return _global_loader
+
+    universe_config = get_config().get("universe", {})
+    with _global_loader_lock:
+        _global_loader = UniverseLoader(
+            store,
+            batch_size=universe_config.get("batch_size", 50),
+            max_retries=universe_config.get("max_retries", 2),
+            retry_backoff_seconds=universe_config.get("retry_backoff_seconds", 2.0),
+        )
+        _global_loader_version = version
+    return _global_loader
+
+
+def load_universe(symbols: Iterable[str], start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load daily prices for many symbols with batched downloads into the price store
+
+    Args:
+        symbols: Ticker symbols
+        start: First date to include, yyyy-mm-dd (default: whole stored history)
+        end: Last date to include, yyyy-mm-dd, inclusive (default: latest session)
+
+    Returns:
+        {symbol: date-indexed OHLCV frame} for every symbol with data
+    """
+    return get_universe_loader().load(symbols, start, end)
+
+
+def record_universe_fixture(symbols: Iterable[str], start: str, end: str, path: str,
+                            download: Optional[Callable] = None) -> int:
+    """
+    Record a long-format price fixture for offline runs (see price_store.FixtureDownloader)
+
+    Args:
+        symbols: Ticker symbols to record
+        start: First date, yyyy-mm-dd
+        end: Last date, yyyy-mm-dd (exclusive, like yf.download)
+        path: Output file (.csv or .parquet)
+        download: ``yf.download``-compatible callable (default: yfinance)
+
+    Returns:
+        Number of rows written
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    data = (download or yf.download)(
+        symbols, start=start, end=end, group_by="ticker", auto_adjust=True, progress=False, threads=True,
+    )
+    rows = []
+    for symbol, frame in _split_batch(data, symbols).items():
+        rows.append(frame.reset_index().assign(Ticker=symbol)[["Date", "Ticker"] + PRICE_COLUMNS])
+    long_format = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=["Date", "Ticker"] + PRICE_COLUMNS)
+    if path.endswith(".parquet"):
+        long_format.to_parquet(path, index=False)
+    else:
+        long_format.to_csv(path, index=False)
+    return len(long_format)
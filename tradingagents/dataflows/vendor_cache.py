@@ -0,0 +1,414 @@
+"""
+Persistent response cache for vendor data calls.
+Sits in front of route_to_vendor so that re-running the same ticker/date (or many
+tickers sharing a date) is served from disk instead of re-downloading from vendors.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .config import get_config, get_config_version
+
+# Default time-to-live per routed method, in seconds (None = never expires)
+DEFAULT_TTL_SECONDS = {
+    "get_stock_data": None,             # Historical OHLCV never changes
+    "get_indicators": None,             # Derived from historical OHLCV
+    "get_indicators_batch": None,
+    "get_fundamentals": 24 * 3600,
+    "get_balance_sheet": 3 * 24 * 3600,  # Statements change at most quarterly
+    "get_cashflow": 3 * 24 * 3600,
+    "get_income_statement": 3 * 24 * 3600,
+    "get_news": 15 * 60,
+    "get_global_news": 15 * 60,
+    "get_insider_sentiment": 24 * 3600,
+    "get_insider_transactions": 24 * 3600,
+}
+
+# TTL applied to "forever" methods when the requested window reaches today
+LIVE_WINDOW_TTL_SECONDS = 15 * 60
+
+# Vendor results that signal a failure and must not be cached
+_ERROR_PREFIXES = (
+    "Error ",
+    "No data found",
+    "Economic calendar data could not be retrieved",
+)
+_ERROR_MARKERS = (
+    "data not available",
+    "news data not available",
+)
+
+
+def _normalize_arg(value: Any) -> Any:
+    """Normalize a single argument so equivalent calls share a cache key."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize_arg(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize_arg(v) for k, v in sorted(value.items())}
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return str(value)
+
+
+def make_cache_key(method: str, vendor: str, args: tuple, kwargs: dict) -> str:
+    """Build a deterministic cache key from method, resolved vendor and arguments."""
+    payload = json.dumps(
+        [method, vendor, _normalize_arg(list(args)), _normalize_arg(kwargs)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _looks_like_error(result: str) -> bool:
+    """Detect vendor fallbacks that return an error message instead of raising."""
+    if not result or not result.strip():
+        return True
+    if result.startswith(_ERROR_PREFIXES):
+        return True
+    head = result[:200].lower()
+    return any(marker in head for marker in _ERROR_MARKERS)
+
+
+def _window_reaches_today(args: tuple) -> bool:
+    """Return True if any yyyy-mm-dd argument is today or in the future."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    for arg in args:
+        if isinstance(arg, str) and len(arg) == 10 and arg[4] == "-" and arg[7] == "-":
+            if arg >= today:
+                return True
+    return False
+
+
+class VendorCache:
+    """
+    Disk-backed (SQLite) cache of vendor responses.
+
+    Entries are keyed by method, resolved vendor and normalized arguments, expire
+    according to per-method TTLs and are evicted least-recently-used once the
+    stored payload exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_overrides: Optional[Dict[str, Optional[int]]] = None,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on stored payload size before LRU eviction
+            ttl_overrides: Per-method TTLs (seconds, None = forever) overriding the defaults
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = dict(DEFAULT_TTL_SECONDS)
+        self.ttl_seconds.update(ttl_overrides or {})
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                vendor TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+        )
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes = int(row[0])
+
+    def configure(self, max_bytes: int, ttl_overrides: Optional[Dict[str, Optional[int]]] = None):
+        """Apply a new size limit and TTLs to the open cache (stored entries keep their expiry)"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.ttl_seconds = dict(DEFAULT_TTL_SECONDS)
+            self.ttl_seconds.update(ttl_overrides or {})
+            self._evict_if_needed()
+            self._conn.commit()
+
+    def _count(self, method: str, counter: str, amount: int = 1):
+        """Increment a per-method counter (caller holds the lock)"""
+        method_stats = self._stats.setdefault(
+            method, {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        )
+        method_stats[counter] += amount
+
+    def ttl_for(self, method: str, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """Resolve the TTL for a call, shortening 'forever' entries whose window reaches today.
+
+        Dates passed by keyword (e.g. ``end_date=...``) count as well as positional ones.
+        """
+        ttl = self.ttl_seconds.get(method, LIVE_WINDOW_TTL_SECONDS)
+        if ttl is None and _window_reaches_today(tuple(args) + tuple((kwargs or {}).values())):
+            return LIVE_WINDOW_TTL_SECONDS
+        return ttl
+
+    def get(self, method: str, key: str) -> Optional[str]:
+        """Return the cached value for ``key`` or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._count(method, "misses")
+                return None
+
+            value, size, expires_at = row
+            if expires_at is not None and now > expires_at:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                self._count(method, "misses")
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self._count(method, "hits")
+            return value
+
+    def put(self, method: str, key: str, vendor: str, value: str, ttl: Optional[int]) -> bool:
+        """Store a vendor response. Returns False if the value was not cacheable."""
+        if not isinstance(value, str) or _looks_like_error(value):
+            return False
+
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if old is not None:
+                self._total_bytes -= old[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, method, vendor, value, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, method, vendor, value, size, now, expires_at, now),
+            )
+            self._total_bytes += size
+            self._count(method, "writes")
+            self._evict_if_needed()
+            self._conn.commit()
+        return True
+
+    def _evict_if_needed(self):
+        """Drop expired entries, then least-recently-used ones until under max_bytes (caller holds the lock)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        now = time.time()
+        expired = self._conn.execute(
+            "SELECT key, method, size FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (now,),
+        ).fetchall()
+        for key, method, size in expired:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+            self._count(method, "evictions")
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        cursor = self._conn.execute(
+            "SELECT key, method, size FROM responses ORDER BY last_access ASC"
+        )
+        victims = []
+        for key, method, size in cursor:
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append((key, method))
+            self._total_bytes -= size
+        for key, method in victims:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count(method, "evictions")
+
+    def invalidate(self, method: Optional[str] = None) -> int:
+        """Remove all entries (or all entries of one method). Returns rows removed."""
+        with self._lock:
+            if method is None:
+                cursor = self._conn.execute("DELETE FROM responses")
+            else:
+                cursor = self._conn.execute("DELETE FROM responses WHERE method = ?", (method,))
+            self._conn.commit()
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            self._total_bytes = int(row[0])
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per method plus totals and current size."""
+        with self._lock:
+            per_method = {m: dict(s) for m, s in self._stats.items()}
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+        hits = sum(s["hits"] for s in per_method.values())
+        misses = sum(s["misses"] for s in per_method.values())
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "methods": per_method,
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class RunCache:
+    """
+    In-memory cache scoped to graph runs.
+
+    TradingAgentsGraph.propagate() opens it before the prefetch stage and closes it
+    when the run ends, so tool calls made by the analysts are served from what the
+    prefetch already fetched even when the persistent cache is disabled.
+    Overlapping runs share the cache; it is cleared once the last run closes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._depth = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether a run is in progress"""
+        return self._depth > 0
+
+    def open(self):
+        """Start a run scope"""
+        with self._lock:
+            self._depth += 1
+
+    def close(self):
+        """End a run scope, dropping all entries after the last one"""
+        with self._lock:
+            self._depth = max(0, self._depth - 1)
+            if self._depth == 0:
+                self._entries.clear()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the value for ``key`` or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: str, value: str):
+        """Store a successful vendor response for the rest of the run"""
+        if not isinstance(value, str) or _looks_like_error(value):
+            return
+        with self._lock:
+            if self._depth > 0:
+                self._entries[key] = value
+
+    def stats(self) -> Dict[str, int]:
+        """Lookup counters and current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+_run_cache = RunCache()
+
+
+def get_run_cache() -> RunCache:
+    """Get the process-wide run-scoped cache"""
+    return _run_cache
+
+
+# Global cache instance (shared across all calls in the process)
+_global_cache: Optional[VendorCache] = None
+_global_cache_lock = threading.Lock()
+# Config version the global cache was resolved against (skips config lookups on the hot path)
+_global_cache_version = -1
+
+
+def get_vendor_cache() -> Optional[VendorCache]:
+    """
+    Get or create the global vendor cache for the current configuration.
+
+    Returns None when caching is disabled via ``vendor_cache.enabled``.
+    """
+    global _global_cache, _global_cache_version
+
+    version = get_config_version()
+    if _global_cache_version == version:
+        return _global_cache
+
+    config = get_config()
+    cache_config = config.get("vendor_cache", {})
+
+    with _global_cache_lock:
+        if not cache_config.get("enabled", True):
+            if _global_cache is not None:
+                _global_cache.close()
+            _global_cache = None
+        else:
+            path = cache_config.get("path") or os.path.join(
+                config["data_cache_dir"], "vendor_cache.sqlite"
+            )
+            max_bytes = cache_config.get("max_bytes", 256 * 1024 * 1024)
+            ttl_overrides = cache_config.get("ttl_seconds")
+            if _global_cache is None or _global_cache.path != path:
+                if _global_cache is not None:
+                    _global_cache.close()
+                _global_cache = VendorCache(path, max_bytes=max_bytes, ttl_overrides=ttl_overrides)
+            else:
+                _global_cache.configure(max_bytes, ttl_overrides)
+        _global_cache_version = version
+    return _global_cache
+
+
+def is_cache_bypassed() -> bool:
+    """Whether cache reads are bypassed (writes still refresh the stored entries)."""
+    if os.getenv("TRADINGAGENTS_CACHE_BYPASS", "false").lower() == "true":
+        return True
+    return bool(get_config().get("vendor_cache", {}).get("bypass", False))
@@ -0,0 +1,282 @@
+"""
+Vendor health tracking and circuit breaking for the route_to_vendor fallback chain.
+Keeps a per-vendor, per-method scoreboard so that a rate-limited or failing vendor
+is skipped for a cool-down period instead of being retried on every tool call.
+"""
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .alpha_vantage_common import AlphaVantageRateLimitError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Maximum cool-down after repeated failed half-open probes
+MAX_COOLDOWN_SECONDS = 3600
+
+# A half-open probe whose outcome is never recorded (e.g. its worker died) is given up after this
+PROBE_LEASE_SECONDS = 120
+
+
+def cooldown_for_error(error: BaseException) -> Tuple[float, bool]:
+    """
+    Derive a cool-down period from the error type
+
+    Returns:
+        (cooldown_seconds, trip_immediately) - rate limits and configuration errors
+        open the circuit on the first occurrence, transient errors need repeats.
+    """
+    message = str(error).lower()
+
+    if _is_rate_limit(error):
+        # Daily quota exhaustion will not recover within minutes
+        if "per day" in message or "daily" in message:
+            return 3600.0, True
+        return 60.0, True
+    if isinstance(error, ValueError) and "api key" in message:
+        # Missing/invalid credentials: nothing to gain by retrying soon
+        return 3600.0, True
+    if isinstance(error, (TimeoutError, ConnectionError)) or "timed out" in message or "timeout" in message:
+        return 30.0, False
+    return 15.0, False
+
+
+def _is_rate_limit(error: BaseException) -> bool:
+    """Whether an error means the vendor's API quota is exhausted"""
+    message = str(error).lower()
+    return isinstance(error, AlphaVantageRateLimitError) or "429" in message or "rate limit" in message
+
+
+class VendorCircuit:
+    """Circuit-breaker state and statistics for one (vendor, method) pair"""
+
+    def __init__(self, vendor: str, method: str):
+        self.vendor = vendor
+        self.method = method
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.probe_in_flight = False
+        self.probe_started_at = 0.0
+        self.recent_latencies = deque(maxlen=50)
+
+    def retry_at(self) -> float:
+        """Time at which an open circuit may be probed again"""
+        return self.opened_at + self.cooldown
+
+    def to_dict(self) -> Dict:
+        """Serializable snapshot for display"""
+        return {
+            "vendor": self.vendor,
+            "method": self.method,
+            "state": self.state,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ewma_s": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "retry_in_s": round(max(0.0, self.retry_at() - time.time()), 1) if self.state == OPEN else 0.0,
+            "last_error": self.last_error,
+        }
+
+
+class VendorHealthTracker:
+    """
+    Per-vendor, per-method circuit breakers with latency EWMA
+
+    States:
+        closed    - vendor is healthy and called normally
+        open      - vendor is skipped until its cool-down elapses
+        half_open - cool-down elapsed; a single probe call decides closed vs open
+    """
+
+    def __init__(self, failure_threshold: int = 3, ewma_alpha: float = 0.3):
+        """
+        Initialize the tracker
+
+        Args:
+            failure_threshold: Consecutive transient failures before the circuit opens
+            ewma_alpha: Smoothing factor for the latency moving average
+        """
+        self.failure_threshold = failure_threshold
+        self.ewma_alpha = ewma_alpha
+        self._circuits: Dict[Tuple[str, str], VendorCircuit] = {}
+        # Rate limits are per API key, so they block every method of the vendor
+        self._vendor_blocked_until: Dict[str, float] = {}
+        # (vendor, method) pairs currently open or half-open; empty means the fast path
+        self._degraded = set()
+        self._lock = threading.Lock()
+
+    def _circuit(self, vendor: str, method: str) -> VendorCircuit:
+        """Get or create the circuit for a pair (caller holds the lock)"""
+        key = (vendor, method)
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = VendorCircuit(vendor, method)
+            self._circuits[key] = circuit
+        return circuit
+
+    def allow(self, vendor: str, method: str) -> bool:
+        """Whether a call to this vendor should be attempted now"""
+        with self._lock:
+            if time.time() < self._vendor_blocked_until.get(vendor, 0.0):
+                return False
+            circuit = self._circuit(vendor, method)
+            if circuit.state == CLOSED:
+                return True
+            if circuit.state == OPEN:
+                if time.time() < circuit.retry_at():
+                    return False
+                circuit.state = HALF_OPEN
+                circuit.probe_in_flight = False
+            # Half-open: let exactly one probe through (a lost probe's lease runs out)
+            if circuit.probe_in_flight and time.time() < circuit.probe_started_at + PROBE_LEASE_SECONDS:
+                return False
+            circuit.probe_in_flight = True
+            circuit.probe_started_at = time.time()
+            return True
+
+    def release_probe(self, vendor: str, method: str):
+        """Give back a half-open probe that was granted but never called the vendor (no penalty)"""
+        with self._lock:
+            circuit = self._circuits.get((vendor, method))
+            if circuit is not None:
+                circuit.probe_in_flight = False
+
+    def record_success(self, vendor: str, method: str, latency: float):
+        """Record a successful call and close the circuit"""
+        with self._lock:
+            circuit = self._circuit(vendor, method)
+            circuit.successes += 1
+            circuit.consecutive_failures = 0
+            circuit.state = CLOSED
+            circuit.cooldown = 0.0
+            self._degraded.discard((vendor, method))
+            circuit.probe_in_flight = False
+            circuit.recent_latencies.append(latency)
+            if circuit.latency_ewma is None:
+                circuit.latency_ewma = latency
+            else:
+                circuit.latency_ewma = (
+                    self.ewma_alpha * latency + (1 - self.ewma_alpha) * circuit.latency_ewma
+                )
+
+    def record_failure(self, vendor: str, method: str, error: BaseException, latency: float = 0.0):
+        """Record a failed call, opening the circuit when warranted"""
+        cooldown, trip_now = cooldown_for_error(error)
+        with self._lock:
+            if _is_rate_limit(error):
+                self._vendor_blocked_until[vendor] = max(
+                    self._vendor_blocked_until.get(vendor, 0.0), time.time() + cooldown
+                )
+            circuit = self._circuit(vendor, method)
+            circuit.failures += 1
+            circuit.consecutive_failures += 1
+            circuit.last_error = f"{type(error).__name__}: {str(error)[:120]}"
+
+            if circuit.state == HALF_OPEN:
+                # Failed probe: back off harder than last time
+                circuit.cooldown = min(max(cooldown, circuit.cooldown * 2), MAX_COOLDOWN_SECONDS)
+            elif trip_now or circuit.consecutive_failures >= self.failure_threshold:
+                circuit.cooldown = cooldown
+            else:
+                return
+
+            circuit.state = OPEN
+            circuit.opened_at = time.time()
+            self._degraded.add((vendor, method))
+            circuit.probe_in_flight = False
+            print(
+                f"[VENDOR_HEALTH] Circuit OPEN for '{vendor}' on {method} "
+                f"for {circuit.cooldown:.0f}s ({circuit.last_error})"
+            )
+
+    def latency_percentile(self, vendor: str, method: str, percentile: float = 0.9) -> Optional[float]:
+        """Latency percentile over recent successful calls, or None without samples"""
+        with self._lock:
+            circuit = self._circuits.get((vendor, method))
+            if circuit is None or not circuit.recent_latencies:
+                return None
+            samples = sorted(circuit.recent_latencies)
+        index = min(len(samples) - 1, int(percentile * len(samples)))
+        return samples[index]
+
+    def order(self, method: str, vendors: List[str], primary_vendors: List[str]) -> List[str]:
+        """
+        Reorder a fallback chain by health
+
+        While every vendor is healthy the configured order is returned unchanged.
+        Otherwise primary vendors keep their configured order, fallback vendors are
+        sorted with healthy (closed) circuits first and then by latency EWMA, and
+        vendors with open circuits move to the end (route_to_vendor skips them via allow()).
+        """
+        with self._lock:
+            now = time.time()
+            if self._vendor_blocked_until:
+                self._vendor_blocked_until = {
+                    v: until for v, until in self._vendor_blocked_until.items() if until > now
+                }
+            if not self._degraded and not self._vendor_blocked_until:
+                return list(vendors)
+
+            def rank(vendor: str):
+                if now < self._vendor_blocked_until.get(vendor, 0.0):
+                    return (2, 0.0)
+                circuit = self._circuits.get((vendor, method))
+                if circuit is None:
+                    return (0, 0.0)
+                state_rank = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}[circuit.state]
+                return (state_rank, circuit.latency_ewma or 0.0)
+
+            primaries = [v for v in vendors if v in primary_vendors]
+            fallbacks = [v for v in vendors if v not in primary_vendors]
+            primaries.sort(key=lambda v: rank(v)[0] == 2)  # stable: only demote open circuits
+            fallbacks.sort(key=rank)
+        return primaries + fallbacks
+
+    def scoreboard(self) -> List[Dict]:
+        """Snapshot of every tracked (vendor, method) pair"""
+        now = time.time()
+        with self._lock:
+            circuits = sorted(self._circuits.values(), key=lambda c: (c.vendor, c.method))
+            rows = [c.to_dict() for c in circuits]
+            for row in rows:
+                blocked_until = self._vendor_blocked_until.get(row["vendor"], 0.0)
+                if blocked_until > now and row["state"] == CLOSED:
+                    row["state"] = OPEN
+                    row["retry_in_s"] = round(blocked_until - now, 1)
+            return rows
+
+    def reset(self):
+        """Forget all health state"""
+        with self._lock:
+            self._circuits.clear()
+            self._vendor_blocked_until.clear()
+            self._degraded.clear()
+
+
+# Global tracker instance (shared across all graphs in the process)
+_global_tracker: Optional[VendorHealthTracker] = None
+_global_tracker_lock = threading.Lock()
+
+
+def get_vendor_health() -> VendorHealthTracker:
+    """Get or create the global vendor health tracker"""
+    global _global_tracker
+
+    with _global_tracker_lock:
+        if _global_tracker is None:
+            _global_tracker = VendorHealthTracker()
+    return _global_tracker
+
+
+def get_vendor_scoreboard() -> List[Dict]:
+    """Current vendor health scoreboard, for display in the CLI/Streamlit"""
+    return get_vendor_health().scoreboard()
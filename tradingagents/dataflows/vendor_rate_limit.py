@@ -0,0 +1,245 @@
+"""
+Quota-aware rate limiting for data vendors.
+Each vendor gets a per-minute token bucket and an optional per-day budget (e.g. Alpha
+Vantage free tier: 5/min, 25/day) so route_to_vendor spends requests it knows will be
+accepted, queues callers fairly when a bucket is empty, and falls back to another vendor
+instead of burning a call that the vendor would reject.
+"""
+import time
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .config import get_config, get_config_version
+
+
+class VendorQuota:
+    """
+    Budget for one vendor
+
+    The per-minute limit is a token bucket implemented as GCRA (virtual scheduling):
+    every caller reserves the next free slot under a lock, so waiters are served in
+    arrival order no matter how many graphs share the vendor. The per-day limit is a
+    counter that resets at midnight UTC.
+    """
+
+    def __init__(self, vendor: str, per_minute: Optional[float] = None, per_day: Optional[int] = None):
+        """
+        Initialize the quota
+
+        Args:
+            vendor: Vendor name
+            per_minute: Requests per minute (None = unlimited); also the burst size
+            per_day: Requests per UTC day (None = unlimited)
+        """
+        self.vendor = vendor
+        self.per_minute = per_minute
+        self.per_day = per_day
+
+        self._tat = 0.0  # Theoretical arrival time of the next request
+        self._day = None
+        self._used_today = 0
+
+        # Counters
+        self.granted = 0
+        self.rejected_minute = 0
+        self.rejected_day = 0
+        self.queued = 0
+        self.queued_seconds = 0.0
+        self.max_queued_seconds = 0.0
+
+    def _roll_day(self):
+        """Reset the daily counter at midnight UTC"""
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            self._day = today
+            self._used_today = 0
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Reserve one request (caller holds the limiter lock)
+
+        Returns:
+            Seconds the caller must wait before sending, or None if the request would
+            exceed the daily budget or wait longer than ``max_wait``.
+        """
+        self._roll_day()
+        if self.per_day is not None and self._used_today >= self.per_day:
+            self.rejected_day += 1
+            return None
+
+        now = time.time()
+        wait = 0.0
+        if self.per_minute:
+            interval = 60.0 / self.per_minute
+            burst = max(1.0, self.per_minute)
+            new_tat = max(self._tat, now) + interval
+            wait = max(0.0, new_tat - burst * interval - now)
+            if wait > max_wait:
+                self.rejected_minute += 1
+                return None
+            self._tat = new_tat
+
+        self._used_today += 1
+        self.granted += 1
+        if wait > 0:
+            self.queued += 1
+            self.queued_seconds += wait
+            self.max_queued_seconds = max(self.max_queued_seconds, wait)
+        return wait
+
+    def has_budget(self) -> bool:
+        """Whether a request could be sent right now without queueing"""
+        self._roll_day()
+        if self.per_day is not None and self._used_today >= self.per_day:
+            return False
+        if self.per_minute:
+            now = time.time()
+            interval = 60.0 / self.per_minute
+            burst = max(1.0, self.per_minute)
+            return max(self._tat, now) + interval - burst * interval <= now
+        return True
+
+    def to_dict(self) -> Dict:
+        """Serializable snapshot for display"""
+        self._roll_day()
+        return {
+            "vendor": self.vendor,
+            "per_minute": self.per_minute,
+            "per_day": self.per_day,
+            "used_today": self._used_today,
+            "granted": self.granted,
+            "rejected_minute": self.rejected_minute,
+            "rejected_day": self.rejected_day,
+            "queued": self.queued,
+            "queued_seconds": round(self.queued_seconds, 2),
+            "max_queued_seconds": round(self.max_queued_seconds, 2),
+        }
+
+
+class VendorRateLimiter:
+    """Per-vendor quotas shared by every graph in the process"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict]] = None, max_wait_seconds: float = 10.0):
+        """
+        Initialize the limiter
+
+        Args:
+            limits: {vendor: {"per_minute": int, "per_day": int}}; unlisted vendors are unlimited
+            max_wait_seconds: Longest a caller queues for a token before falling back
+        """
+        self.max_wait_seconds = max_wait_seconds
+        self._quotas: Dict[str, VendorQuota] = {}
+        self._lock = threading.Lock()
+        self.configure(limits or {}, max_wait_seconds)
+
+    def configure(self, limits: Dict[str, Dict], max_wait_seconds: float):
+        """Apply new limits while keeping usage counters for vendors already tracked"""
+        with self._lock:
+            self.max_wait_seconds = max_wait_seconds
+            for vendor, limit in limits.items():
+                quota = self._quotas.get(vendor)
+                if quota is None:
+                    quota = VendorQuota(vendor)
+                    self._quotas[vendor] = quota
+                quota.per_minute = limit.get("per_minute")
+                quota.per_day = limit.get("per_day")
+            for vendor in list(self._quotas):
+                if vendor not in limits:
+                    del self._quotas[vendor]
+
+    def _reserve(self, vendor: str, max_wait: Optional[float] = None) -> Optional[float]:
+        """Reserve a slot; 0.0 for unlimited vendors, None when over budget"""
+        max_wait = self.max_wait_seconds if max_wait is None else min(max_wait, self.max_wait_seconds)
+        with self._lock:
+            quota = self._quotas.get(vendor)
+            if quota is None:
+                return 0.0
+            wait = quota.reserve(max_wait)
+        if wait is None:
+            print(f"[VENDOR_QUOTA] '{vendor}' has no budget left within {max_wait:.0f}s, skipping")
+        return wait
+
+    def acquire(self, vendor: str, max_wait: Optional[float] = None) -> bool:
+        """
+        Block until this caller's turn for ``vendor``
+
+        Args:
+            vendor: Vendor name
+            max_wait: Tighter queueing limit than max_wait_seconds (e.g. the call's remaining deadline)
+
+        Returns:
+            False if the vendor is out of budget (daily cap hit or queue wait too long)
+        """
+        wait = self._reserve(vendor, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, vendor: str, max_wait: Optional[float] = None) -> bool:
+        """Async variant of acquire (waits without blocking the event loop)"""
+        wait = self._reserve(vendor, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def has_budget(self, vendor: str) -> bool:
+        """Whether ``vendor`` can take a request right now without queueing"""
+        with self._lock:
+            quota = self._quotas.get(vendor)
+            return quota is None or quota.has_budget()
+
+    def is_limited(self) -> bool:
+        """Whether any vendor has a configured quota"""
+        return bool(self._quotas)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Usage and queueing counters per vendor"""
+        with self._lock:
+            return {vendor: quota.to_dict() for vendor, quota in sorted(self._quotas.items())}
+
+
+# Global limiter instance (shared across all graphs in the process)
+_global_limiter: Optional[VendorRateLimiter] = None
+_global_limiter_lock = threading.Lock()
+# Config version the limiter was configured against
+_global_limiter_version = -1
+
+
+def get_vendor_rate_limiter() -> Optional[VendorRateLimiter]:
+    """
+    Get or create the global vendor rate limiter for the current configuration
+
+    Returns None when vendor rate limiting is disabled via ``vendor_rate_limits.enabled``.
+    """
+    global _global_limiter, _global_limiter_version
+
+    version = get_config_version()
+    if _global_limiter_version == version:
+        return _global_limiter
+
+    limits_config = get_config().get("vendor_rate_limits", {})
+
+    with _global_limiter_lock:
+        if not limits_config.get("enabled", True):
+            _global_limiter = None
+        else:
+            limits = limits_config.get("vendors", {})
+            max_wait = limits_config.get("max_wait_seconds", 10.0)
+            if _global_limiter is None:
+                _global_limiter = VendorRateLimiter(limits, max_wait)
+            else:
+                _global_limiter.configure(limits, max_wait)
+        _global_limiter_version = version
+    return _global_limiter
+
+
+def get_vendor_rate_limit_stats() -> Dict[str, Dict]:
+    """Current per-vendor quota usage and queued time, for display in the CLI/Streamlit"""
+    limiter = get_vendor_rate_limiter()
+    return limiter.stats() if limiter is not None else {}
@@ -52,4 +52,129 @@ DEFAULT_CONFIG = {
         "get_news": "finnhub,google",              # Company news: Finnhub primary, Google fallback
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
     },
+    # Concurrent vendor execution in route_to_vendor
+    "vendor_concurrency": {
+        "parallel_primaries": True,         # Run comma-separated vendors (e.g. "finnhub,google") in parallel
+        "max_workers": 8,                   # Shared pool size for concurrent/hedged vendor calls
+        "call_deadline_seconds": 60,        # Time budget of one routed call, across all of its vendors
+        "hedge": False,                     # Single-vendor configs: race the first fallback when primary is slow
+        "hedge_percentile": 0.9,            # Hedge delay = this latency percentile of the primary...
+        "hedge_min_delay_seconds": 2.0,     # ...but never less than this
+    },
+    # Cooperative deadlines inside a routed call (thread- and asyncio-safe; see dataflows/deadline.py)
+    "vendor_deadlines": {
+        "vendor_budget_seconds": 30,        # Per vendor attempt, so a hung primary leaves time for a fallback
+        "method_budgets": {},               # Per-method call budgets, e.g. {"get_global_news": 90}
+        "http_timeout_seconds": 30,         # HTTP timeout outside any deadline (none was set before)
+    },
+    # Pooled HTTP client for the asyncio vendor path (aroute_to_vendor, requires httpx)
+    "vendor_async": {
+        "max_connections": 100,             # Outstanding requests multiplexed per event loop
+        "max_keepalive_connections": 20,
+        "timeout_seconds": 30,
+    },
+    # Per-vendor request budgets (counted per routed call); unlisted vendors are unlimited
+    "vendor_rate_limits": {
+        "enabled": True,
+        "max_wait_seconds": 10,             # Queue at most this long for a token, else fall back
+        "vendors": {
+            "alpha_vantage": {"per_minute": 5, "per_day": 25},   # Free tier
+            "finnhub": {"per_minute": 60},
+        },
+    },
+    # Coalesce identical concurrent tool calls into one vendor request
+    "vendor_single_flight": True,
+    # Prefetch stage in propagate(): fetch the analysts' predictable tool inputs concurrently
+    "prefetch": {
+        "enabled": os.getenv("TRADINGAGENTS_PREFETCH", "false").lower() == "true",  # Opt-in: extra vendor calls per run
+        "max_workers": 8,
+        "stock_look_back_days": 30,         # get_stock_data window ending on the trade date
+        "news_look_back_days": 7,           # get_news window (news and social analysts)
+        "global_news_look_back_days": 7,    # get_global_news defaults
+        "global_news_limit": 5,
+        "deadline_seconds": 90,             # Budget of the whole prefetch stage
+    },
+    # Persistent vendor response cache (SQLite under data_cache_dir)
+    "vendor_cache": {
+        "enabled": os.getenv("TRADINGAGENTS_VENDOR_CACHE", "true").lower() == "true",
+        "bypass": False,                    # Skip reads but still refresh stored entries
+        "path": None,                       # Default: <data_cache_dir>/vendor_cache.sqlite
+        "max_bytes": 256 * 1024 * 1024,     # LRU eviction beyond this payload size
+        "ttl_seconds": {},                  # Per-method overrides, e.g. {"get_news": 600}
+    },
+    # Incremental per-symbol OHLCV store used by the stockstats indicators (Parquet, requires pyarrow)
+    "price_store": {
+        "path": None,                       # Default: <data_cache_dir>/price_store
+        "history_years": 15,                # Depth of the first download per symbol
+        "overlap_days": 7,                  # Re-fetched before the watermark to detect dividend/split rebasing
+        "refresh_interval_hours": 12,       # Serve the stored history without checking for new sessions
+        "frame_cache_max_bytes": 256 * 1024 * 1024,  # In-process LRU of prepared frames + memoized indicators
+        "fixture_path": os.getenv("TRADINGAGENTS_PRICE_FIXTURE"),  # Replay a recorded price file instead of yfinance
+    },
+    # Compact encoding of routed tool outputs before they enter the agents' prompts
+    "output_encoding": {
+        "enabled": True,
+        "significant_digits": 5,            # Prices, indicators and statement values
+        "drop_non_trading_days": True,      # Drop weekend/holiday lines from indicator windows
+        "summary_stats": True,              # Append first/last/low/high lines to OHLCV tables
+        "default_token_budget": 6000,       # Trim tool outputs beyond this (~4 chars per token, 0 = no limit)
+        "token_budgets": {                  # Per-method overrides
+            "get_stock_data": 3000,
+            "get_indicators": 1000,
+        },
+    },
+    # Ticker-partitioned copies of the SimFin statement CSVs for local mode (built on first use)
+    "simfin_store": {
+        "path": None,                       # Default: <data_cache_dir>/simfin_store
+        "max_cached_frames": 512,           # Ticker partitions kept in memory
+    },
+    # Company aliases for matching Reddit posts to tickers (built-in table, then file, then inline)
+    "company_aliases": {
+        "path": None,                       # JSON/CSV alias table; default: <data_dir>/company_aliases.json or .csv
+        "aliases": {},                      # Inline overrides, e.g. {"META": ["Meta", "Facebook"]}
+    },
+    # Cross-vendor deduplication of get_news/get_global_news outputs (part of output_encoding)
+    "news_dedup": {
+        "enabled": True,
+        "title_similarity": 0.6,            # Jaccard of title character 4-grams that marks a near-duplicate
+        "minhash_permutations": 32,         # MinHash signature length (candidate search)
+        "minhash_bands": 16,                # LSH bands; more bands find looser matches
+        "source_weights": {},               # Outlet preference overrides, e.g. {"Reuters": 3.0}
+    },
+    # Relevance-ranked selection of the deduplicated news under a per-call token budget
+    "news_selection": {
+        "enabled": True,
+        "token_budgets": {                  # Per call; methods not listed use their output_encoding budget
+            "get_news": 2500,
+            "get_global_news": 2000,
+        },
+        "max_articles": None,               # Default: economy_config.max_news_articles in economy mode
+        "half_life_days": 3.0,              # Recency score halves every N days before the window end
+        "score_weights": {},                # Overrides, e.g. {"mention": 2.0, "recency": 1.0, "source": 1.0, "vendor": 1.5}
+    },
+    # Ticker-independent macro data fetched once per trade date and shared across tickers/processes
+    "macro_cache": {
+        "enabled": True,
+        "path": None,                       # Default: <data_cache_dir>/macro_cache
+        "intraday_refresh_minutes": 60,     # Lifetime of entries computed during their own trade date
+        "force_refresh": os.getenv("TRADINGAGENTS_MACRO_REFRESH", "false").lower() == "true",  # Ignore entries from earlier runs
+        "methods": ["get_global_news", "get_economic_calendar"],
+    },
+    # Google News scraper: shared keep-alive session, per-host pacing, overlapped paging
+    "google_news": {
+        "min_interval_seconds": 1.0,        # Spacing between requests to the same host (all workers)
+        "jitter_seconds": 1.0,              # Random extra spacing added to each slot
+        "max_workers": 4,                   # Concurrent page requests across searches
+        "prefetch_pages": 1,                # Pages downloaded ahead of the one being parsed (0 = sequential)
+        "max_pages": 10,                    # Hard cap on result pages per query
+        "max_results": 30,                  # Stop paging after this many articles (None = every page)
+        "global_query": "stock market economy",  # Query behind get_global_news
+        "fixture_path": os.getenv("TRADINGAGENTS_GOOGLE_NEWS_FIXTURE"),  # Replay saved result pages instead of Google
+    },
+    # Batched multi-ticker downloads for load_universe()
+    "universe": {
+        "batch_size": 50,                   # Symbols per yfinance request
+        "max_retries": 2,                   # Extra attempts, only for symbols that failed
+        "retry_backoff_seconds": 2,
+    },
 }
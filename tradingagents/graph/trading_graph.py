@@ -21,11 +21,15 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.vendor_cache import get_run_cache
+from tradingagents.dataflows.prefetch import prefetch_analyst_data, finish_prefetch_report
+from tradingagents.dataflows.output_encoding import get_output_encoder, format_encoding_report
 
 # Import the new abstract tool methods from agent_utils
 from tradingagents.agents.utils.agent_utils import (
     get_stock_data,
     get_indicators,
+    get_indicators_batch,
     get_fundamentals,
     get_balance_sheet,
     get_cashflow,
@@ -60,6 +64,7 @@ class TradingAgentsGraph:
             config: Configuration dictionary. If None, uses default config
         """
         self.debug = debug
+        self.selected_analysts = list(selected_analysts)
         self.config = config or DEFAULT_CONFIG
 
         # Update the interface's config
@@ -172,6 +177,8 @@ class TradingAgentsGraph:
         self.curr_state = None
         self.ticker = None
         self.log_states_dict = {}  # date to full state dict
+        self.last_prefetch_report = None
+        self.last_encoding_report = None
 
         # Set up the graph
         self.graph = self.graph_setup.setup_graph(selected_analysts)
@@ -185,6 +192,7 @@ class TradingAgentsGraph:
                     get_stock_data,
                     # Technical indicators
                     get_indicators,
+                    get_indicators_batch,
                 ]
             ),
             "social": ToolNode(
@@ -224,6 +232,51 @@ class TradingAgentsGraph:
         )
         args = self.propagator.get_graph_args()
 
+        self.start_prefetch(company_name, trade_date)
+        encoding_start = get_output_encoder().snapshot()
+        try:
+            final_state = self._run_graph(init_agent_state, args)
+        finally:
+            self.finish_prefetch()
+            # Tokens saved by the output encoders (process-wide counters, so overlapping runs are included)
+            self.last_encoding_report = get_output_encoder().report_since(encoding_start)
+            print(format_encoding_report(self.last_encoding_report))
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Log state
+        self._log_state(trade_date, final_state)
+
+        # Return decision and processed signal
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    def start_prefetch(self, company_name, trade_date):
+        """Warm the run-scoped cache with the selected analysts' predictable tool inputs."""
+        self._prefetch_report = None
+        self._prefetch_active = False
+        if not self.config.get("prefetch", {}).get("enabled", False):
+            return
+
+        get_run_cache().open()
+        self._prefetch_active = True
+        try:
+            self._prefetch_report = prefetch_analyst_data(company_name, trade_date, self.selected_analysts)
+        except Exception as e:
+            print(f"[PREFETCH] Skipped: {e}")
+
+    def finish_prefetch(self):
+        """Report the prefetch duration and hit ratio, then release the run-scoped cache."""
+        if not getattr(self, "_prefetch_active", False):
+            return
+        if self._prefetch_report is not None:
+            self.last_prefetch_report = finish_prefetch_report(self._prefetch_report)
+            self._prefetch_report = None
+        get_run_cache().close()
+        self._prefetch_active = False
+
+    def _run_graph(self, init_agent_state, args):
+        """Invoke the compiled graph, streaming chunks in debug mode."""
         if self.debug:
             # Debug mode with tracing
             trace = []
@@ -245,14 +298,7 @@ class TradingAgentsGraph:
             
             final_state = _invoke_graph()
 
-        # Store current state for reflection
-        self.curr_state = final_state
-
-        # Log state
-        self._log_state(trade_date, final_state)
-
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        return final_state
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""